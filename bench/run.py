@@ -0,0 +1,160 @@
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from bench.server import FixtureServer
+from src.api import NaverBlogAPI
+from src.crawler import NaverBlogCrawler
+from src.executor import create_backend
+from src.processor import BlogProcessor
+from src.rate_limiter import AdaptiveRateLimiter
+
+# 로컬 서버 대상이므로 속도 제한은 사실상 해제
+UNLIMITED_RATES = {'*': (1e6, 1e6)}
+
+# 엔진 이름 → NaverBlogCrawler 설정
+ENGINES = {
+    'http': {'fetch_mode': 'http'},
+    'selenium': {'fetch_mode': 'selenium'},
+    'lean': {'fetch_mode': 'selenium', 'lean': True}
+}
+
+class TimedCrawler(NaverBlogCrawler):
+    def get_blog_info(self, blog_url, driver_pool=None):
+        start = time.perf_counter()
+        result = super().get_blog_info(blog_url, driver_pool=driver_pool)
+        if result:
+            result['BenchLatency'] = time.perf_counter() - start
+        return result
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+def _peak_rss_mb():
+    """(이 프로세스, 종료된 자식 프로세스 중 최대) 최대 RSS를 MB로 반환, 측정할 수 없으면 None"""
+    try:
+        import resource
+    except ImportError:
+        # Windows에는 resource 모듈이 없으므로 psutil이 있으면 이 프로세스의 최대 작업 집합만 측정
+        try:
+            import psutil
+        except ImportError:
+            return None, None
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024), None
+    # ru_maxrss는 Linux에서 KB, macOS에서 바이트 단위
+    unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit
+    )
+
+def _format_mb(value, width):
+    return f"{value:>{width}.1f}" if value is not None else f"{'-':>{width}}"
+
+def _run_case(server_url, engine, backend, concurrency, posts, output):
+    limiter = AdaptiveRateLimiter(host_rates=UNLIMITED_RATES)
+    api = NaverBlogAPI('bench', 'bench', base_url=server_url, rate_limiter=limiter)
+    crawler = TimedCrawler(rate_limiter=limiter, mobile_base_url=server_url, **ENGINES[engine])
+    processor = BlogProcessor(crawler, backend=create_backend(backend, workers=concurrency))
+
+    start = time.perf_counter()
+    # 검색 제너레이터를 그대로 넘겨 검색과 수집이 겹치는 실제 실행 경로를 측정
+    results = processor.process_items(api.iter_search('벤치마크', max_results=posts))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(result['BenchLatency'] for result in results)
+    # 자식 프로세스(워커/브라우저)는 종료된 것 중 최대값
+    self_rss, children_rss = _peak_rss_mb()
+    output.put({
+        'engine': engine,
+        'backend': backend,
+        'concurrency': concurrency,
+        'posts': len(results),
+        'failed': posts - len(results),
+        'elapsed': elapsed,
+        'posts_per_sec': len(results) / elapsed if elapsed else 0.0,
+        'p50': _percentile(latencies, 50),
+        'p95': _percentile(latencies, 95),
+        'peak_rss_mb': self_rss,
+        'peak_child_rss_mb': children_rss
+    })
+
+def run_case(server_url, engine, backend, concurrency, posts):
+    """측정 한 건을 새 프로세스에서 실행 (최대 RSS가 이전 측정과 섞이지 않도록)"""
+    context = multiprocessing.get_context('spawn')
+    output = context.Queue()
+    process = context.Process(target=_run_case, args=(server_url, engine, backend, concurrency, posts, output))
+    process.start()
+    result = output.get()
+    process.join()
+    return result
+
+def case_key(result):
+    return f"{result['engine']}/{result['backend']}/{result['concurrency']}"
+
+def print_report(results):
+    print()
+    print(f"{'engine':<10}{'backend':<9}{'conc':>5}{'posts':>7}{'fail':>6}{'posts/s':>10}{'p50(s)':>9}{'p95(s)':>9}{'rss(MB)':>10}{'child(MB)':>11}")
+    for r in results:
+        print(
+            f"{r['engine']:<10}{r['backend']:<9}{r['concurrency']:>5}{r['posts']:>7}{r['failed']:>6}"
+            f"{r['posts_per_sec']:>10.2f}{r['p50']:>9.3f}{r['p95']:>9.3f}"
+            f"{_format_mb(r['peak_rss_mb'], 10)}{_format_mb(r['peak_child_rss_mb'], 11)}"
+        )
+
+def check_regressions(results, baseline_path, max_regression):
+    """기준 결과 대비 처리량이 max_regression 비율 이상 떨어진 측정 목록"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {case_key(r): r for r in json.load(f)}
+    regressions = []
+    for result in results:
+        previous = baseline.get(case_key(result))
+        if previous and result['posts_per_sec'] < previous['posts_per_sec'] * (1 - max_regression):
+            regressions.append((case_key(result), previous['posts_per_sec'], result['posts_per_sec']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='로컬 고정 데이터 서버를 대상으로 한 크롤러 오프라인 벤치마크')
+    parser.add_argument('--engines', default='http', help='쉼표로 구분한 엔진 목록 (http, selenium, lean)')
+    parser.add_argument('--backend', default='thread', choices=['process', 'thread', 'async'])
+    parser.add_argument('--concurrency', default='1,4,8', help='쉼표로 구분한 동시 실행 수 목록')
+    parser.add_argument('--posts', type=int, default=200, help='측정당 게시글 수')
+    parser.add_argument('--latency', type=float, default=0.0, help='서버 응답 지연 (초)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='허용하는 처리량 감소 비율')
+    args = parser.parse_args(argv)
+
+    engines = [engine.strip() for engine in args.engines.split(',')]
+    for engine in engines:
+        if engine not in ENGINES:
+            parser.error(f'알 수 없는 엔진: {engine}')
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    results = []
+    with FixtureServer(total_posts=args.posts, latency=args.latency) as server:
+        for engine in engines:
+            for concurrency in levels:
+                results.append(run_case(server.url, engine, args.backend, concurrency, args.posts))
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        regressions = check_regressions(results, args.baseline, args.max_regression)
+        for key, before, after in regressions:
+            print(f"성능 저하: {key} {before:.2f} → {after:.2f} posts/s")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
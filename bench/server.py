@@ -0,0 +1,111 @@
+import gzip
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 저장된 모바일 게시글 레이아웃 (게시글 번호에 따라 순환 배정)
+LAYOUTS = ['se_main_container', 'se_component_wrap', 'post_view']
+
+def _load_layouts():
+    layouts = {}
+    for name in LAYOUTS:
+        with open(os.path.join(FIXTURE_DIR, f'{name}.html'), encoding='utf-8') as f:
+            layouts[name] = f.read()
+    return layouts
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if parsed.path == '/v1/search/blog':
+            self._send_search(query)
+        elif parsed.path == '/PostView.naver' and 'blogId' in query and 'logNo' in query:
+            self._send_post(query['blogId'][0], query['logNo'][0])
+        else:
+            parts = parsed.path.strip('/').split('/')
+            if len(parts) == 2 and parts[1].isdigit():
+                self._send_post(parts[0], parts[1])
+            elif parsed.path.startswith('/static/'):
+                self._send(200, b'', 'image/png')
+            else:
+                self._send(404, b'not found', 'text/plain')
+
+    def _send_search(self, query):
+        start = int(query.get('start', ['1'])[0])
+        display = int(query.get('display', ['10'])[0])
+        total = self.server.total_posts
+        items = []
+        for index in range(start, min(start + display, total + 1)):
+            items.append({
+                'title': f'<b>벤치마크</b> 게시글 {index}',
+                'link': f'{self.server.url}/benchblog{index % 50}/{220000000000 + index}',
+                'description': '벤치마크용 게시글',
+                'bloggername': f'benchblog{index % 50}',
+                'bloggerlink': f'blog.naver.com/benchblog{index % 50}',
+                'postdate': '20240314'
+            })
+        body = json.dumps({'total': total, 'start': start, 'display': len(items), 'items': items}, ensure_ascii=False)
+        self._send(200, body.encode('utf-8'), 'application/json; charset=utf-8')
+
+    def _send_post(self, blog_id, log_no):
+        layout = LAYOUTS[int(log_no) % len(LAYOUTS)]
+        page = self.server.layouts[layout]
+        values = {
+            '{title}': f'벤치마크 게시글 {log_no}',
+            '{blog_id}': blog_id,
+            '{paragraph}': f'{blog_id}의 {log_no}번 게시글 본문입니다. ' * 5,
+            '{likes}': str(int(log_no) % 97),
+            '{comments}': str(int(log_no) % 13)
+        }
+        for key, value in values.items():
+            page = page.replace(key, value)
+        self._send(200, page.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def _send(self, status, body, content_type):
+        if 'gzip' in (self.headers.get('Accept-Encoding') or '') and body:
+            body = gzip.compress(body)
+            encoding = 'gzip'
+        else:
+            encoding = None
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+class FixtureServer(ThreadingHTTPServer):
+    """저장된 네이버 블로그 게시글과 가짜 검색 API를 제공하는 로컬 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, total_posts=200, latency=0.0):
+        super().__init__((host, port), _FixtureHandler)
+        self.total_posts = total_posts
+        self.latency = latency
+        self.layouts = _load_layouts()
+        self.url = f'http://{host}:{self.server_port}'
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        self.server_close()
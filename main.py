@@ -1,283 +1,242 @@
+import argparse
+import os
+import sys
 import time
-import random
-import urllib.request
-import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import pandas as pd
-import multiprocessing
-from multiprocessing import Pool
-from functools import partial
-from tqdm import tqdm
-from src.logger import program_logger, crawler_logger
-from src.api import NaverBlogAPI
-from src.crawler import NaverBlogCrawler
-from src.processor import BlogProcessor
-
-class NaverBlogCrawler:
-    def __init__(self):
-        self.chrome_paths = [
-            "C:/Program Files/Google/Chrome/Application/chrome.exe",
-            "C:/Program Files (x86)/Google/Chrome/Application/chrome.exe",
-            None
+from src.logger import program_logger
+
+# 무거운 모듈(selenium, pandas, lxml, numpy)은 필요한 단계에서만 import
+# (--dry-run, --search-only 실행과 cron/컨테이너 실행이 빨리 시작되도록)
+
+# --backend pipeline에서 --workers를 주지 않았을 때의 수집 동시성
+PIPELINE_CRAWL_CONCURRENCY = 4
+
+# --search-only 결과 파일의 열
+SEARCH_COLUMNS = [
+    ('URL', 'str'),
+    ('Title', 'str'),
+    ('APIPostDate', 'str'),
+    ('BloggerName', 'str'),
+    ('Keywords', 'str'),
+    ('KeywordHits', 'int'),
+    ('Priority', 'float')
+]
+
+def read_keywords(keywords, keywords_file=None):
+    """인자와 파일(한 줄에 하나, #으로 시작하면 주석)의 키워드를 순서대로 중복 없이 반환"""
+    collected = list(keywords or [])
+    if keywords_file:
+        with open(keywords_file, encoding='utf-8') as f:
+            collected.extend(line.strip() for line in f if line.strip() and not line.strip().startswith('#'))
+    return list(dict.fromkeys(keyword.strip() for keyword in collected if keyword.strip()))
+
+def read_credentials():
+    """환경변수의 네이버 API 인증 정보 (없으면 None)"""
+    return os.environ.get('NAVER_CLIENT_ID'), os.environ.get('NAVER_CLIENT_SECRET')
+
+def plan_items(api, keywords, args):
+    """수집할 검색 아이템 (게시글마다 한 번씩만)
+
+    키워드가 여러 개면 모든 검색을 마친 뒤 게시글 기준으로 합쳐 우선순위 순으로 반환하고,
+    하나면 합칠 결과가 없으므로 검색 페이지가 도착하는 대로 반환해 첫 페이지부터 수집을 시작
+    """
+    from src.planner import QueryPlanner
+
+    planner = QueryPlanner(api)
+    search_options = {'max_results': args.max_results, 'sort': args.sort, 'refresh': args.refresh}
+    if len(keywords) > 1:
+        return planner.plan(keywords, **search_options)
+    return planner.stream(keywords[0], **search_options)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description='네이버 블로그 검색 결과 크롤러 (NAVER_CLIENT_ID, NAVER_CLIENT_SECRET 환경변수 필요)'
+    )
+    parser.add_argument('keywords', nargs='*', help='검색 키워드')
+    parser.add_argument('-f', '--keywords-file', help='키워드 파일 (한 줄에 하나)')
+    parser.add_argument('-o', '--output', default='results.csv', help='결과 파일 (확장자로 형식 결정: csv, jsonl, parquet)')
+    parser.add_argument('--max-results', type=int, default=100, help='키워드당 최대 검색 결과 수 (최대 1099)')
+    parser.add_argument('--sort', default='sim', choices=('sim', 'date'), help='검색 정렬 (정확도순, 날짜순)')
+    parser.add_argument('--refresh', action='store_true', help='검색 캐시를 무시하고 새로 요청')
+    parser.add_argument('--no-cache', action='store_true', help='검색 캐시 사용 안 함')
+    parser.add_argument('--search-only', action='store_true', help='크롤링 없이 검색 결과만 저장')
+    parser.add_argument('--dry-run', action='store_true', help='네트워크 요청 없이 설정만 확인')
+
+    crawl = parser.add_argument_group('크롤링')
+    crawl.add_argument('--fetch-mode', default='selenium', choices=('selenium', 'http'))
+    crawl.add_argument('--lean', action='store_true', help='lean 로딩 모드 사용')
+    crawl.add_argument(
+        '--backend', default='process', choices=('process', 'thread', 'async', 'pipeline'),
+        help='실행 방식 (pipeline: 검색과 수집을 asyncio 단계로 동시에 실행, 키워드 우선순위 계획 없이 검색 순서대로 수집)'
+    )
+    crawl.add_argument('--workers', type=int, help='동시 실행 수 (기본: 메모리 예산 기준)')
+    crawl.add_argument('--autoscale', action='store_true', help='처리량과 실패율에 따라 동시 실행 수 자동 조정 (thread/async 백엔드)')
+    crawl.add_argument('--resume', action='store_true', help='결과 파일에 이미 있는 게시글은 건너뛰고 이어서 기록')
+    crawl.add_argument('--no-index', action='store_true', help='최근 수집한 게시글도 다시 수집 (수집 인덱스 사용 안 함)')
+    crawl.add_argument('--post-deadline', type=float, default=60, help='게시글당 최대 처리 시간 (초, 0이면 제한 없음)')
+    crawl.add_argument('--archive', help='페이지 원본 보관 디렉토리')
+    crawl.add_argument('--dedup', action='store_true', help='본문 유사 중복 탐지 (ClusterId/DuplicateOf 기록)')
+    crawl.add_argument('--dead-letter', help='최종 실패 게시글 기록 파일')
+    crawl.add_argument('--metrics-port', type=int, help='실시간 측정값 HTTP 포트')
+    return parser
+
+def describe_plan(args, keywords, credentials):
+    """--dry-run에서 출력할 실행 계획"""
+    mode = '검색만' if args.search_only else f'검색 + 크롤링 ({args.fetch_mode}, {args.backend} 백엔드)'
+    lines = [
+        f"키워드 {len(keywords)}개: {', '.join(keywords)}",
+        f"실행 방식: {mode}",
+        f"키워드당 최대 {args.max_results}건, 정렬 {args.sort}, 검색 캐시 {'사용 안 함' if args.no_cache else '사용'}",
+        f"결과 파일: {args.output}{' (이어하기)' if args.resume else ''}",
+        f"API 인증 정보: {'설정됨' if all(credentials) else '없음'}"
+    ]
+    if not args.search_only:
+        options = [
+            name for name, enabled in (
+                ('lean', args.lean), ('자동 조정', args.autoscale), ('원본 보관', args.archive), ('중복 탐지', args.dedup),
+                ('dead-letter', args.dead_letter), ('수집 인덱스', not args.no_index)
+            ) if enabled
         ]
-
-    def setup_driver(self):
-        """Selenium WebDriver 설정"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless=new')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=412,915')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1')
-        
-        # 개발자 도구 및 WebGL 경고 메시지 숨기기
-        chrome_options.add_argument('--log-level=3')  # 로그 레벨을 최소화
-        chrome_options.add_argument('--silent')
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])  # DevTools 로그 숨기기
-        chrome_options.add_argument('--disable-logging')  # 로깅 비활성화
-        chrome_options.add_argument('--disable-web-security')  # WebGL 관련 경고 숨기기
-        chrome_options.add_argument('--disable-software-rasterizer')  # SwiftShader 관련 경고 숨기기
-        
-        for chrome_path in self.chrome_paths:
-            try:
-                if chrome_path:
-                    chrome_options.binary_location = chrome_path
-                
-                service = Service("chromedriver.exe")
-                return webdriver.Chrome(service=service, options=chrome_options)
-            except Exception as e:
+        lines.append(f"크롤링 옵션: {', '.join(options) or '없음'}")
+    return lines
+
+def run_search_only(api, keywords, args):
+    """검색 결과만 결과 파일에 기록하고 기록한 건수를 반환"""
+    from src.sinks import open_sink
+    from src.urls import post_key
+
+    written = 0
+    with open_sink(args.output, columns=SEARCH_COLUMNS, resume=args.resume) as sink:
+        completed = {post_key(url) for url in sink.completed_urls()}
+        for item in plan_items(api, keywords, args):
+            if post_key(item['link']) in completed:
                 continue
-        
-        raise Exception("Chrome 브라우저를 시작할 수 없습니다.")
-
-    def get_blog_info(self, blog_url):
-        """블로그 정보를 Selenium으로 파싱하는 함수"""
-        crawler_logger.info(f"크롤링 시작: {blog_url}")
-        start_time = time.time()
-        
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        mobile_url = blog_url if 'm.blog.naver.com' in blog_url else blog_url.replace('blog.naver.com', 'm.blog.naver.com')
-        
-        driver = self.setup_driver()
-        wait = WebDriverWait(driver, 10)
-        
-        try:
-            driver.get(mobile_url)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-            time.sleep(random.uniform(0.5, 1))
-            
-            content = self._extract_content(driver, wait)
-            publish_date = self._extract_publish_date(driver)
-            hashtag_count = self._extract_hashtag_count(driver)
-            sticker_count = self._extract_sticker_count(driver)
-            comment_count = self._extract_comment_count(driver)
-            like_count = self._extract_like_count(driver)
-            map_count = self._extract_map_count(driver)
-            image_count = self._extract_image_count(driver)
-            
-            elapsed_time = time.time() - start_time
-            crawler_logger.info(f"크롤링 성공: {blog_url} (소요시간: {elapsed_time:.2f}초)")
-            
-            return {
-                'URL': blog_url,
-                'Content': content,
-                'PublishDate': publish_date,
-                'HashtagCount': hashtag_count,
-                'StickerCount': sticker_count,
-                'CommentCount': comment_count,
-                'LikeCount': like_count,
-                'MapCount': map_count,
-                'ImageCount': image_count
-            }
-                
-        except Exception as e:
-            elapsed_time = time.time() - start_time
-            crawler_logger.error(f"크롤링 실패: {blog_url} (소요시간: {elapsed_time:.2f}초) - 오류: {str(e)}")
-            return None
-        
-        finally:
-            driver.quit()
-
-    # 1. 본문 추출
-    def _extract_content(self, driver, wait):
-        try:
-            content_element = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.se-main-container'))
-            )
-            return content_element.text
-        except TimeoutException:
+            sink.write({
+                'URL': item['link'],
+                'Title': item['title'].replace('<b>', '').replace('</b>', ''),
+                'APIPostDate': item['postdate'],
+                'BloggerName': item.get('bloggername'),
+                'Keywords': ', '.join(item['keywords']),
+                'KeywordHits': len(item['keywords']),
+                'Priority': item['priority']
+            })
+            written += 1
+    return written
+
+def run_crawl(api, keywords, args, rate_limiter):
+    """검색 결과를 크롤링해 결과 파일에 기록하고 기록한 건수를 반환"""
+    from src.crawler import NaverBlogCrawler
+    from src.processor import BlogProcessor, DEAD_LETTER_COLUMNS
+    from src.executor import create_backend
+    from src.crawl_index import CrawlIndex
+    from src.sinks import open_sink
+
+    archive = None
+    if args.archive:
+        from src.archive import PageArchive
+        archive = PageArchive(args.archive)
+    dedup = None
+    if args.dedup:
+        from src.dedup import NearDuplicateIndex
+        dedup = NearDuplicateIndex()
+    if args.metrics_port:
+        from src.metrics import start_metrics_server
+        start_metrics_server(args.metrics_port)
+
+    crawler = NaverBlogCrawler(
+        fetch_mode=args.fetch_mode, rate_limiter=rate_limiter, lean=args.lean,
+        archive=archive, duplicate_index=dedup, post_deadline=args.post_deadline or None
+    )
+    dead_letter = open_sink(args.dead_letter, columns=DEAD_LETTER_COLUMNS, resume=True) if args.dead_letter else None
+    pipelined = args.backend == 'pipeline'
+    processor = BlogProcessor(
+        crawler,
+        crawl_index=None if args.no_index else CrawlIndex(),
+        # pipeline은 자체 단계(스레드)로 수집하므로 실행 백엔드를 쓰지 않음
+        backend=None if pipelined else create_backend(args.backend, workers=args.workers, autoscale=args.autoscale),
+        dead_letter=dead_letter,
+        dedup=dedup
+    )
+    try:
+        if pipelined:
+            from src.pipeline import CrawlPipeline
+
+            with open_sink(args.output, resume=args.resume) as sink:
+                pipeline = CrawlPipeline(
+                    api, processor, sink,
+                    crawl_concurrency=args.workers or PIPELINE_CRAWL_CONCURRENCY,
+                    search_options={'max_results': args.max_results, 'sort': args.sort, 'refresh': args.refresh}
+                )
+                return pipeline.run(keywords)
+        # 키워드가 여러 개면 최근 글이면서 여러 키워드에 걸린 게시글부터, 하나면 검색 순서대로 바로 수집
+        blog_items = plan_items(api, keywords, args)
+        with open_sink(args.output, resume=args.resume) as sink:
+            return processor.process_items(blog_items, sink=sink)
+    finally:
+        if dead_letter is not None:
+            dead_letter.close()
+        if dedup is not None:
+            dedup.log_stats()
+            dedup.close()
+        if archive is not None:
+            archive.close()
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        keywords = read_keywords(args.keywords, args.keywords_file)
+    except OSError as e:
+        parser.error(f"키워드 파일을 읽을 수 없습니다: {e}")
+    if not keywords:
+        parser.error('검색 키워드를 인자 또는 --keywords-file로 지정하세요.')
+    if args.autoscale and args.backend not in ('thread', 'async'):
+        parser.error('--autoscale은 thread/async 백엔드에서만 사용할 수 있습니다.')
+    from src.sinks import sink_format
+
+    for path in (args.output, args.dead_letter):
+        if path:
             try:
-                content_element = driver.find_element(By.CSS_SELECTOR, '#viewTypeSelector, .post-view, .se_component_wrap')
-                return content_element.text
-            except NoSuchElementException:
-                return ""
-
-    # 2. 작성일 추출
-    def _extract_publish_date(self, driver):
-        try:
-            date_element = driver.find_element(By.CSS_SELECTOR, '.blog_date, .se_publishDate, .date, .se_date, .date_time, .writer_info .date')
-            return date_element.text.strip()
-        except NoSuchElementException:
-            return ""
-
-    # 3. 해시태그 수 추출
-    def _extract_hashtag_count(self, driver):
-        try:
-            hashtag_elements = driver.find_elements(By.CSS_SELECTOR, '.tag_wrap a')
-            if not hashtag_elements:
-                hashtag_elements = driver.find_elements(By.CSS_SELECTOR, '.post_tag_wrap a, .tag__tFC3j')
-            
-            hashtag_texts = [tag.text.strip() for tag in hashtag_elements if tag.text.strip()]
-            visible_hashtag_count = sum(1 for text in hashtag_texts if text.startswith('#'))
-            additional_count = 0
-            
-            for text in hashtag_texts:
-                if text.startswith('+'):
-                    try:
-                        additional_count = int(text[1:])
-                        break
-                    except ValueError:
-                        continue
-            
-            return visible_hashtag_count + additional_count
-        except Exception:
-            return 0
-
-    # 4. 스티커 수 추출
-    def _extract_sticker_count(self, driver):
-        try:
-            stickers = driver.find_elements(By.CSS_SELECTOR, 'img.se-sticker-image, img.se-sticker-imgae, .se-sticker-image')
-            return len(stickers)
-        except Exception:
-            return 0
-
-    # 5. 댓글 수 추출
-    def _extract_comment_count(self, driver):
-        try:
-            comment_label = driver.find_element(By.XPATH, "//span[@class='sp ico'][contains(text(), '댓글')]")
-            comment_count_element = comment_label.find_element(By.XPATH, "./following-sibling::em")
-            comment_text = comment_count_element.text.strip()
-            return int(''.join(filter(str.isdigit, comment_text)))
-        except Exception:
-            return 0
-
-    # 6. 공감 수 추출
-    def _extract_like_count(self, driver):
-        try:
-            like_elements = driver.find_elements(By.CSS_SELECTOR, '.like_count, .btn_like .num, .u_cnt._count')
-            max_count = 0
-            for element in like_elements:
-                try:
-                    count_text = element.text.strip()
-                    count = int(''.join(filter(str.isdigit, count_text)))
-                    max_count = max(max_count, count)
-                except ValueError:
-                    continue
-            return max_count
-        except Exception:
-            return 0
-
-    # 7. 지도 수 추출
-    def _extract_map_count(self, driver):
-        try:
-            maps = driver.find_elements(By.CSS_SELECTOR, 'a.se-map-info, .se-module-map')
-            return len(maps)
-        except Exception:
-            return 0
-
-    # 8. 이미지 수 추출
-    def _extract_image_count(self, driver):
-        try:
-            images = driver.find_elements(By.CSS_SELECTOR, 'img[id^="img_"]')
-            return len(images)
-        except Exception:
-            return 0
-
-class NaverBlogAPI:
-    def __init__(self, client_id, client_secret):
-        self.client_id = client_id
-        self.client_secret = client_secret
-
-    def search_blog(self, keyword, display=8):
-        """네이버 블로그 검색 API를 사용하여 검색 결과를 가져오는 함수"""
-        program_logger.info(f"API 검색 시작: 키워드='{keyword}', display={display}")
-        start_time = time.time()
-        
-        encText = urllib.parse.quote(keyword)
-        url = f"https://openapi.naver.com/v1/search/blog?query={encText}&display={display}"
-        
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", self.client_id)
-        request.add_header("X-Naver-Client-Secret", self.client_secret)
-        
-        try:
-            response = urllib.request.urlopen(request)
-            rescode = response.getcode()
-            
-            if rescode == 200:
-                response_body = response.read()
-                result = json.loads(response_body.decode('utf-8'))
-                elapsed_time = time.time() - start_time
-                program_logger.info(f"API 검색 성공: {len(result['items'])}개 결과 (소요시간: {elapsed_time:.2f}초)")
-                return result['items']
-            else:
-                elapsed_time = time.time() - start_time
-                program_logger.error(f"API 검색 실패: Error Code {rescode} (소요시간: {elapsed_time:.2f}초)")
-                return []
-                
-        except Exception as e:
-            elapsed_time = time.time() - start_time
-            program_logger.error(f"API 검색 실패: {str(e)} (소요시간: {elapsed_time:.2f}초)")
-            return []
-
-def process_blog_item(item, crawler):
-    """멀티프로세싱을 위한 블로그 아이템 처리 함수"""
-    blog_url = item['link']
-    result = crawler.get_blog_info(blog_url)
-    
-    if result:
-        result['Title'] = item['title'].replace('<b>', '').replace('</b>', '')
-        result['APIPostDate'] = item['postdate']
-        return result
-    return None
-
-def main():
-    program_logger.info("프로그램 시작")
-    
-    # API 인증 정보 입력 받기
-    client_id = input("네이버 API Client ID를 입력하세요: ")
-    client_secret = input("네이버 API Client Secret을 입력하세요: ")
-    
-    # API 검색 실행
-    api = NaverBlogAPI(client_id, client_secret)
-    blog_items = api.search_blog("맛집")
-    
-    if not blog_items:
-        program_logger.warning("검색 결과가 없습니다.")
-        return
-    
-    # 크롤러와 프로세서 초기화
-    crawler = NaverBlogCrawler()
-    processor = BlogProcessor(crawler)
-    
-    # 블로그 아이템 처리
-    results = processor.process_items(blog_items)
-    
-    # 결과 저장
-    filename = processor.save_results(results)
-    
-    program_logger.info("프로그램 종료")
-    if filename:
-        print(f"\n크롤링이 완료되었습니다. 결과는 {filename}에 저장되었습니다.")
-        print(f"상세 로그는 logs 디렉토리에서 확인할 수 있습니다.")
+                sink_format(path)
+            except ValueError as e:
+                parser.error(f"{path}: {e}")
+    credentials = read_credentials()
+
+    if args.dry_run:
+        for line in describe_plan(args, keywords, credentials):
+            print(line)
+        return 0 if all(credentials) else 1
+    if not all(credentials):
+        parser.error('NAVER_CLIENT_ID, NAVER_CLIENT_SECRET 환경변수를 설정하세요.')
+
+    from src.api import NaverBlogAPI
+    from src.search_cache import SearchCache
+    from src.rate_limiter import AdaptiveRateLimiter
+
+    program_logger.info(f"프로그램 시작: 키워드 {len(keywords)}개{' (검색만)' if args.search_only else ''}")
+    start_time = time.time()
+
+    # 검색 API와 크롤러 워커가 같은 호스트별 속도 제한을 공유
+    rate_limiter = AdaptiveRateLimiter()
+    cache = None if args.no_cache else SearchCache()
+    api = NaverBlogAPI(*credentials, cache=cache, rate_limiter=rate_limiter)
+    try:
+        if args.search_only:
+            written = run_search_only(api, keywords, args)
+        else:
+            written = run_crawl(api, keywords, args, rate_limiter)
+    finally:
+        if cache is not None:
+            cache.log_stats()
+            cache.close()
+
+    program_logger.info(f"프로그램 종료: {written}건 기록 (소요시간: {time.time() - start_time:.2f}초)")
+    if not written:
+        program_logger.warning("저장할 결과가 없습니다.")
+        return 1
+    print(f"\n{'검색' if args.search_only else '크롤링'}이 완료되었습니다. 결과는 {args.output}에 저장되었습니다. ({written}건)")
+    print(f"상세 로그는 logs 디렉토리에서 확인할 수 있습니다.")
+    return 0
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
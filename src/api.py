@@ -1,41 +1,118 @@
-import urllib.request
-import json
+import urllib.parse
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.logger import program_logger
+from src.transport import HttpTransport
+from src.metrics import metrics
+
+# 네이버 블로그 검색 API 제한: display 최대 100, start 최대 1000
+MAX_DISPLAY = 100
+MAX_START = 1000
+
+SEARCH_API_BASE_URL = "https://openapi.naver.com"
 
 class NaverBlogAPI:
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, transport=None, base_url=SEARCH_API_BASE_URL, cache=None, rate_limiter=None):
         self.client_id = client_id
         self.client_secret = client_secret
+        # get(url, headers)를 제공하는 객체라면 무엇이든 전송 계층으로 교체 가능 (테스트용 스텁 서버 등)
+        self.transport = transport or HttpTransport()
+        self.base_url = base_url.rstrip('/')
+        # SearchCache 등 get/put을 제공하는 캐시 (None이면 캐시 미사용)
+        self.cache = cache
+        # openapi.naver.com 버킷으로 요청 속도 제한 (None이면 제한 없음)
+        self.rate_limiter = rate_limiter
+
+    def search_blog(self, keyword, display=8, start=1, sort='sim', refresh=False):
+        """네이버 블로그 검색 API를 사용하여 검색 결과를 가져오는 함수 (refresh=True면 캐시를 무시하고 새로 요청)"""
+        result = self._request_page(keyword, display, start, sort, refresh)
+        return result['items'] if result else []
+
+    def iter_search_pages(self, keyword, max_results=MAX_START + MAX_DISPLAY - 1, display=MAX_DISPLAY, sort='sim', concurrency=4, refresh=False):
+        """start를 증가시키며 여러 페이지를 동시에 요청하고, 도착한 페이지부터 순서대로 반환하는 제너레이터"""
+        first = self._request_page(keyword, min(display, max_results), 1, sort, refresh)
+        if not first or not first['items']:
+            return
+        
+        # 첫 페이지의 total을 기준으로 나머지 페이지 범위 결정
+        limit = min(first.get('total', 0), max_results)
+        pages = []
+        start = 1 + display
+        while start <= min(limit, MAX_START):
+            pages.append((start, min(display, limit - start + 1), 0))
+            start += display
+        if start <= limit:
+            # start는 MAX_START를 넘을 수 없으므로 마지막 페이지는 MAX_START부터 요청하고 이미 받은 앞부분은 버림
+            pages.append((MAX_START, min(MAX_DISPLAY, limit - MAX_START + 1), start - MAX_START))
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        try:
+            futures = {
+                executor.submit(self._request_page, keyword, page_display, page_start, sort, refresh): skip
+                for page_start, page_display, skip in pages
+            }
+            # 나머지 페이지가 요청 중인 동안 첫 페이지부터 바로 처리할 수 있도록 반환
+            yield first['items']
+            for future in as_completed(futures):
+                result = future.result()
+                items = result['items'][futures[future]:] if result else []
+                if items:
+                    yield items
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_search(self, keyword, **kwargs):
+        """iter_search_pages의 결과를 아이템 단위로 펼쳐서 반환하는 제너레이터"""
+        for items in self.iter_search_pages(keyword, **kwargs):
+            yield from items
 
-    def search_blog(self, keyword, display=8):
-        """네이버 블로그 검색 API를 사용하여 검색 결과를 가져오는 함수"""
-        program_logger.info(f"API 검색 시작: 키워드='{keyword}', display={display}")
+    def _request_page(self, keyword, display, start, sort, refresh=False):
+        """검색 API 한 페이지를 요청해 응답 전체(dict)를 반환, 실패 시 None"""
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(keyword, start, display, sort)
+            if cached is not None:
+                metrics.inc('search_cache_total', result='hit')
+                return cached
+            metrics.inc('search_cache_total', result='miss')
+        
+        program_logger.info(f"API 검색 시작: 키워드='{keyword}', display={display}, start={start}, sort={sort}")
         start_time = time.time()
         
         encText = urllib.parse.quote(keyword)
-        url = f"https://openapi.naver.com/v1/search/blog?query={encText}&display={display}"
-        
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", self.client_id)
-        request.add_header("X-Naver-Client-Secret", self.client_secret)
+        url = f"{self.base_url}/v1/search/blog?query={encText}&display={display}&start={start}&sort={sort}"
+        headers = {
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret
+        }
         
         try:
-            response = urllib.request.urlopen(request)
-            rescode = response.getcode()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            request_start = time.time()
+            with metrics.span('search_request'):
+                response = self.transport.get(url, headers=headers)
+            rescode = response.status
+            metrics.inc('search_requests_total', status=rescode)
+            if self.rate_limiter is not None:
+                self.rate_limiter.feedback(url, status=rescode, latency=time.time() - request_start)
             
             if rescode == 200:
-                response_body = response.read()
-                result = json.loads(response_body.decode('utf-8'))
+                result = response.json()
                 elapsed_time = time.time() - start_time
-                program_logger.info(f"API 검색 성공: {len(result['items'])}개 결과 (소요시간: {elapsed_time:.2f}초)")
-                return result['items']
+                program_logger.info(
+                    f"API 검색 성공: {len(result['items'])}개 결과 (소요시간: {elapsed_time:.2f}초)",
+                    extra={'keyword': keyword, 'elapsed': round(elapsed_time, 3), 'stage': 'search', 'status': rescode}
+                )
+                if self.cache is not None:
+                    self.cache.put(keyword, start, display, sort, result)
+                return result
             else:
                 elapsed_time = time.time() - start_time
                 program_logger.error(f"API 검색 실패: Error Code {rescode} (소요시간: {elapsed_time:.2f}초)")
-                return []
+                return None
                 
         except Exception as e:
             elapsed_time = time.time() - start_time
             program_logger.error(f"API 검색 실패: {str(e)} (소요시간: {elapsed_time:.2f}초)")
-            return [] 
\ No newline at end of file
+            metrics.inc('search_requests_total', status='error')
+            return None
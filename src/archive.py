@@ -0,0 +1,211 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from src.logger import crawler_logger
+from src.urls import post_key
+
+CODEC_ZSTD = 'zstd'
+CODEC_GZIP = 'gzip'
+
+SEGMENT_EXTENSIONS = {CODEC_ZSTD: 'zst', CODEC_GZIP: 'gz'}
+
+# 세그먼트 파일 하나의 최대 크기 (넘으면 새 세그먼트로 교체)
+SEGMENT_MAX_BYTES = 256 * 1024 * 1024
+
+def _zstandard():
+    """zstandard가 설치되어 있으면 모듈, 아니면 None (선택 의존성)"""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+def default_codec():
+    return CODEC_ZSTD if _zstandard() is not None else CODEC_GZIP
+
+def page_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def compress(data, codec, level=None):
+    if codec == CODEC_ZSTD:
+        return _zstandard().ZstdCompressor(level=level or 3).compress(data)
+    return gzip.compress(data, compresslevel=level or 6)
+
+def decompress(data, codec):
+    if codec == CODEC_ZSTD:
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 보관본을 읽으려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+class PageArchive:
+    """게시글 원본 HTML을 내용 해시 기준으로 중복 없이 압축 세그먼트 파일에 보관하는 저장소
+
+    레코드는 개별 압축되어 세그먼트 파일 끝에 추가되고, 위치(세그먼트, 오프셋, 길이)는
+    SQLite 인덱스에 기록. 프로세스마다 자기 세그먼트 파일에만 쓰므로 워커끼리 파일을 공유하지 않음
+    """
+
+    def __init__(self, path='archive', codec=None, level=None, segment_max_bytes=SEGMENT_MAX_BYTES):
+        self.path = path
+        self.codec = codec or default_codec()
+        if self.codec not in SEGMENT_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 압축 방식입니다: {self.codec}")
+        if self.codec == CODEC_ZSTD and _zstandard() is None:
+            raise RuntimeError("zstd 압축을 사용하려면 zstandard 패키지가 필요합니다.")
+        self.level = level
+        self.segment_max_bytes = segment_max_bytes
+        self.index_path = os.path.join(path, 'index.sqlite3')
+
+        segment_dir = os.path.join(path, 'segments')
+        if not os.path.exists(segment_dir):
+            os.makedirs(segment_dir)
+
+        self._reset()
+        with self._lock:
+            self._connect().commit()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._conn = None
+        self._segment = None
+        self._segment_name = None
+        self._segment_seq = 0
+
+    def __getstate__(self):
+        # 연결과 열린 세그먼트 파일은 프로세스마다 새로 생성
+        state = self.__dict__.copy()
+        for name in ('_lock', '_conn', '_segment'):
+            state[name] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            # fork로 복사된 연결/파일은 부모 것이므로 사용하지 않음
+            self._reset()
+        if self._conn is None:
+            # 여러 워커 프로세스가 같은 인덱스에 기록하므로 WAL 모드와 잠금 대기 사용
+            self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    segment TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    codec TEXT NOT NULL,
+                    raw_size INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    post_key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    fetch_path TEXT,
+                    archived_at REAL NOT NULL
+                )
+            """)
+        return self._conn
+
+    def _segment_file(self, size):
+        """기록할 세그먼트 파일, 크기 제한을 넘으면 새 파일로 교체"""
+        if self._segment is not None and self._segment.tell() + size > self.segment_max_bytes:
+            self._segment.close()
+            self._segment = None
+        if self._segment is None:
+            self._segment_seq += 1
+            extension = SEGMENT_EXTENSIONS[self.codec]
+            self._segment_name = f"{time.strftime('%Y%m%d_%H%M%S')}-{self._pid}-{self._segment_seq:04d}.{extension}"
+            self._segment = open(os.path.join(self.path, 'segments', self._segment_name), 'ab')
+        return self._segment
+
+    def put(self, blog_url, page_source, fetch_path=None):
+        """페이지 원본을 보관하고 내용 해시를 반환, 실패해도 수집은 계속되도록 None 반환"""
+        try:
+            return self._put(blog_url, page_source, fetch_path)
+        except (OSError, sqlite3.Error) as e:
+            crawler_logger.warning(f"원본 보관 실패: {blog_url} - 오류: {str(e)}", extra={'url': blog_url, 'stage': 'archive'})
+            return None
+
+    def _put(self, blog_url, page_source, fetch_path):
+        data = page_source.encode('utf-8')
+        digest = page_digest(data)
+        with self._lock:
+            conn = self._connect()
+            exists = conn.execute("SELECT 1 FROM blobs WHERE digest=?", (digest,)).fetchone()
+            if exists is None:
+                payload = compress(data, self.codec, self.level)
+                segment = self._segment_file(len(payload))
+                offset = segment.tell()
+                segment.write(payload)
+                # 인덱스에 기록되기 전에 데이터가 파일에 있어야 다른 프로세스가 읽을 수 있음
+                segment.flush()
+                conn.execute(
+                    "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, self._segment_name, offset, len(payload), self.codec, len(data))
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (post_key(blog_url), blog_url, digest, fetch_path, time.time())
+            )
+            conn.commit()
+        return digest
+
+    def get(self, blog_url):
+        """보관된 페이지 원본을 반환, 없으면 None"""
+        with self._lock:
+            row = self._connect().execute("""
+                SELECT b.segment, b.offset, b.length, b.codec
+                FROM pages p JOIN blobs b ON p.digest = b.digest
+                WHERE p.post_key=?
+            """, (post_key(blog_url),)).fetchone()
+        if row is None:
+            return None
+        return read_record(self.path, *row)
+
+    def entries(self):
+        """(URL, 수집 경로, 세그먼트, 오프셋, 길이, 압축 방식) 목록을 세그먼트 내 위치 순서로 반환"""
+        with self._lock:
+            return self._connect().execute("""
+                SELECT p.url, p.fetch_path, b.segment, b.offset, b.length, b.codec
+                FROM pages p JOIN blobs b ON p.digest = b.digest
+                ORDER BY b.segment, b.offset
+            """).fetchall()
+
+    def stats(self):
+        with self._lock:
+            conn = self._connect()
+            pages = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, raw_size, stored_size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(length), 0) FROM blobs"
+            ).fetchone()
+        return {'pages': pages, 'blobs': blobs, 'raw_bytes': raw_size, 'stored_bytes': stored_size}
+
+    def close(self):
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def read_record(archive_path, segment, offset, length, codec, handle=None):
+    """세그먼트에서 레코드 하나를 읽어 압축을 풀고 문자열로 반환 (handle이 있으면 재사용)"""
+    if handle is None:
+        with open(os.path.join(archive_path, 'segments', segment), 'rb') as f:
+            f.seek(offset)
+            payload = f.read(length)
+    else:
+        handle.seek(offset)
+        payload = handle.read(length)
+    return decompress(payload, codec).decode('utf-8')
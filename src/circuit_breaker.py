@@ -0,0 +1,86 @@
+import multiprocessing
+import time
+from src.logger import crawler_logger
+from src.rate_limiter import normalize_host
+
+DEFAULT_BREAKER_HOSTS = ('blog.naver.com', '*')
+
+# 상태 배열에서 호스트 하나가 차지하는 칸: 구간 시작, 요청 수, 오류 수, 열림 종료 시각, 연속 열림 횟수, 반열림 여부
+_SLOTS = 6
+
+class CircuitBreaker:
+    """프로세스와 스레드가 공유하는 호스트별 서킷 브레이커
+
+    window초 동안 min_requests건 이상 중 오류 비율이 error_rate를 넘으면 open_seconds 동안 요청을 멈추고,
+    다시 열릴 때마다 멈추는 시간을 두 배로 늘림(max_open_seconds까지). 멈춤이 끝난 뒤 첫 요청이
+    성공하면 닫히고 실패하면 바로 다시 열림. 공유 상태 전달 방식은 AdaptiveRateLimiter와 같음
+    """
+
+    def __init__(self, hosts=DEFAULT_BREAKER_HOSTS, window=60.0, min_requests=10, error_rate=0.5, open_seconds=30.0, max_open_seconds=600.0):
+        self.hosts = list(hosts)
+        self.window = window
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self._lock = multiprocessing.Lock()
+        self._state = multiprocessing.RawArray('d', len(self.hosts) * _SLOTS)
+        now = time.time()
+        for index in range(len(self.hosts)):
+            self._state[index * _SLOTS] = now
+
+    def _index(self, host):
+        host = normalize_host(host)
+        if host in self.hosts:
+            return self.hosts.index(host)
+        return self.hosts.index('*')
+
+    def wait(self, host):
+        """호스트의 서킷이 열려 있으면 닫힐 때까지 대기하고 대기한 시간(초)을 반환"""
+        base = self._index(host) * _SLOTS
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._state[base + 3] - time.time()
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def is_open(self, host):
+        return self._state[self._index(host) * _SLOTS + 3] > time.time()
+
+    def record(self, host, success):
+        """요청 결과 기록, 오류율이 기준을 넘으면 서킷을 열고 True 반환"""
+        host_name = normalize_host(host)
+        base = self._index(host) * _SLOTS
+        with self._lock:
+            now = time.time()
+            window_start, requests, errors, open_until, trips, half_open = self._state[base:base + _SLOTS]
+            if now < open_until:
+                # 열리기 전에 시작된 요청의 결과는 반영하지 않음
+                return False
+            if half_open:
+                if success:
+                    self._state[base:base + _SLOTS] = [now, 0, 0, 0, 0, 0]
+                    opened = False
+                else:
+                    opened = True
+            else:
+                if now - window_start > self.window:
+                    window_start, requests, errors = now, 0, 0
+                requests += 1
+                errors += 0 if success else 1
+                opened = requests >= self.min_requests and errors / requests >= self.error_rate
+                self._state[base:base + 3] = [window_start, requests, errors]
+            if opened:
+                duration = min(self.max_open_seconds, self.open_seconds * 2 ** trips)
+                self._state[base:base + _SLOTS] = [now, 0, 0, now + duration, trips + 1, 1]
+
+        if opened:
+            crawler_logger.warning(
+                f"서킷 브레이커 열림: {host_name} {duration:.0f}초 동안 수집 중지",
+                extra={'stage': 'circuit_breaker', 'status': 'open'}
+            )
+        return opened
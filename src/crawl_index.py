@@ -0,0 +1,96 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from src.logger import program_logger
+from src.urls import post_key
+from src.failures import CrawlFailure, FAILURE_GONE
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+# 삭제/비공개 게시글: 이후 실행에서도 다시 수집하지 않음
+STATUS_GONE = 'gone'
+
+def content_hash(content):
+    return hashlib.sha1((content or '').encode('utf-8')).hexdigest()
+
+class CrawlIndex:
+    def __init__(self, path='cache/crawl_index.sqlite3', freshness=7 * 24 * 60 * 60):
+        self.path = path
+        self.freshness = freshness
+
+        index_dir = os.path.dirname(path)
+        if index_dir and not os.path.exists(index_dir):
+            os.makedirs(index_dir)
+
+        # 제너레이터 입력은 Pool의 작업 분배 스레드에서 소비되므로 연결을 잠금으로 보호
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_index (
+                post_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                content_hash TEXT,
+                last_crawled_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def is_fresh(self, key, now=None):
+        """이미 성공적으로 수집되었고 freshness 기간이 지나지 않은(또는 삭제/비공개로 확인된) 게시글인지 확인"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, last_crawled_at FROM crawl_index WHERE post_key=?", (key,)
+            ).fetchone()
+        if row is not None and row[0] == STATUS_GONE:
+            return True
+        if row is None or row[0] != STATUS_DONE:
+            return False
+        return (now or time.time()) - row[1] < self.freshness
+
+    def filter_pending(self, blog_items):
+        """최근에 수집된 게시글과 같은 실행 안의 중복 URL을 제외 (리스트면 리스트, 아니면 제너레이터 반환)"""
+        if isinstance(blog_items, list):
+            pending = list(self._iter_pending(blog_items))
+            program_logger.info(f"수집 인덱스 적용: {len(blog_items)}건 중 {len(pending)}건 수집 대상")
+            return pending
+        return self._iter_pending(blog_items)
+
+    def _iter_pending(self, blog_items):
+        seen = set()
+        now = time.time()
+        for item in blog_items:
+            key = post_key(item['link'])
+            if key in seen or self.is_fresh(key, now):
+                continue
+            seen.add(key)
+            yield item
+
+    def done_entries(self):
+        """수집에 성공한 게시글의 (URL, 마지막 수집 시각) 목록"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, last_crawled_at FROM crawl_index WHERE status=?", (STATUS_DONE,)
+            ).fetchall()
+
+    def record(self, blog_url, result):
+        """수집 결과(성공 시 본문 해시 포함)를 인덱스에 기록"""
+        if result:
+            status = STATUS_DONE
+        elif isinstance(result, CrawlFailure) and result.kind == FAILURE_GONE:
+            status = STATUS_GONE
+        else:
+            status = STATUS_FAILED
+        digest = content_hash(result.get('Content')) if result else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_index VALUES (?, ?, ?, ?, ?)",
+                (post_key(blog_url), blog_url, status, digest, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
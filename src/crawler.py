@@ -1,16 +1,73 @@
 import time
-import random
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from src.logger import crawler_logger
+from src.extraction import BLOG_FIELDS, extract_fields, css_selectors, split_spec
+from src.fast_path import HttpBlogFetcher, MOBILE_USER_AGENT
+from src.urls import to_mobile_url, post_key, MOBILE_BLOG_BASE_URL
+from src.rate_limiter import AdaptiveRateLimiter, is_captcha_url
+from src.metrics import metrics
+from src.failures import CrawlFailure, PostUnavailable, RateLimited, DeadlineExceeded, classify_error, is_gone_page
+from src.watchdog import watchdog
+from src.dedup import DUPLICATE_KEEP_FIELDS
+
+# 본문 영역(기본 + 폴백 레이아웃) 중 하나라도 나타나면 추출 시작
+CONTENT_WAIT_SELECTOR = css_selectors('Content')
+
+# lean 모드에서 본문 이후 비동기로 채워지는 공감 수를 잠깐 더 기다릴 셀렉터와 시간
+ENGAGEMENT_WAIT_SELECTOR = css_selectors('LikeCount')
+ENGAGEMENT_WAIT_TIMEOUT = 2
+
+def counter_filled(locator):
+    """locator에 맞는 요소 중 하나에 숫자가 채워지면 그 요소를 반환하는 WebDriverWait 조건
+
+    공감 수 자리(span)는 스크립트가 숫자를 채우기 전부터 있으므로 요소가 있는지로는 기다릴 수 없음
+    """
+    def condition(driver):
+        for element in driver.find_elements(*locator):
+            if any(char.isdigit() for char in element.text):
+                return element
+        return False
+    return condition
+
+# lean 모드에서 차단할 리소스 (이미지, 미디어, 폰트, 외부 트래커/광고)
+LEAN_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.mp4', '*.webm', '*.m3u8', '*.ts',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*lcs.naver.com*', '*nlog.naver.com*', '*adcr.naver.com*', '*veta.naver.com*'
+]
+
+# 중복 인덱스를 쓸 때 먼저 추출하는 필드와, 이미 수집한 글의 변형이면 생략하는 필드
+PRIMARY_FIELDS, DETAIL_FIELDS = split_spec(DUPLICATE_KEEP_FIELDS)
+
+# 게시글 하나에 쓸 수 있는 최대 시간 (브라우저 실행, 페이지 이동, 추출 포함, 속도 제한 대기 제외)
+POST_DEADLINE = 60
+# 페이지/셀렉터 대기 상한 (남은 처리 시간이 더 짧으면 그만큼만 대기)
+PAGE_WAIT_TIMEOUT = 10
+
+# 수집 모드: 'selenium'은 항상 브라우저 사용, 'http'는 HTTP 경로 우선 후 필요 시 Selenium 폴백
+FETCH_MODES = ('selenium', 'http')
 
 class NaverBlogCrawler:
-    def __init__(self):
+    def __init__(self, fetch_mode='selenium', rate_limiter=None, lean=False, mobile_base_url=MOBILE_BLOG_BASE_URL, archive=None, duplicate_index=None,
+                 post_deadline=POST_DEADLINE):
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"지원하지 않는 수집 모드입니다: {fetch_mode}")
+        self.fetch_mode = fetch_mode
+        # DOM만 필요하므로 이미지/미디어/폰트/트래커를 막고 필요한 셀렉터만 기다리는 경량 로딩
+        self.lean = lean
+        # 워커 프로세스/스레드가 함께 쓰는 호스트별 속도 제한 (고정 랜덤 대기를 대체)
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        # 수집한 페이지 원본을 보관해 두면 레이아웃 변경이나 필드 추가 시 재수집 없이 재추출 가능
+        self.archive = archive
+        # 주어지면 Selenium 경로에서 본문을 먼저 추출해 이미 수집한 글의 변형인지 확인하고,
+        # 변형이면 공감 수 대기와 나머지 필드 추출을 생략 (NearDuplicateIndex, 조회만 함)
+        self.duplicate_index = duplicate_index
+        # 기한을 넘긴 게시글은 감시자가 chromedriver/Chrome 프로세스 트리를 종료해 워커가 멈추지 않도록 함 (None이면 제한 없음)
+        self.post_deadline = post_deadline
+        self.http_fetcher = HttpBlogFetcher(
+            rate_limiter=self.rate_limiter, base_url=mobile_base_url, archive=archive
+        ) if fetch_mode == 'http' else None
         self.chrome_paths = [
             "C:/Program Files/Google/Chrome/Application/chrome.exe",
             "C:/Program Files (x86)/Google/Chrome/Application/chrome.exe",
@@ -19,13 +76,22 @@ class NaverBlogCrawler:
 
     def setup_driver(self):
         """Selenium WebDriver 설정"""
+        with metrics.span('driver_launch'):
+            return self._launch_driver()
+
+    def _launch_driver(self):
+        # selenium은 브라우저를 띄우는 단계에서만 import (검색만 하거나 HTTP 경로만 쓰는 실행은 로딩 비용 없음)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+
         chrome_options = Options()
         chrome_options.add_argument('--headless=new')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=412,915')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1')
+        chrome_options.add_argument(f'--user-agent={MOBILE_USER_AGENT}')
         
         # 개발자 도구 및 WebGL 경고 메시지 숨기기
         chrome_options.add_argument('--log-level=3')
@@ -35,150 +101,183 @@ class NaverBlogCrawler:
         chrome_options.add_argument('--disable-web-security')
         chrome_options.add_argument('--disable-software-rasterizer')
         
+        if self.lean:
+            # DOMContentLoaded 시점에 제어를 돌려받고, 이미지는 요청/디코딩하지 않음
+            chrome_options.page_load_strategy = 'eager'
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        
         for chrome_path in self.chrome_paths:
+            # 앞선 경로에서 처리 시간을 다 썼으면 다음 경로를 시도하지 않음
+            watchdog.check()
             try:
                 if chrome_path:
                     chrome_options.binary_location = chrome_path
                 
                 service = Service("chromedriver.exe")
-                return webdriver.Chrome(service=service, options=chrome_options)
+                # 세션 생성 중에 멈추면 감시자가 이 chromedriver를 종료
+                watchdog.watch(service)
+                driver = webdriver.Chrome(service=service, options=chrome_options)
             except Exception as e:
                 continue
+            
+            if self.lean:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+            return driver
         
+        watchdog.check()
         raise Exception("Chrome 브라우저를 시작할 수 없습니다.")
 
-    def get_blog_info(self, blog_url):
-        """블로그 정보를 Selenium으로 파싱하는 함수"""
-        crawler_logger.info(f"크롤링 시작: {blog_url}")
+    def get_blog_info(self, blog_url, driver_pool=None):
+        """블로그 정보를 Selenium으로 파싱하는 함수 (실패 시 종류가 분류된 CrawlFailure 반환)
+
+        브라우저 실행부터 추출까지 post_deadline초 안에 끝나지 않으면 감시자가 브라우저를 종료하고 실패로 반환
+        """
+        crawler_logger.info(f"크롤링 시작: {blog_url}", extra={'url': blog_url, 'stage': 'start'})
         start_time = time.time()
+        if not self.post_deadline:
+            return self._get_blog_info(blog_url, driver_pool, start_time)
+        with watchdog.deadline(self.post_deadline):
+            return self._get_blog_info(blog_url, driver_pool, start_time)
+
+    def _get_blog_info(self, blog_url, driver_pool, start_time):
+        if self.http_fetcher is not None:
+            try:
+                fields = self.http_fetcher.get_blog_info(blog_url)
+            except (PostUnavailable, RateLimited) as e:
+                return self._failure(blog_url, e, start_time, 'http')
+            if fields is not None:
+                elapsed_time = time.time() - start_time
+                crawler_logger.info(
+                    f"크롤링 성공(HTTP): {blog_url} (소요시간: {elapsed_time:.2f}초)",
+                    extra={'url': blog_url, 'elapsed': round(elapsed_time, 3), 'stage': 'done', 'path': 'http'}
+                )
+                metrics.inc('crawl_success_total', path='http')
+                metrics.observe('post_seconds', elapsed_time, path='http')
+                return {'URL': blog_url, **fields, 'FetchPath': 'http'}
+            crawler_logger.info(
+                f"HTTP 경로에서 필수 필드 누락, Selenium으로 재시도: {blog_url}",
+                extra={'url': blog_url, 'stage': 'fallback', 'path': 'http'}
+            )
+            metrics.inc('http_fallback_total')
         
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        mobile_url = blog_url if 'm.blog.naver.com' in blog_url else blog_url.replace('blog.naver.com', 'm.blog.naver.com')
-        
-        driver = self.setup_driver()
-        wait = WebDriverWait(driver, 10)
+        mobile_url = to_mobile_url(blog_url)
         
+        # 드라이버 풀이 주어지면 대여한 드라이버를 재사용하고, 아니면 1회용 드라이버 사용
+        # (_parse_blog는 예외를 실패로 반환하므로 여기서 잡히는 것은 드라이버를 준비하지 못한 경우로,
+        # 처리 기한 초과도 워커를 멈추지 않고 실패로 반환)
         try:
-            driver.get(mobile_url)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-            time.sleep(random.uniform(0.5, 1))
-            
-            content = self._extract_content(driver, wait)
-            publish_date = self._extract_publish_date(driver)
-            hashtag_count = self._extract_hashtag_count(driver)
-            sticker_count = self._extract_sticker_count(driver)
-            comment_count = self._extract_comment_count(driver)
-            like_count = self._extract_like_count(driver)
-            map_count = self._extract_map_count(driver)
-            image_count = self._extract_image_count(driver)
-            
-            elapsed_time = time.time() - start_time
-            crawler_logger.info(f"크롤링 성공: {blog_url} (소요시간: {elapsed_time:.2f}초)")
-            
-            return {
-                'URL': blog_url,
-                'Content': content,
-                'PublishDate': publish_date,
-                'HashtagCount': hashtag_count,
-                'StickerCount': sticker_count,
-                'CommentCount': comment_count,
-                'LikeCount': like_count,
-                'MapCount': map_count,
-                'ImageCount': image_count
-            }
-                
+            if driver_pool is not None:
+                with driver_pool.lease() as driver:
+                    return self._parse_blog(driver, blog_url, mobile_url, start_time)
+            driver = self.setup_driver()
         except Exception as e:
-            elapsed_time = time.time() - start_time
-            crawler_logger.error(f"크롤링 실패: {blog_url} (소요시간: {elapsed_time:.2f}초) - 오류: {str(e)}")
-            return None
-        
+            return self._failure(blog_url, e, start_time, 'selenium')
+        try:
+            return self._parse_blog(driver, blog_url, mobile_url, start_time)
         finally:
             driver.quit()
 
-    def _extract_content(self, driver, wait):
-        try:
-            content_element = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.se-main-container'))
-            )
-            return content_element.text
-        except TimeoutException:
-            try:
-                content_element = driver.find_element(By.CSS_SELECTOR, '#viewTypeSelector, .post-view, .se_component_wrap')
-                return content_element.text
-            except NoSuchElementException:
-                return ""
-
-    def _extract_publish_date(self, driver):
-        try:
-            date_element = driver.find_element(By.CSS_SELECTOR, '.blog_date, .se_publishDate, .date, .se_date, .date_time, .writer_info .date')
-            return date_element.text.strip()
-        except NoSuchElementException:
-            return ""
+    def _parse_blog(self, driver, blog_url, mobile_url, start_time):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 
-    def _extract_hashtag_count(self, driver):
         try:
-            hashtag_elements = driver.find_elements(By.CSS_SELECTOR, '.tag_wrap a')
-            if not hashtag_elements:
-                hashtag_elements = driver.find_elements(By.CSS_SELECTOR, '.post_tag_wrap a, .tag__tFC3j')
+            # 대여한 드라이버가 멈춰도 감시자가 종료할 수 있도록 등록
+            watchdog.watch(getattr(driver, 'service', None))
+            with metrics.span('rate_limit_wait'), watchdog.paused():
+                self.rate_limiter.acquire(mobile_url)
+            watchdog.check()
+            if watchdog.remaining() is not None:
+                # 페이지 로딩도 남은 처리 시간 안에서 끝나도록 제한
+                driver.set_page_load_timeout(max(1, watchdog.remaining()))
+            load_start = time.time()
+            with metrics.span('page_load'):
+                driver.get(mobile_url)
+                if not self.lean:
+                    WebDriverWait(driver, self._wait_timeout()).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+            captcha = is_captcha_url(driver.current_url)
+            self.rate_limiter.feedback(mobile_url, latency=time.time() - load_start, captcha=captcha)
+            if captcha:
+                raise RateLimited(f"캡차 페이지로 이동했습니다: {driver.current_url}")
             
-            hashtag_texts = [tag.text.strip() for tag in hashtag_elements if tag.text.strip()]
-            visible_hashtag_count = sum(1 for text in hashtag_texts if text.startswith('#'))
-            additional_count = 0
+            # 본문 셀렉터가 나타날 때까지 대기한 뒤 모든 필드를 한 번에 추출
+            wait_start = time.perf_counter()
+            try:
+                WebDriverWait(driver, self._wait_timeout()).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, CONTENT_WAIT_SELECTOR))
+                )
+            except TimeoutException:
+                pass
+            metrics.observe('stage_seconds', time.perf_counter() - wait_start, stage='selector_wait')
             
-            for text in hashtag_texts:
-                if text.startswith('+'):
-                    try:
-                        additional_count = int(text[1:])
-                        break
-                    except ValueError:
-                        continue
+            fields = {}
+            detail_spec = BLOG_FIELDS
+            if self.duplicate_index is not None:
+                with metrics.span('extract', path='selenium'):
+                    fields = extract_fields(driver, PRIMARY_FIELDS)
+                detail_spec = DETAIL_FIELDS
+                # 다시 수집하는 게시글이 색인된 자기 자신과 일치하지 않도록 제외
+                if self.duplicate_index.find(fields.get('Content'), exclude_key=post_key(blog_url)) is not None:
+                    detail_spec = None
             
-            return visible_hashtag_count + additional_count
-        except Exception:
-            return 0
-
-    def _extract_sticker_count(self, driver):
-        try:
-            stickers = driver.find_elements(By.CSS_SELECTOR, 'img.se-sticker-image, img.se-sticker-imgae, .se-sticker-image')
-            return len(stickers)
-        except Exception:
-            return 0
+            if detail_spec is None:
+                fields.update(dict.fromkeys(field.name for field in DETAIL_FIELDS))
+                metrics.inc('duplicate_fields_skipped_total')
+            else:
+                if self.lean:
+                    # eager 로딩은 스크립트로 채워지는 공감 수보다 먼저 끝날 수 있으므로 숫자가 채워질 때까지 짧게 추가 대기
+                    with metrics.span('engagement_wait'):
+                        try:
+                            WebDriverWait(
+                                driver, ENGAGEMENT_WAIT_TIMEOUT, ignored_exceptions=(StaleElementReferenceException,)
+                            ).until(counter_filled((By.CSS_SELECTOR, ENGAGEMENT_WAIT_SELECTOR)))
+                        except TimeoutException:
+                            pass
+                with metrics.span('extract', path='selenium'):
+                    fields.update(extract_fields(driver, detail_spec))
+            if not fields.get('Content'):
+                # 본문이 비어 있을 때만 안내 문구를 확인 (삭제/비공개 게시글은 재시도하지 않음)
+                body_text = driver.execute_script("return document.body ? document.body.innerText : ''")
+                if is_gone_page(body_text):
+                    raise PostUnavailable("삭제되었거나 비공개인 게시글입니다.")
+            if self.archive is not None:
+                with metrics.span('archive'):
+                    self.archive.put(blog_url, driver.page_source, 'selenium')
+            
+            elapsed_time = time.time() - start_time
+            crawler_logger.info(
+                f"크롤링 성공: {blog_url} (소요시간: {elapsed_time:.2f}초)",
+                extra={'url': blog_url, 'elapsed': round(elapsed_time, 3), 'stage': 'done', 'path': 'selenium'}
+            )
+            metrics.inc('crawl_success_total', path='selenium')
+            metrics.observe('post_seconds', elapsed_time, path='selenium')
+            
+            return {'URL': blog_url, **fields, 'FetchPath': 'selenium'}
+                
+        except Exception as e:
+            return self._failure(blog_url, e, start_time, 'selenium')
 
-    def _extract_comment_count(self, driver):
-        try:
-            comment_label = driver.find_element(By.XPATH, "//span[@class='sp ico'][contains(text(), '댓글')]")
-            comment_count_element = comment_label.find_element(By.XPATH, "./following-sibling::em")
-            comment_text = comment_count_element.text.strip()
-            return int(''.join(filter(str.isdigit, comment_text)))
-        except Exception:
-            return 0
-
-    def _extract_like_count(self, driver):
-        try:
-            like_elements = driver.find_elements(By.CSS_SELECTOR, '.like_count, .btn_like .num, .u_cnt._count')
-            max_count = 0
-            for element in like_elements:
-                try:
-                    count_text = element.text.strip()
-                    count = int(''.join(filter(str.isdigit, count_text)))
-                    max_count = max(max_count, count)
-                except ValueError:
-                    continue
-            return max_count
-        except Exception:
-            return 0
-
-    def _extract_map_count(self, driver):
-        try:
-            maps = driver.find_elements(By.CSS_SELECTOR, 'a.se-map-info, .se-module-map')
-            return len(maps)
-        except Exception:
-            return 0
+    def _wait_timeout(self, timeout=PAGE_WAIT_TIMEOUT):
+        """셀렉터 대기 시간: timeout과 남은 처리 시간 중 짧은 쪽"""
+        remaining = watchdog.remaining()
+        return timeout if remaining is None else max(0.5, min(timeout, remaining))
 
-    def _extract_image_count(self, driver):
-        try:
-            images = driver.find_elements(By.CSS_SELECTOR, 'img[id^="img_"]')
-            return len(images)
-        except Exception:
-            return 0 
\ No newline at end of file
+    def _failure(self, blog_url, error, start_time, path):
+        """실패를 분류해 기록하고 CrawlFailure로 반환"""
+        if watchdog.expired() and not isinstance(error, DeadlineExceeded):
+            # 감시자가 브라우저를 종료해 생긴 연결 오류는 처리 기한 초과로 기록
+            error = DeadlineExceeded(f"게시글 처리 시간 {self.post_deadline:.0f}초를 넘었습니다. ({type(error).__name__})")
+        elapsed_time = time.time() - start_time
+        kind = classify_error(error)
+        # 삭제/비공개 게시글은 정상적인 결과이므로 오류가 아니라 경고로 기록
+        log = crawler_logger.warning if isinstance(error, PostUnavailable) else crawler_logger.error
+        log(
+            f"크롤링 실패: {blog_url} (소요시간: {elapsed_time:.2f}초) - 오류: {str(error)}",
+            extra={'url': blog_url, 'elapsed': round(elapsed_time, 3), 'stage': 'failed', 'path': path, 'error': kind}
+        )
+        metrics.inc('crawl_failure_total', error=type(error).__name__, kind=kind)
+        return CrawlFailure(blog_url, kind, f"{type(error).__name__}: {str(error)}")
@@ -0,0 +1,201 @@
+import os
+import sqlite3
+import threading
+from src.logger import program_logger
+from src.urls import post_key
+from src.metrics import metrics
+
+SIMHASH_BITS = 64
+# 문자 n-gram 단위 (한국어는 조사/어미 변화가 많아 단어보다 문자 단위가 안정적)
+SHINGLE_SIZE = 4
+# SimHash 해밍 거리가 이 값 이하면 같은 글의 변형으로 판단
+DEFAULT_MAX_DISTANCE = 3
+# 짧은 본문은 템플릿 문구만으로도 비슷해지므로 비교하지 않음
+MIN_CONTENT_LENGTH = 200
+# 밴드 하나에서 비교하는 최대 후보 수 (같은 템플릿이 수만 건이어도 조회 시간이 일정하도록)
+MAX_CANDIDATES = 64
+
+# 중복으로 확인된 게시글에서도 채우는 필드 (나머지는 추출을 생략할 수 있음)
+DUPLICATE_KEEP_FIELDS = ('Content', 'PublishDate')
+
+_SIGN_BIT = 1 << (SIMHASH_BITS - 1)
+
+def _to_signed(value):
+    # SQLite INTEGER는 부호 있는 64비트
+    return value - (1 << SIMHASH_BITS) if value & _SIGN_BIT else value
+
+def simhash(text, shingle_size=SHINGLE_SIZE):
+    """공백을 제거한 본문의 문자 n-gram으로 64비트 SimHash 계산 (n-gram이 없으면 None)"""
+    import numpy as np
+
+    normalized = ''.join((text or '').split())
+    count = len(normalized) - shingle_size + 1
+    if count <= 0:
+        return None
+    codes = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    # n-gram 다항식 해시를 벡터 연산으로 계산하고(2^64에서 순환) splitmix64로 비트를 고르게 섞음
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(shingle_size):
+        hashes = hashes * np.uint64(1000003) + codes[offset:offset + count]
+    hashes ^= hashes >> np.uint64(30)
+    hashes *= np.uint64(0xbf58476d1ce4e5b9)
+    hashes ^= hashes >> np.uint64(27)
+    hashes *= np.uint64(0x94d049bb133111eb)
+    hashes ^= hashes >> np.uint64(31)
+    hashes = np.unique(hashes)
+
+    bits = (hashes[:, None] >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+    votes = bits.sum(axis=0) * 2 > len(hashes)
+    return sum(1 << bit for bit in np.flatnonzero(votes).tolist())
+
+def hamming_distance(a, b):
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count('1')
+
+class NearDuplicateIndex:
+    """본문 SimHash를 밴드로 나눠 SQLite에 저장하는 영속 LSH 인덱스
+
+    해밍 거리 max_distance 이하인 두 값은 max_distance + 1개 밴드 중 적어도 하나가 같으므로,
+    밴드가 같은 게시글만 후보로 조회해 비교. 인덱스는 디스크에 있으므로 게시글 수와 관계없이 메모리 사용이 일정함
+    """
+
+    def __init__(self, path='cache/dedup_index.sqlite3', max_distance=DEFAULT_MAX_DISTANCE, min_length=MIN_CONTENT_LENGTH):
+        self.path = path
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.bands = max_distance + 1
+        self.band_bits = SIMHASH_BITS // self.bands
+
+        index_dir = os.path.dirname(path)
+        if index_dir and not os.path.exists(index_dir):
+            os.makedirs(index_dir)
+
+        self._reset()
+        with self._lock:
+            self._connect()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._conn = None
+
+    def __getstate__(self):
+        # 워커는 같은 파일을 자기 연결로 조회
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_conn'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            self._reset()
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS dedup_posts (
+                    post_key TEXT PRIMARY KEY,
+                    simhash INTEGER,
+                    cluster_id TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS dedup_bands (
+                    band INTEGER NOT NULL,
+                    value INTEGER NOT NULL,
+                    post_key TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_dedup_bands ON dedup_bands (band, value)")
+            self._conn.commit()
+        return self._conn
+
+    def _band_values(self, value):
+        mask = (1 << self.band_bits) - 1
+        return [(band, (value >> (band * self.band_bits)) & mask) for band in range(self.bands)]
+
+    def _signature(self, content):
+        if not content or len(content) < self.min_length:
+            return None
+        return simhash(content)
+
+    def _match(self, conn, value, exclude_key=None):
+        """밴드가 같은 후보 중 해밍 거리 기준 이내인 (cluster_id, post_key), 없으면 None"""
+        for band, band_value in self._band_values(value):
+            candidates = conn.execute("""
+                SELECT p.post_key, p.simhash, p.cluster_id
+                FROM dedup_bands b JOIN dedup_posts p ON b.post_key = p.post_key
+                WHERE b.band=? AND b.value=?
+                LIMIT ?
+            """, (band, band_value, MAX_CANDIDATES)).fetchall()
+            for key, candidate, cluster_id in candidates:
+                if key != exclude_key and hamming_distance(value, candidate) <= self.max_distance:
+                    return cluster_id, key
+        return None
+
+    def find(self, content, exclude_key=None):
+        """이미 색인된 게시글 중 본문이 거의 같은 것의 (cluster_id, post_key), 없으면 None (조회만 함)
+
+        exclude_key는 조회하는 게시글 자신의 post_key로, 자기 자신과는 비교하지 않음.
+        이미 색인된 게시글이면 tag()와 같이 처음 배정된 클러스터 기준으로 판단
+        """
+        with self._lock:
+            conn = self._connect()
+            if exclude_key is not None:
+                row = conn.execute("SELECT cluster_id FROM dedup_posts WHERE post_key=?", (exclude_key,)).fetchone()
+                if row is not None:
+                    return None if row[0] == exclude_key else (row[0], row[0])
+            value = self._signature(content)
+            if value is None:
+                return None
+            return self._match(conn, value, exclude_key=exclude_key)
+
+    def assign(self, blog_url, content):
+        """게시글을 색인하고 (cluster_id, 거의 같은 기존 게시글의 post_key 또는 None) 반환"""
+        key = post_key(blog_url)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT cluster_id FROM dedup_posts WHERE post_key=?", (key,)).fetchone()
+            if row is not None:
+                # 다시 수집된 게시글은 처음 배정된 클러스터를 유지
+                return row[0], None if row[0] == key else row[0]
+            value = self._signature(content)
+            match = self._match(conn, value, exclude_key=key) if value is not None else None
+            cluster_id, duplicate_of = match if match is not None else (key, None)
+            conn.execute(
+                "INSERT INTO dedup_posts VALUES (?, ?, ?)",
+                (key, _to_signed(value) if value is not None else None, cluster_id)
+            )
+            if value is not None:
+                conn.executemany(
+                    "INSERT INTO dedup_bands VALUES (?, ?, ?)",
+                    [(band, band_value, key) for band, band_value in self._band_values(value)]
+                )
+            conn.commit()
+        return cluster_id, duplicate_of
+
+    def tag(self, result):
+        """결과에 ClusterId와 DuplicateOf(거의 같은 기존 게시글, 없으면 None)를 추가"""
+        cluster_id, duplicate_of = self.assign(result['URL'], result.get('Content'))
+        result['ClusterId'] = cluster_id
+        result['DuplicateOf'] = duplicate_of
+        if duplicate_of is not None:
+            metrics.inc('near_duplicate_total')
+        return result
+
+    def log_stats(self):
+        with self._lock:
+            posts, clusters = self._connect().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT cluster_id) FROM dedup_posts"
+            ).fetchone()
+        program_logger.info(f"중복 인덱스: 게시글 {posts}건, 클러스터 {clusters}개")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,128 @@
+import threading
+import time
+from contextlib import contextmanager
+from src.logger import crawler_logger
+from src.watchdog import watchdog
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.time()
+        self.pages = 0
+        self.broken = False
+
+class DriverPool:
+    def __init__(self, crawler, max_size=1, max_pages=50, max_lifetime=600):
+        self.crawler = crawler
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_lifetime = max_lifetime
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def lease(self):
+        """드라이버를 대여하고 사용이 끝나면 풀에 반납"""
+        entry = self._acquire()
+        try:
+            yield entry.driver
+        finally:
+            entry.pages += 1
+            # 처리 기한을 넘겨 감시자가 종료한 드라이버는 재사용하지 않음
+            entry.broken = watchdog.expired()
+            self._release(entry)
+
+    def close(self):
+        """풀에 남아 있는 드라이버를 모두 종료"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._quit(entry, "풀 종료")
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("드라이버 풀이 이미 종료되었습니다.")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    entry = None
+                    break
+                self._cond.wait()
+
+        # 재사용 전 수명 및 상태 점검
+        if entry is not None:
+            # 상태 점검도 게시글 처리 기한 안에서 실행 (멈춘 chromedriver는 감시자가 종료)
+            self._watch(entry)
+            reason = self._retire_reason(entry)
+            if reason is None and not self._is_healthy(entry.driver):
+                reason = "상태 점검 실패"
+            if reason is not None:
+                self._quit(entry, reason)
+                entry = None
+
+        if entry is None:
+            try:
+                entry = _PooledDriver(self.crawler.setup_driver())
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            self._watch(entry)
+        return entry
+
+    def _watch(self, entry):
+        """현재 게시글의 처리 기한이 지나면 이 드라이버의 chromedriver를 종료하도록 감시자에 등록"""
+        watchdog.watch(getattr(entry.driver, 'service', None))
+
+    def _release(self, entry):
+        reason = self._retire_reason(entry)
+        if reason is not None:
+            self._quit(entry, reason)
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                closed = True
+            else:
+                self._idle.append(entry)
+                closed = False
+            self._cond.notify()
+        if closed:
+            self._quit(entry, "풀 종료")
+
+    def _retire_reason(self, entry):
+        if entry.broken:
+            return "처리 기한 초과로 종료됨"
+        if self.max_pages and entry.pages >= self.max_pages:
+            return f"최대 페이지 수 도달 ({entry.pages}건)"
+        if self.max_lifetime and time.time() - entry.created_at >= self.max_lifetime:
+            return "최대 사용 시간 초과"
+        return None
+
+    def _is_healthy(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, entry, reason):
+        crawler_logger.info(f"드라이버 교체: {reason}")
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,352 @@
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from src.logger import program_logger
+from src.extraction import FieldSpec, field_spec, split_spec
+from src.fast_path import HttpBlogFetcher
+from src.urls import post_key, MOBILE_BLOG_BASE_URL, LIKE_API_URL
+from src.metrics import metrics
+from src.failures import CrawlFailure, FAILURE_GONE, FAILURE_TRANSIENT, PostUnavailable, classify_error, is_gone_page, backoff_delay
+from src.executor import create_backend
+
+# 다시 가져오는 반응 지표
+ENGAGEMENT_FIELDS = ('LikeCount', 'CommentCount')
+
+# 시계열 결과 파일의 열
+SAMPLE_COLUMNS = [
+    ('URL', 'str'),
+    ('PolledAt', 'str'),
+    ('AgeHours', 'float'),
+    ('LikeCount', 'int'),
+    ('CommentCount', 'int'),
+    ('LikeDelta', 'int'),
+    ('CommentDelta', 'int')
+]
+
+# 본문 영역은 텍스트 없이 개수만 세어 삭제/비공개 페이지 확인에 사용
+_CONTENT_BLOCKS = 'ContentBlocks'
+
+STATUS_ACTIVE = 'active'
+STATUS_GONE = 'gone'
+STATUS_RETIRED = 'retired'
+
+# 재수집 주기 하한/상한
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 7 * 24 * 60 * 60
+# 재수집 주기는 게시글 나이의 이 비율을 넘지 않음 (갓 올라온 글일수록 자주 확인)
+AGE_RATIO = 0.25
+# 지표가 그대로면 주기를 이 배수로 늘림 (바뀌었으면 절반으로 줄임)
+BACKOFF = 2.0
+# 이보다 오래된 게시글은 더 이상 확인하지 않음
+MAX_AGE = 180 * 24 * 60 * 60
+
+def _timestamp(value):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(value))
+
+def _to_int(value):
+    # CSV 결과 파일의 값은 문자열
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _published_at(api_post_date):
+    """검색 API의 postdate(YYYYMMDD)를 타임스탬프로 변환, 없거나 형식이 다르면 None"""
+    try:
+        return time.mktime(time.strptime(str(api_post_date), '%Y%m%d'))
+    except (TypeError, ValueError):
+        return None
+
+def next_interval(interval, age, changed, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, age_ratio=AGE_RATIO, backoff=BACKOFF):
+    """지표가 바뀌었으면 주기를 절반으로, 그대로면 backoff배로 늘리되 게시글 나이의 age_ratio배와 max_interval을 넘지 않음"""
+    interval = interval / 2 if changed else interval * backoff
+    ceiling = max(min_interval, min(max_interval, age * age_ratio))
+    return max(min_interval, min(interval, ceiling))
+
+class EngagementFetcher:
+    """공감/댓글 수만 가져오는 가장 가벼운 수집 경로 (HTTP + lxml, 본문 텍스트와 나머지 필드는 추출하지 않음)
+
+    공감 수는 스크립트가 채우므로 정적 HTML에 없으면 공감 API에서 가져옴
+    """
+
+    def __init__(self, rate_limiter=None, base_url=MOBILE_BLOG_BASE_URL, transport=None, like_api_url=LIKE_API_URL):
+        fields, _ = split_spec(ENGAGEMENT_FIELDS)
+        spec = fields + [FieldSpec(_CONTENT_BLOCKS, field_spec('Content').selectors, 'count')]
+        self.http_fetcher = HttpBlogFetcher(
+            spec=spec, required_fields=(), transport=transport, base_url=base_url, rate_limiter=rate_limiter,
+            like_api_url=like_api_url
+        )
+
+    def get_engagement(self, blog_url):
+        """{'LikeCount', 'CommentCount'}, 실패 시 종류가 분류된 CrawlFailure
+
+        정적 HTML과 공감 API 어디에서도 숫자를 찾지 못한 카운터는 None (0이 아니라 알 수 없음)
+        """
+        try:
+            page_source = self.http_fetcher.fetch(blog_url)
+            if page_source is None:
+                return CrawlFailure(blog_url, FAILURE_TRANSIENT, "HTTP 응답 오류")
+            with metrics.span('extract', path='engagement'):
+                fields = self.http_fetcher.compiled.extract(page_source)
+            if not fields.pop(_CONTENT_BLOCKS) and is_gone_page(page_source):
+                raise PostUnavailable("삭제되었거나 비공개인 게시글입니다.")
+            if fields['LikeCount'] is None:
+                fields['LikeCount'] = self.http_fetcher.fetch_like_count(blog_url)
+            return fields
+        except Exception as e:
+            return CrawlFailure(blog_url, classify_error(e), f"{type(e).__name__}: {str(e)}")
+
+class EngagementTracker:
+    """게시글별 마지막 지표와 다음 재수집 시각을 보관하는 SQLite 스케줄러
+
+    지표가 바뀌는 동안(또는 갓 올라온 동안)은 자주, 그대로면 점점 드물게 다시 확인하고
+    MAX_AGE가 지난 게시글은 은퇴 처리. 삭제/비공개로 확인된 게시글은 더 확인하지 않음
+    """
+
+    def __init__(self, path='cache/engagement.sqlite3', min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 age_ratio=AGE_RATIO, backoff=BACKOFF, max_age=MAX_AGE):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.age_ratio = age_ratio
+        self.backoff = backoff
+        self.max_age = max_age
+
+        tracker_dir = os.path.dirname(path)
+        if tracker_dir and not os.path.exists(tracker_dir):
+            os.makedirs(tracker_dir)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS engagement (
+                post_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                published_at REAL NOT NULL,
+                status TEXT NOT NULL,
+                like_count INTEGER,
+                comment_count INTEGER,
+                polls INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                interval REAL NOT NULL,
+                last_polled_at REAL,
+                next_poll_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_engagement_due ON engagement (status, next_poll_at)")
+        self._conn.commit()
+
+    def _ceiling(self, age):
+        return max(self.min_interval, min(self.max_interval, age * self.age_ratio))
+
+    def add(self, blog_url, published_at=None, like_count=None, comment_count=None, now=None):
+        """추적할 게시글 추가 (이미 있으면 무시), 추가했으면 True
+
+        작성 시각을 모르면 지금을 기준으로 나이를 계산하고, 현재 지표를 알면 첫 재수집을 한 주기 뒤로 미룸
+        """
+        now = now or time.time()
+        published_at = published_at or now
+        interval = self._ceiling(now - published_at)
+        known = like_count is not None or comment_count is not None
+        with self._lock:
+            cursor = self._conn.execute("""
+                INSERT OR IGNORE INTO engagement
+                (post_key, url, published_at, status, like_count, comment_count, interval, last_polled_at, next_poll_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                post_key(blog_url), blog_url, published_at, STATUS_ACTIVE, like_count, comment_count,
+                interval, now if known else None, now + interval if known else now
+            ))
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def add_results(self, rows):
+        """수집 결과 행(URL, APIPostDate, LikeCount, CommentCount)을 추적 대상으로 추가하고 추가한 건수를 반환"""
+        added = 0
+        for row in rows:
+            if not row.get('URL'):
+                continue
+            added += self.add(
+                row['URL'], _published_at(row.get('APIPostDate')),
+                _to_int(row.get('LikeCount')), _to_int(row.get('CommentCount'))
+            )
+        program_logger.info(f"반응 지표 추적 대상 추가: {added}건")
+        return added
+
+    def add_from_index(self, crawl_index):
+        """수집 인덱스에서 수집에 성공한 게시글을 추가 (작성 시각을 모르므로 마지막 수집 시각 기준)"""
+        added = sum(self.add(url, published_at) for url, published_at in crawl_index.done_entries())
+        program_logger.info(f"반응 지표 추적 대상 추가(수집 인덱스): {added}건")
+        return added
+
+    def due(self, now=None, limit=None):
+        """재수집 시각이 된 게시글 URL 목록 (오래 기다린 순)"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT url FROM engagement WHERE status=? AND next_poll_at<=?
+                ORDER BY next_poll_at LIMIT ?
+            """, (STATUS_ACTIVE, now or time.time(), -1 if limit is None else limit)).fetchall()
+        return [row[0] for row in rows]
+
+    def next_due_at(self):
+        """가장 이른 재수집 시각, 추적 중인 게시글이 없으면 None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MIN(next_poll_at) FROM engagement WHERE status=?", (STATUS_ACTIVE,)
+            ).fetchone()[0]
+
+    def record(self, blog_url, result, now=None):
+        """재수집 결과를 반영하고 다음 재수집 시각을 정함, 성공했으면 시계열 한 행(dict)을 반환"""
+        now = now or time.time()
+        key = post_key(blog_url)
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT published_at, like_count, comment_count, polls, failures, interval
+                FROM engagement WHERE post_key=?
+            """, (key,)).fetchone()
+            if row is None:
+                return None
+            published_at, like_count, comment_count, polls, failures, interval = row
+
+            if not result:
+                if isinstance(result, CrawlFailure) and result.kind == FAILURE_GONE:
+                    self._conn.execute("UPDATE engagement SET status=? WHERE post_key=?", (STATUS_GONE, key))
+                else:
+                    # 일시적인 실패는 주기를 바꾸지 않고 지수 백오프 후 다시 시도
+                    delay = backoff_delay(failures + 1, base_delay=60, max_delay=interval)
+                    self._conn.execute(
+                        "UPDATE engagement SET failures=?, next_poll_at=? WHERE post_key=?",
+                        (failures + 1, now + delay, key)
+                    )
+                self._conn.commit()
+                return None
+
+            age = now - published_at
+            new_likes, new_comments = result.get('LikeCount'), result.get('CommentCount')
+            first = polls == 0 and like_count is None and comment_count is None
+            # 페이지에서 숫자를 찾지 못한 카운터(스크립트로 채워지는 공감 수 등)는 알 수 없음:
+            # 0으로 보지 않고 이전 값을 유지하며, 변화 여부도 값을 읽은 카운터로만 판단
+            observed = [(new, old) for new, old in ((new_likes, like_count), (new_comments, comment_count)) if new is not None]
+            if not observed:
+                metrics.inc('engagement_unknown_total')
+            if first:
+                changed = bool(observed)
+            else:
+                changed = any(old is not None and new != old for new, old in observed)
+            interval = next_interval(
+                interval, age, changed, self.min_interval, self.max_interval, self.age_ratio, self.backoff
+            )
+            status = STATUS_RETIRED if age + interval > self.max_age else STATUS_ACTIVE
+            self._conn.execute("""
+                UPDATE engagement
+                SET status=?, like_count=?, comment_count=?, polls=polls + 1, failures=0,
+                    interval=?, last_polled_at=?, next_poll_at=?
+                WHERE post_key=?
+            """, (
+                status, like_count if new_likes is None else new_likes, comment_count if new_comments is None else new_comments,
+                interval, now, now + interval, key
+            ))
+            self._conn.commit()
+
+        metrics.inc('engagement_poll_total', changed=changed)
+        return {
+            'URL': blog_url,
+            'PolledAt': _timestamp(now),
+            'AgeHours': round(age / 3600, 2),
+            'LikeCount': new_likes,
+            'CommentCount': new_comments,
+            'LikeDelta': None if first or like_count is None or new_likes is None else new_likes - like_count,
+            'CommentDelta': None if first or comment_count is None or new_comments is None else new_comments - comment_count
+        }
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM engagement GROUP BY status").fetchall()
+        counts = {STATUS_ACTIVE: 0, STATUS_GONE: 0, STATUS_RETIRED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def refresh_engagement(tracker, fetcher, sink, backend=None, limit=None):
+    """재수집 시각이 된 게시글의 공감/댓글 수를 가져와 시계열 sink에 기록하고 기록한 건수를 반환"""
+    urls = tracker.due(limit=limit)
+    if not urls:
+        return 0
+    # HTTP 요청만 하므로 브라우저 메모리 예산과 무관하게 스레드로 실행
+    backend = backend or create_backend('thread', workers=8)
+    start_time = time.time()
+    written = 0
+    for blog_url, result in backend.map_unordered(lambda url: (url, fetcher.get_engagement(url)), urls):
+        backend.record(bool(result))
+        sample = tracker.record(blog_url, result)
+        if sample is None:
+            continue
+        with metrics.span('write'):
+            sink.write(sample)
+        written += 1
+    program_logger.info(f"반응 지표 재수집: {len(urls)}건 중 {written}건 기록 (소요시간: {time.time() - start_time:.2f}초)")
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='이전에 수집한 게시글의 공감/댓글 수만 주기적으로 다시 수집')
+    parser.add_argument('--db', default='cache/engagement.sqlite3', help='추적 상태 저장 위치')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed = subparsers.add_parser('seed', help='추적할 게시글 추가')
+    seed.add_argument('--results', nargs='*', default=[], help='수집 결과 파일 (jsonl, csv, parquet)')
+    seed.add_argument('--index', help='수집 인덱스 (예: cache/crawl_index.sqlite3)')
+
+    run = subparsers.add_parser('run', help='재수집 시각이 된 게시글의 지표를 시계열 파일에 추가')
+    run.add_argument('output', help='시계열 결과 파일 (확장자로 형식 결정: jsonl, csv, parquet)')
+    run.add_argument('--workers', type=int, default=8, help='동시 요청 수')
+    run.add_argument('--limit', type=int, help='한 번에 재수집하는 최대 게시글 수')
+    run.add_argument('--loop', action='store_true', help='끝나지 않고 다음 재수집 시각마다 반복')
+    args = parser.parse_args(argv)
+
+    tracker = EngagementTracker(args.db)
+    try:
+        if args.command == 'seed':
+            from src.sinks import read_rows
+
+            if not args.results and not args.index:
+                parser.error('--results 또는 --index를 지정하세요.')
+            added = sum(tracker.add_results(read_rows(path)) for path in args.results)
+            if args.index:
+                from src.crawl_index import CrawlIndex
+
+                crawl_index = CrawlIndex(args.index)
+                added += tracker.add_from_index(crawl_index)
+                crawl_index.close()
+            print(f"추적 대상에 {added}건을 추가했습니다: {tracker.stats()}")
+            return 0
+
+        from src.rate_limiter import AdaptiveRateLimiter
+        from src.sinks import open_sink
+
+        fetcher = EngagementFetcher(rate_limiter=AdaptiveRateLimiter())
+        backend = create_backend('thread', workers=args.workers)
+        written = 0
+        # 시계열이므로 기존 파일에 이어서 기록
+        with open_sink(args.output, columns=SAMPLE_COLUMNS, resume=True) as sink:
+            while True:
+                written += refresh_engagement(tracker, fetcher, sink, backend, limit=args.limit)
+                next_due = tracker.next_due_at()
+                if not args.loop or next_due is None:
+                    break
+                sink.flush()
+                time.sleep(max(0, next_due - time.time()))
+        metrics.log_summary(program_logger)
+        print(f"재수집 완료: {written}건 → {args.output} ({tracker.stats()})")
+        return 0
+    finally:
+        tracker.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import asyncio
+import contextlib
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import Pool
+from src.logger import program_logger
+
+_EXHAUSTED = object()
+
+# 헤드리스 Chrome 한 개가 차지하는 대략적인 메모리 (MB)
+DEFAULT_BROWSER_MEMORY_MB = 400
+
+def _total_memory_mb():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return 4096
+
+def plan_concurrency(memory_budget_mb=None, browser_memory_mb=DEFAULT_BROWSER_MEMORY_MB, target_latency=None, expected_latency=4.0, max_workers=32):
+    """브라우저당 메모리 예산과 목표 지연시간으로 워커 수 결정
+
+    - 메모리 상한: memory_budget_mb // browser_memory_mb (기본 예산은 전체 메모리의 절반)
+    - 지연시간 기준: 게시글 하나에 expected_latency초가 걸릴 때 target_latency초마다
+      한 건씩 완료되려면 ceil(expected_latency / target_latency)개의 워커가 필요
+    """
+    if memory_budget_mb is None:
+        memory_budget_mb = _total_memory_mb() // 2
+    memory_limit = max(1, memory_budget_mb // browser_memory_mb)
+
+    workers = memory_limit
+    if target_latency:
+        workers = min(workers, max(1, math.ceil(expected_latency / target_latency)))
+    return max(1, min(workers, max_workers))
+
+class Autoscaler:
+    """관측된 처리량과 실패율에 따라 동시 실행 수를 조정"""
+
+    def __init__(self, min_workers=1, max_workers=8, interval=30, max_failure_rate=0.3):
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.interval = interval
+        self.max_failure_rate = max_failure_rate
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._successes = 0
+        self._failures = 0
+        self._last_throughput = None
+        self._last_change = 0
+
+    def record(self, success):
+        with self._lock:
+            if success:
+                self._successes += 1
+            else:
+                self._failures += 1
+
+    def next_limit(self, limit):
+        """interval마다 새 동시 실행 수를 계산 (아직 시점이 아니면 limit 그대로)"""
+        with self._lock:
+            elapsed = time.time() - self._window_start
+            total = self._successes + self._failures
+            if elapsed < self.interval or total == 0:
+                return limit
+            throughput = self._successes / elapsed
+            failure_rate = self._failures / total
+            self._window_start = time.time()
+            self._successes = self._failures = 0
+
+            if failure_rate > self.max_failure_rate:
+                change = -1
+            elif self._last_throughput is None or throughput >= self._last_throughput:
+                # 처리량이 유지/증가하면 같은 방향으로 계속 (처음에는 증가)
+                change = self._last_change or 1
+            else:
+                # 직전 조정이 처리량을 떨어뜨렸으면 되돌림
+                change = -(self._last_change or 1)
+            self._last_throughput = throughput
+
+            new_limit = max(self.min_workers, min(self.max_workers, limit + change))
+            self._last_change = new_limit - limit
+        if new_limit != limit:
+            program_logger.info(
+                f"워커 수 조정: {limit} → {new_limit} (처리량 {throughput:.2f}건/초, 실패율 {failure_rate * 100:.1f}%)"
+            )
+        return new_limit
+
+class ProcessBackend:
+    uses_processes = True
+
+    def __init__(self, workers):
+        self.max_workers = workers
+        # persistent() 블록 안에서는 map_unordered 호출이 같은 Pool을 재사용
+        self._keep_alive = False
+        self._pool = None
+        self._pool_setup = None
+
+    @contextlib.contextmanager
+    def persistent(self):
+        """블록 안의 map_unordered 호출이 워커 프로세스(와 initializer로 만든 브라우저)를 다시 띄우지 않고 재사용"""
+        self._keep_alive = True
+        try:
+            yield self
+        finally:
+            self._keep_alive = False
+            self._close_pool()
+
+    def _close_pool(self, terminate=False):
+        pool, self._pool, self._pool_setup = self._pool, None, None
+        if pool is None:
+            return
+        if terminate:
+            pool.terminate()
+        else:
+            # 워커가 initializer에서 만든 자원을 정리하고 종료할 수 있도록 정상 종료
+            pool.close()
+        pool.join()
+
+    def map_unordered(self, func, items, initializer=None, initargs=()):
+        setup = (initializer, initargs)
+        if self._pool is not None and self._pool_setup != setup:
+            self._close_pool()
+        if self._pool is None:
+            program_logger.info(f"{self.max_workers}개의 프로세스로 크롤링을 시작합니다...")
+            self._pool = Pool(self.max_workers, initializer=initializer, initargs=initargs)
+            self._pool_setup = setup
+        finished = False
+        try:
+            yield from self._pool.imap_unordered(func, items)
+            finished = True
+        finally:
+            if not finished:
+                self._close_pool(terminate=True)
+            elif not self._keep_alive:
+                self._close_pool()
+
+    def record(self, success):
+        pass
+
+class ThreadBackend:
+    uses_processes = False
+
+    def __init__(self, workers, autoscaler=None):
+        self.max_workers = autoscaler.max_workers if autoscaler else workers
+        self.limit = workers
+        self.autoscaler = autoscaler
+
+    def map_unordered(self, func, items, initializer=None, initargs=()):
+        program_logger.info(f"{self.limit}개의 스레드로 크롤링을 시작합니다...")
+        if initializer is not None:
+            initializer(*initargs)
+        iterator = iter(items)
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as executor:
+            exhausted = False
+            while True:
+                # 입력은 필요한 만큼만 꺼내므로 제너레이터 입력도 지연 평가됨
+                while not exhausted and len(pending) < self.limit:
+                    try:
+                        pending.add(executor.submit(func, next(iterator)))
+                    except StopIteration:
+                        exhausted = True
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                if self.autoscaler is not None:
+                    self.limit = self.autoscaler.next_limit(self.limit)
+
+    def record(self, success):
+        if self.autoscaler is not None:
+            self.autoscaler.record(success)
+
+class AsyncBackend:
+    """asyncio 이벤트 루프에서 작업을 실행 (코루틴 함수는 직접, 일반 함수는 스레드로 위임)"""
+
+    uses_processes = False
+
+    def __init__(self, workers, autoscaler=None):
+        self.max_workers = autoscaler.max_workers if autoscaler else workers
+        self.limit = workers
+        self.autoscaler = autoscaler
+
+    def map_unordered(self, func, items, initializer=None, initargs=()):
+        program_logger.info(f"{self.limit}개의 asyncio 작업으로 크롤링을 시작합니다...")
+        if initializer is not None:
+            initializer(*initargs)
+        results = queue.Queue(maxsize=self.max_workers)
+        done_marker = object()
+        stop = threading.Event()
+
+        def run_loop():
+            try:
+                asyncio.run(self._run(func, items, results, stop))
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(done_marker)
+
+        thread = threading.Thread(target=run_loop, name='crawl-asyncio', daemon=True)
+        thread.start()
+        try:
+            while True:
+                result = results.get()
+                if result is done_marker:
+                    break
+                if isinstance(result, BaseException):
+                    raise result
+                yield result
+        finally:
+            # 소비자가 중간에 멈추거나 예외로 빠져나가도 루프가 새 작업을 시작하지 않고,
+            # 결과 큐에서 막히지 않도록 비우면서 처리 중인 작업이 끝나기를 기다림
+            stop.set()
+            while thread.is_alive():
+                try:
+                    results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            thread.join()
+
+    async def _run(self, func, items, results, stop):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl')
+        # 입력 제너레이터(검색 등)는 블로킹일 수 있으므로 별도 스레드에서 꺼냄
+        input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='crawl-input')
+        is_coroutine = asyncio.iscoroutinefunction(func)
+        iterator = iter(items)
+        pending = set()
+        exhausted = False
+        try:
+            while not stop.is_set():
+                while not exhausted and not stop.is_set() and len(pending) < self.limit:
+                    item = await loop.run_in_executor(input_executor, next, iterator, _EXHAUSTED)
+                    if item is _EXHAUSTED:
+                        exhausted = True
+                        break
+                    task = func(item) if is_coroutine else loop.run_in_executor(executor, func, item)
+                    pending.add(asyncio.ensure_future(task))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.exception() or task.result()
+                    # 소비자가 느리면 결과 큐에서 대기 (backpressure)
+                    await loop.run_in_executor(input_executor, results.put, result)
+                if self.autoscaler is not None:
+                    self.limit = self.autoscaler.next_limit(self.limit)
+        finally:
+            for task in pending:
+                task.cancel()
+            executor.shutdown(wait=True)
+            input_executor.shutdown(wait=True)
+
+    def record(self, success):
+        if self.autoscaler is not None:
+            self.autoscaler.record(success)
+
+BACKENDS = {
+    'process': ProcessBackend,
+    'thread': ThreadBackend,
+    'async': AsyncBackend
+}
+
+def create_backend(kind='process', workers=None, autoscale=False, **plan_options):
+    """실행 백엔드 생성 (workers를 생략하면 plan_concurrency로 결정)"""
+    if kind not in BACKENDS:
+        raise ValueError(f"지원하지 않는 실행 백엔드입니다: {kind}")
+    if workers is None:
+        workers = plan_concurrency(**plan_options)
+    if kind == 'process':
+        if autoscale:
+            program_logger.warning("process 백엔드는 워커 수 자동 조정을 지원하지 않습니다.")
+        return ProcessBackend(workers)
+    autoscaler = Autoscaler(min_workers=1, max_workers=max(workers, plan_concurrency(**plan_options))) if autoscale else None
+    return BACKENDS[kind](workers, autoscaler=autoscaler)
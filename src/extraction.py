@@ -0,0 +1,170 @@
+from src.metrics import metrics
+
+# 첫 번째 요소의 텍스트만 필요한 리듀서
+FIRST_ONLY_REDUCERS = ('text', 'int')
+
+class FieldSpec:
+    def __init__(self, name, selectors, reducer):
+        # selectors는 앞에서부터 시도하는 폴백 목록이며, 'xpath:' 접두사가 붙으면 XPath로 평가
+        self.name = name
+        self.selectors = selectors
+        self.reducer = reducer
+
+    def to_js(self):
+        return {
+            'name': self.name,
+            'selectors': self.selectors,
+            'reducer': self.reducer,
+            'first': self.reducer in FIRST_ONLY_REDUCERS
+        }
+
+def _digits(text):
+    return int(''.join(filter(str.isdigit, text)))
+
+def _reduce_text(texts, count):
+    return texts[0].strip() if texts else ""
+
+def _reduce_count(texts, count):
+    return count
+
+# 숫자 카운터는 셀렉터가 맞지 않거나 숫자가 비어 있으면(스크립트로 채워지기 전 등) 0이 아니라 알 수 없음(None)
+def _reduce_int(texts, count):
+    try:
+        return _digits(texts[0].strip())
+    except (IndexError, ValueError):
+        return None
+
+def _reduce_max_int(texts, count):
+    max_count = None
+    for text in texts:
+        try:
+            value = _digits(text.strip())
+        except ValueError:
+            continue
+        max_count = value if max_count is None else max(max_count, value)
+    return max_count
+
+def _reduce_hashtag(texts, count):
+    # 노출된 '#태그' 수 + '+N' 형태로 접힌 태그 수
+    hashtag_texts = [text.strip() for text in texts if text.strip()]
+    visible_hashtag_count = sum(1 for text in hashtag_texts if text.startswith('#'))
+    additional_count = 0
+
+    for text in hashtag_texts:
+        if text.startswith('+'):
+            try:
+                additional_count = int(text[1:])
+                break
+            except ValueError:
+                continue
+
+    return visible_hashtag_count + additional_count
+
+REDUCERS = {
+    'text': _reduce_text,
+    'count': _reduce_count,
+    'int': _reduce_int,
+    'max_int': _reduce_max_int,
+    'hashtag': _reduce_hashtag
+}
+
+BLOG_FIELDS = [
+    # 1. 본문
+    FieldSpec('Content', ['div.se-main-container', '#viewTypeSelector, .post-view, .se_component_wrap'], 'text'),
+    # 2. 작성일
+    FieldSpec('PublishDate', ['.blog_date, .se_publishDate, .date, .se_date, .date_time, .writer_info .date'], 'text'),
+    # 3. 해시태그 수
+    FieldSpec('HashtagCount', ['.tag_wrap a', '.post_tag_wrap a, .tag__tFC3j'], 'hashtag'),
+    # 4. 스티커 수
+    FieldSpec('StickerCount', ['img.se-sticker-image, img.se-sticker-imgae, .se-sticker-image'], 'count'),
+    # 5. 댓글 수
+    FieldSpec('CommentCount', ["xpath://span[@class='sp ico'][contains(text(), '댓글')]/following-sibling::em"], 'int'),
+    # 6. 공감 수
+    FieldSpec('LikeCount', ['.like_count, .btn_like .num, .u_cnt._count'], 'max_int'),
+    # 7. 지도 수
+    FieldSpec('MapCount', ['a.se-map-info, .se-module-map'], 'count'),
+    # 8. 이미지 수
+    FieldSpec('ImageCount', ['img[id^="img_"]'], 'count')
+]
+
+def field_spec(name, spec=BLOG_FIELDS):
+    """이름으로 필드 스펙 조회"""
+    return next(field for field in spec if field.name == name)
+
+def split_spec(names, spec=BLOG_FIELDS):
+    """스펙을 (names에 포함된 필드, 나머지 필드)로 나눔"""
+    return [field for field in spec if field.name in names], [field for field in spec if field.name not in names]
+
+def css_selectors(name, spec=BLOG_FIELDS):
+    """필드의 CSS 셀렉터(XPath 제외)를 하나의 셀렉터 목록으로 결합"""
+    return ', '.join(selector for selector in field_spec(name, spec).selectors if not selector.startswith('xpath:'))
+
+# 스펙 전체를 브라우저 안에서 한 번에 평가하는 스크립트
+_EXTRACT_SCRIPT = """
+var spec = arguments[0];
+var out = {};
+
+function query(selector) {
+    if (selector.indexOf('xpath:') === 0) {
+        var snapshot = document.evaluate(selector.slice(6), document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var k = 0; k < snapshot.snapshotLength; k++) {
+            nodes.push(snapshot.snapshotItem(k));
+        }
+        return nodes;
+    }
+    return Array.prototype.slice.call(document.querySelectorAll(selector));
+}
+
+for (var i = 0; i < spec.length; i++) {
+    var field = spec[i];
+    var started = performance.now();
+    var result = {hit: -1, count: 0, texts: [], ms: 0};
+    for (var j = 0; j < field.selectors.length; j++) {
+        var nodes;
+        try {
+            nodes = query(field.selectors[j]);
+        } catch (e) {
+            nodes = [];
+        }
+        if (!nodes.length) {
+            continue;
+        }
+        result.hit = j;
+        result.count = nodes.length;
+        if (field.reducer !== 'count') {
+            var targets = field.first ? nodes.slice(0, 1) : nodes;
+            for (var t = 0; t < targets.length; t++) {
+                result.texts.push(targets[t].innerText || targets[t].textContent || '');
+            }
+        }
+        break;
+    }
+    result.ms = performance.now() - started;
+    out[field.name] = result;
+}
+return out;
+"""
+
+def collect_fields(driver, spec=BLOG_FIELDS):
+    """스펙의 모든 필드에 대한 원시 결과(hit, count, texts)를 한 번의 execute_script로 수집"""
+    return driver.execute_script(_EXTRACT_SCRIPT, [field.to_js() for field in spec])
+
+def reduce_fields(raw, spec=BLOG_FIELDS):
+    """수집된 원시 결과에 필드별 리듀서를 적용하고 필드별 소요시간/폴백 셀렉터 사용을 기록"""
+    values = {}
+    for field in spec:
+        entry = raw.get(field.name) or {}
+        metrics.observe('extractor_seconds', (entry.get('ms') or 0) / 1000, field=field.name)
+        hit = entry.get('hit', -1)
+        if hit > 0:
+            metrics.inc('selector_fallback_total', field=field.name, selector=hit)
+        elif hit < 0:
+            metrics.inc('selector_miss_total', field=field.name)
+        values[field.name] = REDUCERS[field.reducer](entry.get('texts') or [], entry.get('count') or 0)
+    return values
+
+def extract_fields(driver, spec=BLOG_FIELDS):
+    """스펙에 정의된 필드를 한 번의 왕복으로 추출"""
+    return reduce_fields(collect_fields(driver, spec), spec)
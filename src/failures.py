@@ -0,0 +1,136 @@
+import heapq
+import itertools
+import random
+import time
+from src.urls import post_key
+
+# 실패 종류
+FAILURE_TRANSIENT = 'transient'        # 타임아웃, 연결 오류, 5xx
+FAILURE_BROWSER = 'browser'            # Chrome 충돌, 세션 끊김
+FAILURE_RATE_LIMITED = 'rate_limited'  # 캡차, 429
+FAILURE_GONE = 'gone'                  # 삭제/비공개 게시글
+FAILURE_UNKNOWN = 'unknown'
+
+# 다시 시도할 수 있는 실패 (삭제/비공개 게시글은 재시도하지 않고 dead-letter로 보냄)
+RETRYABLE_FAILURES = (FAILURE_TRANSIENT, FAILURE_BROWSER, FAILURE_RATE_LIMITED, FAILURE_UNKNOWN)
+
+# 게시글이 아니라 호스트 상태를 나타내는 실패 (서킷 브레이커 오류율에 반영)
+HOST_FAILURES = (FAILURE_TRANSIENT, FAILURE_BROWSER, FAILURE_RATE_LIMITED)
+
+# 삭제/비공개 게시글 안내 문구
+GONE_MARKERS = (
+    '존재하지 않는 게시물',
+    '삭제되었거나 존재하지 않는',
+    '삭제된 게시물',
+    '비공개 게시물',
+    '접근 권한이 없',
+    '이웃에게만 공개'
+)
+
+# selenium/urllib3를 import하지 않고 예외 클래스 이름으로 분류
+_TRANSIENT_ERRORS = {
+    'TimeoutException', 'TimeoutError', 'ReadTimeoutError', 'ConnectTimeoutError', 'MaxRetryError',
+    'ProtocolError', 'NewConnectionError', 'ConnectionError', 'IncompleteRead', 'DeadlineExceeded'
+}
+_BROWSER_ERRORS = {'InvalidSessionIdException', 'NoSuchWindowException', 'SessionNotCreatedException'}
+_BROWSER_MESSAGES = (
+    'chrome not reachable', 'session deleted', 'disconnected', 'tab crashed',
+    'target window already closed', 'invalid session id', 'chrome 브라우저를 시작할 수 없습니다'
+)
+
+class PostUnavailable(Exception):
+    """삭제되었거나 비공개인 게시글"""
+
+class RateLimited(Exception):
+    """캡차 페이지 또는 429 응답"""
+
+class DeadlineExceeded(Exception):
+    """게시글 하나의 처리 기한(브라우저 실행, 페이지 이동, 추출 포함)을 넘김"""
+
+class CrawlFailure:
+    """get_blog_info의 실패 결과: 거짓으로 평가되므로 기존 `if result` 검사와 그대로 호환"""
+
+    def __init__(self, url, kind, error):
+        self.url = url
+        self.kind = kind
+        self.error = error
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"CrawlFailure({self.kind}: {self.error})"
+
+    @property
+    def retryable(self):
+        return self.kind in RETRYABLE_FAILURES
+
+def classify_error(error):
+    """예외를 실패 종류로 분류"""
+    if isinstance(error, PostUnavailable):
+        return FAILURE_GONE
+    if isinstance(error, RateLimited):
+        return FAILURE_RATE_LIMITED
+    names = {cls.__name__ for cls in type(error).__mro__}
+    message = str(error).lower()
+    if names & _BROWSER_ERRORS or any(marker in message for marker in _BROWSER_MESSAGES):
+        return FAILURE_BROWSER
+    if names & _TRANSIENT_ERRORS or 'timed out' in message:
+        return FAILURE_TRANSIENT
+    return FAILURE_UNKNOWN
+
+def is_gone_page(text):
+    """페이지 텍스트에 삭제/비공개 게시글 안내 문구가 있는지 확인"""
+    return any(marker in (text or '') for marker in GONE_MARKERS)
+
+def backoff_delay(attempt, base_delay=2.0, max_delay=300.0):
+    """attempt번째 재시도 대기 시간: 지수 증가 상한 안에서 균등 분포(full jitter)"""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+class RetryQueue:
+    """실패한 아이템을 백오프 시각 순서로 보관하는 재시도 대기열 (삭제/비공개 게시글과 횟수 초과는 거부)"""
+
+    def __init__(self, max_retries=2, base_delay=2.0, max_delay=300.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._attempts = {}
+        self._heap = []
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def attempts(self, blog_url):
+        return self._attempts.get(post_key(blog_url), 0)
+
+    def schedule(self, item, failure):
+        """재시도 대기열에 넣었으면 True, 더 시도하지 않을 실패면 False"""
+        key = post_key(item['link'])
+        attempt = self._attempts.get(key, 0)
+        if not failure.retryable or attempt >= self.max_retries:
+            return False
+        self._attempts[key] = attempt + 1
+        # 속도 제한 실패는 같은 호스트를 다시 두드리지 않도록 한 단계 더 길게 대기
+        if failure.kind == FAILURE_RATE_LIMITED:
+            attempt += 1
+        due = time.time() + backoff_delay(attempt, self.base_delay, self.max_delay)
+        heapq.heappush(self._heap, (due, next(self._order), item))
+        return True
+
+    def pop_due(self, now=None):
+        """재시도 시각이 된 아이템 목록"""
+        now = now or time.time()
+        items = []
+        while self._heap and self._heap[0][0] <= now:
+            items.append(heapq.heappop(self._heap)[2])
+        return items
+
+    def wait_due(self):
+        """가장 이른 재시도 시각까지 기다린 뒤 그 시점에 재시도할 아이템 목록"""
+        if not self._heap:
+            return []
+        delay = self._heap[0][0] - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        return self.pop_due()
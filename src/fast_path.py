@@ -0,0 +1,231 @@
+import json
+import re
+import time
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from lxml.etree import XPath, LxmlError
+from src.extraction import BLOG_FIELDS, reduce_fields, FIRST_ONLY_REDUCERS
+from src.urls import parse_post_id, mobile_post_view_url, like_api_url, to_mobile_url, MOBILE_BLOG_BASE_URL, LIKE_API_URL
+from src.logger import crawler_logger
+from src.transport import HttpTransport
+from src.rate_limiter import is_captcha_url
+from src.metrics import metrics
+from src.failures import PostUnavailable, RateLimited, is_gone_page
+from src.watchdog import watchdog
+
+MOBILE_USER_AGENT = 'Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1'
+
+# HTTP 경로로 채워지지 않으면 Selenium으로 폴백하는 필드
+# (공감 수는 스크립트로 채워져 정적 HTML에 숫자가 없으므로 공감 API로 따로 조회하고, 그래도 모르면 None으로 남음)
+REQUIRED_FIELDS = ('Content', 'PublishDate')
+
+# innerText에서 앞뒤로 줄을 바꾸는 블록 요소 (p는 빈 줄 하나를 더 둠)
+BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'caption', 'dd', 'details', 'dialog', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tr', 'ul'
+))
+# 화면에 표시되지 않아 innerText에 포함되지 않는 요소
+_HIDDEN_TAGS = frozenset(('script', 'style', 'noscript', 'template', 'head'))
+_WHITESPACE = re.compile(r'\s+')
+
+def _collect_text(element, parts):
+    """텍스트 조각(공백은 하나로 축약)과 줄바꿈 수(int)를 문서 순서대로 parts에 추가"""
+    tag = element.tag
+    # 주석/처리 지시문은 건너뜀 (뒤따르는 tail은 부모가 처리)
+    if not isinstance(tag, str) or tag in _HIDDEN_TAGS:
+        return
+    if tag == 'br':
+        parts.append('\n')
+        return
+    breaks = 2 if tag == 'p' else 1 if tag in BLOCK_TAGS else 0
+    if breaks:
+        parts.append(breaks)
+    if element.text:
+        parts.append(_WHITESPACE.sub(' ', element.text))
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            parts.append(_WHITESPACE.sub(' ', child.tail))
+    if breaks:
+        parts.append(breaks)
+
+def _element_text(element):
+    """Selenium의 innerText와 같은 규칙으로 텍스트를 연결
+
+    인라인 요소는 줄을 바꾸지 않고 이어 붙이고, 블록 요소와 <br>에서만 줄을 바꿈.
+    블록 사이의 연속된 줄바꿈은 가장 큰 것 하나로 합치고 줄 앞뒤 공백은 제거
+    """
+    if not hasattr(element, 'itertext'):
+        return str(element)
+    parts = []
+    _collect_text(element, parts)
+    pieces = []
+    pending = 0
+    for part in parts:
+        if isinstance(part, int):
+            pending = max(pending, part)
+            continue
+        if pending:
+            # 블록 사이의 들여쓰기 공백은 줄바꿈에 흡수됨
+            if not part.strip():
+                continue
+            if pieces:
+                pieces.append('\n' * pending)
+            pending = 0
+        pieces.append(part)
+    lines = ''.join(pieces).split('\n')
+    return '\n'.join(' '.join(line.split()) for line in lines).strip()
+
+class CompiledSpec:
+    def __init__(self, spec=BLOG_FIELDS):
+        self.spec = spec
+        self._compiled = [
+            (field, [self._compile(selector) for selector in field.selectors])
+            for field in spec
+        ]
+
+    def _compile(self, selector):
+        if selector.startswith('xpath:'):
+            return XPath(selector[len('xpath:'):])
+        return CSSSelector(selector, translator='html')
+
+    def collect(self, tree):
+        """추출 스크립트와 동일한 형태의 원시 결과를 lxml 트리에서 수집"""
+        raw = {}
+        for field, selectors in self._compiled:
+            started = time.perf_counter()
+            result = {'hit': -1, 'count': 0, 'texts': [], 'ms': 0}
+            for index, selector in enumerate(selectors):
+                nodes = selector(tree)
+                if not nodes:
+                    continue
+                result['hit'] = index
+                result['count'] = len(nodes)
+                if field.reducer != 'count':
+                    targets = nodes[:1] if field.reducer in FIRST_ONLY_REDUCERS else nodes
+                    result['texts'] = [_element_text(node) for node in targets]
+                break
+            result['ms'] = (time.perf_counter() - started) * 1000
+            raw[field.name] = result
+        return raw
+
+    def extract(self, page_source):
+        """HTML 문자열에서 스펙의 모든 필드를 추출"""
+        tree = lxml_html.fromstring(page_source)
+        return reduce_fields(self.collect(tree), self.spec)
+
+class HttpBlogFetcher:
+    def __init__(self, spec=BLOG_FIELDS, required_fields=REQUIRED_FIELDS, transport=None, base_url=MOBILE_BLOG_BASE_URL, rate_limiter=None, archive=None,
+                 like_api_url=LIKE_API_URL):
+        self.spec = spec
+        self.rate_limiter = rate_limiter
+        self.archive = archive
+        self.required_fields = required_fields
+        self.transport = transport or HttpTransport(retries=1, pool_maxsize=4, headers={'User-Agent': MOBILE_USER_AGENT})
+        self.base_url = base_url
+        # None이면 공감 수를 따로 조회하지 않음
+        self.like_api_url = like_api_url
+        self._compiled = None
+
+    def __getstate__(self):
+        # 컴파일된 셀렉터는 프로세스마다 새로 생성
+        state = self.__dict__.copy()
+        state['_compiled'] = None
+        return state
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            self._compiled = CompiledSpec(self.spec)
+        return self._compiled
+
+    def post_view_url(self, blog_url):
+        post_id = parse_post_id(blog_url)
+        if post_id is None:
+            return to_mobile_url(blog_url)
+        return mobile_post_view_url(*post_id, base_url=self.base_url)
+
+    def fetch(self, blog_url):
+        """모바일 PostView HTML을 가져오는 함수, 실패 시 None (삭제 게시글/속도 제한은 예외)"""
+        url = self.post_view_url(blog_url)
+        if self.rate_limiter is not None:
+            # 속도 제한 대기는 게시글 처리 기한에 넣지 않음
+            with watchdog.paused():
+                self.rate_limiter.acquire(url)
+        request_start = time.time()
+        with metrics.span('http_fetch'):
+            response = self.transport.get(url)
+        captcha = is_captcha_url(response.url)
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(url, status=response.status, latency=time.time() - request_start, captcha=captcha)
+        if captcha or response.status == 429:
+            raise RateLimited(f"캡차 페이지로 이동했습니다: {response.url}" if captcha else "상태코드 429")
+        if response.status in (404, 410):
+            raise PostUnavailable(f"상태코드 {response.status}")
+        if response.status != 200:
+            crawler_logger.warning(f"HTTP 수집 실패: {blog_url} (상태코드: {response.status})")
+            return None
+        return response.data.decode('utf-8', errors='replace')
+
+    def fetch_like_count(self, blog_url):
+        """공감 API에서 공감 수(반응 종류별 수의 합)를 가져오는 함수, 확인할 수 없으면 None"""
+        post_id = parse_post_id(blog_url)
+        if post_id is None or not self.like_api_url:
+            return None
+        url = like_api_url(*post_id, base_url=self.like_api_url)
+        if self.rate_limiter is not None:
+            with watchdog.paused():
+                self.rate_limiter.acquire(url)
+        try:
+            request_start = time.time()
+            with metrics.span('http_like'):
+                response = self.transport.get(url)
+            if self.rate_limiter is not None:
+                self.rate_limiter.feedback(url, status=response.status, latency=time.time() - request_start)
+            if response.status != 200:
+                crawler_logger.warning(f"공감 수 조회 실패: {blog_url} (상태코드: {response.status})")
+                return None
+            contents_id = f"{post_id[0]}_{post_id[1]}"
+            for contents in json.loads(response.data.decode('utf-8')).get('contents') or []:
+                if contents.get('contentsId') == contents_id:
+                    return sum(int(reaction.get('count') or 0) for reaction in contents.get('reactions') or [])
+        except Exception as e:
+            crawler_logger.warning(f"공감 수 조회 실패: {blog_url} - 오류: {str(e)}")
+        return None
+
+    def get_blog_info(self, blog_url):
+        """HTTP + lxml로 필드를 추출, 필수 필드가 비어 있으면 None
+
+        삭제/비공개 게시글과 속도 제한은 Selenium으로 다시 시도해도 소용없으므로 예외를 그대로 전달
+        """
+        try:
+            page_source = self.fetch(blog_url)
+        except (PostUnavailable, RateLimited):
+            raise
+        except Exception as e:
+            crawler_logger.warning(f"HTTP 수집 실패: {blog_url} - 오류: {str(e)}")
+            return None
+        if page_source is None:
+            return None
+        if self.archive is not None:
+            # 필수 필드가 비어 있어도 원본은 보관해 두고 나중에 재추출할 수 있도록 함
+            with metrics.span('archive'):
+                self.archive.put(blog_url, page_source, 'http')
+
+        try:
+            with metrics.span('extract', path='http'):
+                fields = self.compiled.extract(page_source)
+        except (LxmlError, ValueError) as e:
+            # 빈 본문이나 HTML이 아닌 200 응답은 Selenium으로 다시 시도
+            crawler_logger.warning(f"HTTP 응답을 HTML로 해석하지 못했습니다: {blog_url} - 오류: {str(e)}")
+            return None
+        if not all(fields.get(name) for name in self.required_fields):
+            if is_gone_page(page_source):
+                raise PostUnavailable("삭제되었거나 비공개인 게시글입니다.")
+            return None
+        if 'LikeCount' in fields and fields['LikeCount'] is None:
+            fields['LikeCount'] = self.fetch_like_count(blog_url)
+            if fields['LikeCount'] is None:
+                metrics.inc('http_like_unknown_total')
+        return fields
@@ -0,0 +1,196 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from src.logger import program_logger
+from src.urls import post_key
+
+STATUS_PENDING = 'pending'
+STATUS_LEASED = 'leased'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+class Lease:
+    """워커가 임대한 작업 한 건 (token이 일치해야 완료/실패 처리가 받아들여짐)"""
+
+    def __init__(self, token, key, item, expires_at, attempts=1):
+        self.token = token
+        self.key = key
+        self.item = item
+        self.expires_at = expires_at
+        self.attempts = attempts
+
+class Frontier:
+    """여러 노드/프로세스가 함께 작업을 가져가는 공유 작업 목록의 기본 클래스
+
+    - lease(): 대기 중이거나 임대 기한이 지난 작업을 lease_timeout 동안 임대
+    - complete(): 임대 token이 그대로일 때만 완료 처리 (한 작업은 최대 한 번만 완료)
+    - fail(): 재시도 횟수가 남았으면 retry_delay 뒤 다시 대기 상태로, 아니면(또는 retryable=False면) 실패 처리
+    """
+
+    def add(self, blog_items, priority=0):
+        raise NotImplementedError
+
+    def lease(self, worker_id, count=1):
+        raise NotImplementedError
+
+    def complete(self, lease):
+        raise NotImplementedError
+
+    def fail(self, lease, retry_delay=0, retryable=True):
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SqliteFrontier(Frontier):
+    def __init__(self, path='cache/frontier.sqlite3', lease_timeout=300, max_attempts=3):
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+        frontier_dir = os.path.dirname(path)
+        if frontier_dir and not os.path.exists(frontier_dir):
+            os.makedirs(frontier_dir)
+
+        self._lock = threading.Lock()
+        # 여러 프로세스가 같은 파일을 쓰므로 WAL 모드, 트랜잭션은 직접 관리
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                post_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                item TEXT NOT NULL,
+                priority REAL NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_token TEXT,
+                lease_expires REAL,
+                added_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_status ON frontier (status, priority, added_at)")
+
+    def add(self, blog_items, priority=0):
+        """검색 아이템을 대기 상태로 추가 (이미 있는 게시글은 무시), 새로 추가된 건수를 반환
+
+        아이템에 'priority'가 있으면(QueryPlanner) 인자 대신 그 값을 사용
+        """
+        now = time.time()
+        rows = [
+            (
+                post_key(item['link']), item['link'], json.dumps(item, ensure_ascii=False),
+                item.get('priority', priority), STATUS_PENDING, now, now, now
+            )
+            for item in blog_items
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("""
+                    INSERT OR IGNORE INTO frontier (post_key, url, item, priority, status, available_at, added_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            added = self._conn.total_changes - before
+        program_logger.info(f"프론티어 추가: {len(rows)}건 중 {added}건 신규")
+        return added
+
+    def lease(self, worker_id, count=1):
+        """처리할 작업을 최대 count건 임대 (기한이 지난 임대는 회수해 다시 배정)"""
+        now = time.time()
+        expires_at = now + self.lease_timeout
+        leases = []
+        with self._lock:
+            # 다른 노드와 같은 작업을 동시에 가져가지 않도록 쓰기 잠금을 먼저 잡음
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 재시도 횟수를 다 쓴 채로 기한이 지난 작업(반복해서 워커를 죽이는 게시글)은 실패 처리
+                self._conn.execute("""
+                    UPDATE frontier SET status=?, lease_token=NULL, updated_at=?
+                    WHERE status=? AND lease_expires<? AND attempts>=?
+                """, (STATUS_FAILED, now, STATUS_LEASED, now, self.max_attempts))
+                rows = self._conn.execute("""
+                    SELECT post_key, item, attempts FROM frontier
+                    WHERE (status=? AND available_at<=?) OR (status=? AND lease_expires<?)
+                    ORDER BY priority DESC, added_at
+                    LIMIT ?
+                """, (STATUS_PENDING, now, STATUS_LEASED, now, count)).fetchall()
+                for key, item, attempts in rows:
+                    token = uuid.uuid4().hex
+                    self._conn.execute("""
+                        UPDATE frontier
+                        SET status=?, attempts=attempts + 1, lease_owner=?, lease_token=?, lease_expires=?, updated_at=?
+                        WHERE post_key=?
+                    """, (STATUS_LEASED, worker_id, token, expires_at, now, key))
+                    leases.append(Lease(token, key, json.loads(item), expires_at, attempts + 1))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return leases
+
+    def complete(self, lease):
+        """임대가 아직 유효하면(다른 워커에 재배정되지 않았으면) 완료 처리하고 True 반환"""
+        with self._lock:
+            cursor = self._conn.execute("""
+                UPDATE frontier SET status=?, lease_token=NULL, updated_at=?
+                WHERE post_key=? AND lease_token=? AND status=?
+            """, (STATUS_DONE, time.time(), lease.key, lease.token, STATUS_LEASED))
+        return cursor.rowcount == 1
+
+    def fail(self, lease, retry_delay=0, retryable=True):
+        """실패한 작업을 반환, 재시도 횟수가 남았으면 다시 대기 상태로 두고 True 반환"""
+        now = time.time()
+        max_attempts = self.max_attempts if retryable else 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute("""
+                    UPDATE frontier
+                    SET status=CASE WHEN attempts<? THEN ? ELSE ? END,
+                        available_at=?, lease_token=NULL, updated_at=?
+                    WHERE post_key=? AND lease_token=? AND status=?
+                """, (max_attempts, STATUS_PENDING, STATUS_FAILED, now + retry_delay, now, lease.key, lease.token, STATUS_LEASED))
+                status = None
+                if cursor.rowcount == 1:
+                    status = self._conn.execute("SELECT status FROM frontier WHERE post_key=?", (lease.key,)).fetchone()[0]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return status == STATUS_PENDING
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM frontier GROUP BY status").fetchall()
+        counts = {STATUS_PENDING: 0, STATUS_LEASED: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+FRONTIER_TYPES = {
+    'sqlite': SqliteFrontier
+}
+
+def open_frontier(path, kind='sqlite', **kwargs):
+    """kind에 맞는 프론티어 생성 (다른 저장소는 Frontier를 상속해 FRONTIER_TYPES에 등록)"""
+    if kind not in FRONTIER_TYPES:
+        raise ValueError(f"지원하지 않는 프론티어 저장소입니다: {kind}")
+    return FRONTIER_TYPES[kind](path, **kwargs)
@@ -1,59 +1,178 @@
+import json
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
+from multiprocessing.util import Finalize
 from datetime import datetime
 
+# 로그 파일 회전 기준 (파일당 최대 크기, 보관 개수)
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_BACKUP_COUNT = 20
+
+# 리스너가 한 번에 꺼내서 기록하는 최대 레코드 수
+LOG_BATCH_SIZE = 200
+
+# 구조화 로그에 그대로 옮겨 적는 extra 필드
+STRUCTURED_FIELDS = ('url', 'elapsed', 'stage', 'path', 'status', 'error', 'keyword')
+
+LOG_TYPES = ('program', 'crawler')
+
+_log_queue = None
+_listener = None
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%d %H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'process': record.processName,
+            'message': record.getMessage()
+        }
+        for field in STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class _BatchFileHandler(logging.handlers.RotatingFileHandler):
+    """레코드마다 flush하지 않고 리스너가 배치를 다 쓴 뒤 한 번에 flush하는 회전 파일 핸들러"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        self.acquire()
+        try:
+            if self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+        finally:
+            self.release()
+
+class _NameFilter(logging.Filter):
+    def __init__(self, log_type):
+        super().__init__()
+        self.log_type = log_type
+
+    def filter(self, record):
+        return record.name == self.log_type
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """큐에 쌓인 레코드를 최대 LOG_BATCH_SIZE개씩 꺼내 기록하고 배치마다 한 번만 flush"""
+
+    def _monitor(self):
+        log_queue = self.queue
+        stopping = False
+        while not stopping:
+            batch = [self.dequeue(True)]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                    continue
+                self.handle(record)
+            for handler in self.handlers:
+                if isinstance(handler, _BatchFileHandler):
+                    handler.flush_batch()
+
+class _QueueForwardHandler(logging.handlers.QueueHandler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    def enqueue(self, record):
+        get_log_queue().put_nowait(record)
+
 class Logger:
     _timestamp = None
-    
+
     @classmethod
     def _get_timestamp(cls):
         if cls._timestamp is None:
             cls._timestamp = datetime.now().strftime('%Y%m%d_%H%M')
         return cls._timestamp
-    
+
     def __init__(self, name, log_type):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
-        
+        self.logger.propagate = False
+
         # 이미 핸들러가 있다면 제거
         if self.logger.handlers:
             self.logger.handlers.clear()
-        
-        # 로그 디렉토리 생성
-        log_dir = 'logs'
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        
-        # 로그 파일명 생성 (프로그램 실행 시점의 타임스탬프 사용)
-        timestamp = self._get_timestamp()
-        log_file = os.path.join(log_dir, f'{timestamp}_{log_type}_logs.txt')
-        
-        # 파일 핸들러 설정
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        
-        # 콘솔 핸들러 설정 (ERROR 레벨만 표시)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.ERROR)
-        
-        # 포매터 설정
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # 핸들러 추가
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
+
+        # 모든 프로세스의 레코드는 큐로 보내고, 실제 파일 기록은 리스너 하나가 담당
+        self.logger.addHandler(_QueueForwardHandler())
+
     def get_logger(self):
         return self.logger
 
+def _build_handlers():
+    # 로그 디렉토리 생성
+    log_dir = 'logs'
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+
+    # 로그 파일명 생성 (프로그램 실행 시점의 타임스탬프 사용)
+    timestamp = Logger._get_timestamp()
+    handlers = []
+    for log_type in LOG_TYPES:
+        log_file = os.path.join(log_dir, f'{timestamp}_{log_type}_logs.jsonl')
+        file_handler = _BatchFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonFormatter())
+        file_handler.addFilter(_NameFilter(log_type))
+        handlers.append(file_handler)
+
+    # 콘솔 핸들러 설정 (ERROR 레벨만 표시)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.ERROR)
+    console_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    handlers.append(console_handler)
+    return handlers
+
+def get_log_queue():
+    """로그 큐 반환, 아직 없으면 이 프로세스에 큐와 리스너를 생성"""
+    global _log_queue, _listener
+    if _log_queue is None:
+        _log_queue = multiprocessing.Queue(-1)
+        _listener = _BatchingQueueListener(_log_queue, *_build_handlers(), respect_handler_level=True)
+        _listener.start()
+        # multiprocessing 자식 프로세스는 atexit를 거치지 않으므로 Finalize로 등록
+        # (큐 자체의 정리(exitpriority=10)보다 먼저 실행되어야 남은 레코드를 기록할 수 있음)
+        Finalize(None, stop_logging, exitpriority=100)
+    return _log_queue
+
+def attach_worker_logging(log_queue):
+    """워커 프로세스 초기화 시 호출: 메인 프로세스 리스너의 큐로 레코드를 보냄"""
+    global _log_queue
+    _log_queue = log_queue
+
+def stop_logging():
+    """남은 레코드를 모두 기록하고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+# 메인 프로세스는 즉시 큐와 리스너를 만들어 fork된 워커가 같은 큐를 물려받도록 함
+# (spawn으로 시작한 프로세스는 모듈을 다시 import하므로 이름으로 구분)
+if multiprocessing.current_process().name == 'MainProcess':
+    get_log_queue()
+
 # 프로그램 로거 생성
 program_logger = Logger('program', 'program').get_logger()
 
 # 크롤러 로거 생성
-crawler_logger = Logger('crawler', 'crawler').get_logger() 
\ No newline at end of file
+crawler_logger = Logger('crawler', 'crawler').get_logger()
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 단계별 소요시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+class Metrics:
+    """카운터와 히스토그램을 모으는 레지스트리
+
+    스레드끼리는 같은 레지스트리를 공유하고, 워커 프로세스는 drain()으로 꺼낸 증분을
+    결과와 함께 돌려보내 메인 프로세스에서 merge()로 합산
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # 버킷별 개수 + 합계 + 전체 개수
+                histogram = self._histograms[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """블록 실행 시간을 stage_seconds{stage=...} 히스토그램에 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start, stage=stage, **labels)
+
+    def _snapshot(self):
+        return {
+            'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+            'histograms': [[name, list(labels), list(values)] for (name, labels), values in self._histograms.items()]
+        }
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot()
+
+    def drain(self):
+        """현재까지의 값을 반환하고 초기화 (워커 → 메인 프로세스 전달용 증분)"""
+        with self._lock:
+            snapshot = self._snapshot()
+            self._counters = {}
+            self._histograms = {}
+        return snapshot
+
+    def merge(self, snapshot):
+        if not snapshot:
+            return
+        with self._lock:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                self._counters[key] = self._counters.get(key, 0) + value
+            for name, labels, values in snapshot['histograms']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    self._histograms[key] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        histogram[index] += value
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식으로 변환"""
+        lines = []
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                lines.append(f'blogcrawler_{name}{_format_labels(labels)} {value}')
+            for (name, labels), values in sorted(self._histograms.items()):
+                for bound, count in zip(self.buckets, values):
+                    lines.append(f'blogcrawler_{name}_bucket{_format_labels(labels, ("le", bound))} {count}')
+                lines.append(f'blogcrawler_{name}_bucket{_format_labels(labels, ("le", "+Inf"))} {values[-1]}')
+                lines.append(f'blogcrawler_{name}_sum{_format_labels(labels)} {values[-2]}')
+                lines.append(f'blogcrawler_{name}_count{_format_labels(labels)} {values[-1]}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        return json.dumps({'uptime': time.time() - self.started_at, **self.snapshot()}, ensure_ascii=False)
+
+    def summary_lines(self):
+        """실행 종료 요약: 카운터 값과 단계별 평균/추정 p95"""
+        lines = []
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                lines.append(f"{name}{_format_labels(labels)}: {value}")
+            for (name, labels), values in sorted(self._histograms.items()):
+                count = values[-1]
+                if not count:
+                    continue
+                p95_bound = next(
+                    (bound for bound, bucket_count in zip(self.buckets, values) if bucket_count >= count * 0.95),
+                    float('inf')
+                )
+                lines.append(
+                    f"{name}{_format_labels(labels)}: {count}건, 평균 {values[-2] / count:.3f}초, p95 ≤ {p95_bound}초"
+                )
+        return lines
+
+    def log_summary(self, logger):
+        logger.info("단계별 측정 요약")
+        for line in self.summary_lines():
+            logger.info(f"  {line}")
+
+# 프로세스 전역 레지스트리
+metrics = Metrics()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/metrics.json'):
+            body, content_type = self.server.registry.to_json(), 'application/json; charset=utf-8'
+        elif self.path.startswith('/metrics'):
+            body, content_type = self.server.registry.to_prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_metrics_server(port=9108, host='127.0.0.1', registry=metrics):
+    """/metrics(Prometheus 텍스트)와 /metrics.json을 제공하는 백그라운드 HTTP 서버 시작"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
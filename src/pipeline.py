@@ -0,0 +1,180 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from src.logger import program_logger
+from src.driver_pool import DriverPool
+from src.urls import post_key
+from src.metrics import metrics
+from src.failures import CrawlFailure, RetryQueue
+
+_DONE = object()
+
+# 재시도 시각이 된 아이템을 확인하는 간격 (초)
+RETRY_POLL_INTERVAL = 0.5
+
+class CrawlPipeline:
+    """검색 → 수집/추출 → 저장 단계를 bounded queue로 연결해 동시에 실행하는 asyncio 파이프라인
+
+    재시도할 수 있는 실패는 BlogProcessor와 같은 RetryQueue 백오프 후 수집 단계로 되돌리고,
+    최종 실패는 프로세서의 dead-letter sink에 기록. SQLite(수집 인덱스, 이어하기)와 sink 접근은
+    이벤트 루프를 막지 않도록 모두 스레드에서 실행
+    """
+
+    def __init__(self, api, processor, sink, search_concurrency=2, crawl_concurrency=4, queue_size=100, search_options=None):
+        self.api = api
+        self.processor = processor
+        self.sink = sink
+        self.search_concurrency = search_concurrency
+        self.crawl_concurrency = crawl_concurrency
+        self.queue_size = queue_size
+        self.search_options = search_options or {}
+        self.stats = {'searched': 0, 'skipped': 0, 'crawled': 0, 'retried': 0, 'failed': 0}
+
+    def run(self, keywords):
+        """키워드 목록에 대해 파이프라인을 실행하고 기록한 결과 건수를 반환"""
+        return asyncio.run(self._run(keywords))
+
+    async def _run(self, keywords):
+        # 큐 크기로 단계 사이 backpressure를 걸어 메모리 사용량을 일정하게 유지
+        item_queue = asyncio.Queue(maxsize=self.queue_size)
+        result_queue = asyncio.Queue(maxsize=self.queue_size)
+        retries = RetryQueue(max_retries=self.processor.max_retries)
+        # 검색 단계가 넘긴 뒤 아직 최종 결과가 나오지 않은 아이템 수 (재시도 대기 포함)
+        self._pending = 0
+        self._searching = True
+        self._settled = asyncio.Event()
+
+        search_executor = ThreadPoolExecutor(max_workers=self.search_concurrency, thread_name_prefix='search')
+        crawl_executor = ThreadPoolExecutor(max_workers=self.crawl_concurrency, thread_name_prefix='crawl')
+        write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='write')
+        driver_pool = DriverPool(
+            self.processor.crawler,
+            max_size=self.crawl_concurrency,
+            max_pages=self.processor.driver_max_pages,
+            max_lifetime=self.processor.driver_max_lifetime
+        )
+
+        completed = {post_key(url) for url in await asyncio.to_thread(self.sink.completed_urls)}
+        keyword_queue = asyncio.Queue()
+        for keyword in keywords:
+            keyword_queue.put_nowait(keyword)
+
+        program_logger.info(
+            f"파이프라인 시작: 키워드 {len(keywords)}개, 검색 동시성 {self.search_concurrency}, "
+            f"수집 동시성 {self.crawl_concurrency}, 큐 크기 {self.queue_size}"
+        )
+
+        try:
+            searchers = [
+                asyncio.create_task(self._search_stage(keyword_queue, item_queue, search_executor, completed))
+                for _ in range(self.search_concurrency)
+            ]
+            crawlers = [
+                asyncio.create_task(self._crawl_stage(item_queue, result_queue, crawl_executor, driver_pool, retries))
+                for _ in range(self.crawl_concurrency)
+            ]
+            retrier = asyncio.create_task(self._retry_stage(item_queue, retries))
+            writer = asyncio.create_task(self._write_stage(result_queue, write_executor))
+
+            await asyncio.gather(*searchers)
+            self._searching = False
+            self._settle()
+            # 재시도까지 모두 끝난 뒤에 수집 단계를 종료
+            await self._settled.wait()
+            retrier.cancel()
+            for _ in crawlers:
+                await item_queue.put(_DONE)
+            await asyncio.gather(*crawlers)
+            await result_queue.put(_DONE)
+            await writer
+        finally:
+            search_executor.shutdown(wait=True)
+            crawl_executor.shutdown(wait=True)
+            write_executor.shutdown(wait=True)
+            driver_pool.close()
+
+        program_logger.info(
+            f"파이프라인 종료: 검색 {self.stats['searched']}건, 건너뜀 {self.stats['skipped']}건, "
+            f"수집 성공 {self.stats['crawled']}건, 재시도 {self.stats['retried']}건, 실패 {self.stats['failed']}건"
+        )
+        metrics.log_summary(program_logger)
+        return self.stats['crawled']
+
+    def _settle(self):
+        if not self._searching and self._pending == 0:
+            self._settled.set()
+
+    def _fresh_keys(self, keys):
+        crawl_index = self.processor.crawl_index
+        return {key for key in keys if crawl_index.is_fresh(key)}
+
+    async def _search_stage(self, keyword_queue, item_queue, executor, seen):
+        loop = asyncio.get_running_loop()
+        while not keyword_queue.empty():
+            keyword = keyword_queue.get_nowait()
+            pages = self.api.iter_search_pages(keyword, **self.search_options)
+            while True:
+                # 검색 제너레이터는 블로킹 호출이므로 전용 스레드에서 한 페이지씩 진행
+                items = await loop.run_in_executor(executor, next, pages, None)
+                if items is None:
+                    break
+                keys = [post_key(item['link']) for item in items]
+                fresh = set()
+                if self.processor.crawl_index is not None:
+                    fresh = await asyncio.to_thread(self._fresh_keys, keys)
+                for item, key in zip(items, keys):
+                    self.stats['searched'] += 1
+                    if key in seen or key in fresh:
+                        self.stats['skipped'] += 1
+                        continue
+                    seen.add(key)
+                    self._pending += 1
+                    await item_queue.put(item)
+
+    async def _crawl_stage(self, item_queue, result_queue, executor, driver_pool, retries):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await item_queue.get()
+            if item is _DONE:
+                break
+            try:
+                result = await loop.run_in_executor(executor, self.processor.process_blog_item, item, driver_pool)
+            except Exception as e:
+                program_logger.error(f"파이프라인 수집 오류: {item['link']} - 오류: {str(e)}")
+                result = None
+            if isinstance(result, CrawlFailure) and retries.schedule(item, result):
+                metrics.inc('retry_scheduled_total', kind=result.kind)
+                self.stats['retried'] += 1
+                continue
+            await result_queue.put((item['link'], result))
+            self._pending -= 1
+            self._settle()
+
+    async def _retry_stage(self, item_queue, retries):
+        """재시도 시각이 된 아이템을 수집 단계로 되돌림"""
+        while True:
+            await asyncio.sleep(RETRY_POLL_INTERVAL)
+            for item in retries.pop_due():
+                await item_queue.put(item)
+
+    async def _write_stage(self, result_queue, executor):
+        loop = asyncio.get_running_loop()
+        crawl_index = self.processor.crawl_index
+        while True:
+            entry = await result_queue.get()
+            if entry is _DONE:
+                break
+            blog_url, result = entry
+            if crawl_index is not None:
+                await loop.run_in_executor(executor, crawl_index.record, blog_url, result)
+            if not result:
+                self.stats['failed'] += 1
+                await loop.run_in_executor(executor, self.processor.write_dead_letter, blog_url, result)
+                continue
+            await loop.run_in_executor(executor, self._write, result)
+            self.stats['crawled'] += 1
+
+    def _write(self, result):
+        if self.processor.dedup is not None:
+            self.processor.dedup.tag(result)
+        with metrics.span('write'):
+            self.sink.write(result)
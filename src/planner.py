@@ -0,0 +1,84 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.logger import program_logger
+from src.urls import post_key
+
+# 작성일이 이 기간만큼 지날 때마다 최신성 점수가 절반으로 줄어듦
+RECENCY_HALF_LIFE_DAYS = 30
+# 최신성 점수(0~1)의 가중치: 2면 오늘 올라온 글이 키워드 두 개에 더 걸린 글과 비슷한 순위
+RECENCY_WEIGHT = 2.0
+
+def recency(postdate, now=None, half_life_days=RECENCY_HALF_LIFE_DAYS):
+    """postdate(YYYYMMDD)가 최근일수록 1에 가까운 값, 날짜를 모르면 0"""
+    try:
+        published_at = time.mktime(time.strptime(str(postdate), '%Y%m%d'))
+    except (TypeError, ValueError):
+        return 0.0
+    age_days = max(0.0, ((now or time.time()) - published_at) / 86400)
+    return 0.5 ** (age_days / half_life_days)
+
+class QueryPlanner:
+    """여러 키워드의 검색 결과를 게시글 기준으로 합쳐 게시글마다 한 번씩만 수집하도록 계획
+
+    같은 게시글을 찾은 키워드는 모두 item['keywords']에 남기고, 걸린 키워드 수와 작성일 최신성으로
+    item['priority']를 매겨 높은 순으로 정렬. 순위를 매기려면 모든 검색이 끝나야 하므로
+    키워드 하나를 검색하면서 바로 수집을 시작하는 iter_search와 달리 검색을 먼저 마침
+    """
+
+    def __init__(self, api, keyword_concurrency=4, recency_weight=RECENCY_WEIGHT, half_life_days=RECENCY_HALF_LIFE_DAYS):
+        self.api = api
+        self.keyword_concurrency = keyword_concurrency
+        self.recency_weight = recency_weight
+        self.half_life_days = half_life_days
+
+    def priority(self, item, now=None):
+        return round(len(item['keywords']) + self.recency_weight * recency(item.get('postdate'), now, self.half_life_days), 4)
+
+    def plan(self, keywords, **search_options):
+        """키워드별 검색(iter_search 옵션 그대로 전달)을 동시에 실행하고 중복 없는 수집 목록을 우선순위 순으로 반환"""
+        keywords = list(dict.fromkeys(keywords))
+        start_time = time.time()
+        merged = {}
+        total = 0
+
+        def search(keyword):
+            return keyword, list(self.api.iter_search(keyword, **search_options))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.keyword_concurrency), thread_name_prefix='plan') as executor:
+            # 결과를 키워드 순서대로 합쳐 item['keywords']의 순서가 실행마다 같도록 함
+            for keyword, items in executor.map(search, keywords):
+                total += len(items)
+                for item in items:
+                    key = post_key(item['link'])
+                    planned = merged.get(key)
+                    if planned is None:
+                        planned = merged[key] = dict(item, keywords=[])
+                    if keyword not in planned['keywords']:
+                        planned['keywords'].append(keyword)
+
+        now = time.time()
+        for item in merged.values():
+            item['priority'] = self.priority(item, now)
+        plan = sorted(merged.values(), key=lambda item: item['priority'], reverse=True)
+
+        program_logger.info(
+            f"검색 계획: 키워드 {len(keywords)}개, 검색 결과 {total}건 → 고유 게시글 {len(plan)}건 "
+            f"(중복 {total - len(plan)}건 제외, 소요시간: {time.time() - start_time:.2f}초)"
+        )
+        return plan
+
+    def stream(self, keyword, **search_options):
+        """키워드 하나의 검색 결과를 도착하는 대로 plan()과 같은 형태(keywords/priority)로 반환하는 제너레이터
+
+        합칠 다른 키워드가 없으므로 순위를 매기려고 검색이 끝나기를 기다리지 않고 첫 페이지부터 바로 반환
+        """
+        seen = set()
+        now = time.time()
+        for item in self.api.iter_search(keyword, **search_options):
+            key = post_key(item['link'])
+            if key in seen:
+                continue
+            seen.add(key)
+            planned = dict(item, keywords=[keyword])
+            planned['priority'] = self.priority(planned, now)
+            yield planned
@@ -1,53 +1,295 @@
-import pandas as pd
-import multiprocessing
-from multiprocessing import Pool
-from functools import partial
+import contextlib
+from multiprocessing.util import Finalize
 from tqdm import tqdm
-from src.logger import program_logger
+from src.logger import program_logger, get_log_queue, attach_worker_logging
+from src.driver_pool import DriverPool
+from src.executor import create_backend
+from src.urls import post_key
+from src.metrics import metrics
+from src.failures import CrawlFailure, RetryQueue, HOST_FAILURES
+from src.circuit_breaker import CircuitBreaker
+from src.records import ResultBatch
+
+# process 백엔드에서 워커 작업 하나가 처리하는 아이템 수 (결과를 배치 하나로 묶어 돌려보냄)
+RESULT_BATCH_SIZE = 8
+
+# dead-letter 파일의 열
+DEAD_LETTER_COLUMNS = [('URL', 'str'), ('FailureKind', 'str'), ('Error', 'str')]
+
+# 워커 프로세스마다 한 번 초기화되는 상태
+_worker_processor = None
+_worker_driver_pool = None
+
+def _init_worker(processor, log_queue):
+    """워커 프로세스 초기화: 프로세서를 보관하고 전용 드라이버 풀 생성"""
+    global _worker_processor, _worker_driver_pool
+    # 로그는 메인 프로세스의 리스너 하나가 기록하도록 공용 큐로 전달
+    attach_worker_logging(log_queue)
+    _worker_processor = processor
+    # fork로 복사된 메인 프로세스의 측정값이 중복 집계되지 않도록 초기화
+    metrics.drain()
+    _worker_driver_pool = DriverPool(
+        processor.crawler,
+        max_size=1,
+        max_pages=processor.driver_max_pages,
+        max_lifetime=processor.driver_max_lifetime
+    )
+    # 워커가 정상 종료될 때 남은 드라이버 정리
+    Finalize(_worker_driver_pool, _worker_driver_pool.close, exitpriority=10)
+
+def _process_batch_in_worker(blog_items):
+    """아이템 묶음을 처리해 성공한 결과는 ResultBatch 하나로, 실패는 (URL, 실패) 목록으로 반환"""
+    batch = ResultBatch()
+    failures = []
+    for item in blog_items:
+        result = _worker_processor.process_blog_item(item, _worker_driver_pool)
+        if result:
+            batch.append(result)
+        else:
+            failures.append((item['link'], result))
+    # 이 작업에서 쌓인 측정 증분을 결과와 함께 메인 프로세스로 전달
+    return batch, failures, metrics.drain()
+
+def _chunked(blog_items, size):
+    """아이템을 size개씩 묶어 반환하는 제너레이터 (마지막 묶음은 더 작을 수 있음)"""
+    chunk = []
+    for item in blog_items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _exclude_posts(blog_items, keys):
+    """게시글 식별자가 keys에 포함된 아이템 제외 (리스트면 리스트, 아니면 제너레이터 반환)"""
+    pending = (item for item in blog_items if post_key(item['link']) not in keys)
+    return list(pending) if isinstance(blog_items, list) else pending
 
 class BlogProcessor:
-    def __init__(self, crawler):
+    def __init__(self, crawler, driver_max_pages=50, driver_max_lifetime=600, crawl_index=None, backend=None,
+                 circuit_breaker=None, max_retries=2, dead_letter=None, dedup=None, result_batch_size=RESULT_BATCH_SIZE):
         self.crawler = crawler
+        # 실행 백엔드 (process/thread/async), None이면 메모리 예산 기준 process 백엔드
+        self.backend = backend
+        # 이전 실행의 수집 이력 (워커로 전달하지 않고 메인 프로세스에서만 사용)
+        self.crawl_index = crawl_index
+        # 오류율이 급증한 호스트는 워커 전체가 잠시 수집을 멈춤 (공유 메모리이므로 워커로 전달)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # 재시도할 수 있는 실패의 최대 재시도 횟수, 최종 실패는 dead_letter sink에 기록
+        self.max_retries = max_retries
+        self.dead_letter = dead_letter
+        # 결과가 도착하는 대로 본문 유사도 기준 클러스터를 배정 (메인 프로세스에서만 기록)
+        self.dedup = dedup
+        # process 백엔드 워커가 결과를 돌려보내는 단위 (클수록 전달 횟수가 줄고 결과가 늦게 도착)
+        self.result_batch_size = result_batch_size
+        self.driver_max_pages = driver_max_pages
+        self.driver_max_lifetime = driver_max_lifetime
+        # session() 안에서 스레드/asyncio 백엔드가 호출마다 공유하는 드라이버 풀
+        self._driver_pool = None
+
+    def __getstate__(self):
+        # 워커에는 크롤링에 필요한 상태만 전달
+        state = self.__dict__.copy()
+        state['crawl_index'] = None
+        state['backend'] = None
+        state['dead_letter'] = None
+        state['dedup'] = None
+        state['_driver_pool'] = None
+        return state
 
-    def process_blog_item(self, item):
+    @contextlib.contextmanager
+    def session(self):
+        """블록 안에서 iter_results를 여러 번 호출해도 워커 프로세스와 브라우저를 다시 띄우지 않도록 유지"""
+        if self.backend is None:
+            self.backend = create_backend('process')
+        if self.backend.uses_processes:
+            with self.backend.persistent():
+                yield self
+            return
+        self._driver_pool = self._create_driver_pool(self.backend)
+        try:
+            yield self
+        finally:
+            driver_pool, self._driver_pool = self._driver_pool, None
+            driver_pool.close()
+
+    def process_blog_item(self, item, driver_pool=None):
         """멀티프로세싱을 위한 블로그 아이템 처리 함수"""
         blog_url = item['link']
-        result = self.crawler.get_blog_info(blog_url)
+        self.circuit_breaker.wait(blog_url)
+        result = self.crawler.get_blog_info(blog_url, driver_pool=driver_pool)
+        # 게시글 자체의 문제(삭제/비공개)는 호스트 오류율에 반영하지 않음
+        self.circuit_breaker.record(blog_url, not (isinstance(result, CrawlFailure) and result.kind in HOST_FAILURES))
         
         if result:
             result['Title'] = item['title'].replace('<b>', '').replace('</b>', '')
             result['APIPostDate'] = item['postdate']
-            return result
-        return None
+            if 'keywords' in item:
+                # 이 게시글을 찾은 모든 키워드 (QueryPlanner)
+                result['Keywords'] = ', '.join(item['keywords'])
+                result['KeywordHits'] = len(item['keywords'])
+        return result
+
+    def process_items(self, blog_items, sink=None):
+        """블로그 아이템들을 병렬로 처리 (리스트 또는 검색 제너레이터)
 
-    def process_items(self, blog_items):
-        """블로그 아이템들을 병렬로 처리"""
-        total_items = len(blog_items)
-        program_logger.info(f"총 {total_items}개의 블로그 게시글을 찾았습니다.")
+        sink가 주어지면 결과를 메모리에 모으지 않고 도착하는 대로 기록하며, 기록한 건수를 반환하고
+        아니면 결과를 열 단위 ResultBatch에 모아 반환
+        """
+        # 이어하기 모드면 이미 기록된 게시글 제외
+        if sink is not None:
+            completed = {post_key(url) for url in sink.completed_urls()}
+            if completed:
+                blog_items = _exclude_posts(blog_items, completed)
+        
+        # 최근에 수집한 게시글과 주소만 다른 중복 게시글 제외
+        if self.crawl_index is not None:
+            blog_items = self.crawl_index.filter_pending(blog_items)
         
-        # CPU 코어 수에 따라 프로세스 수 결정 (최대 4개)
-        num_processes = min(4, multiprocessing.cpu_count())
-        program_logger.info(f"{num_processes}개의 프로세스로 크롤링을 시작합니다...")
+        # 제너레이터가 주어지면 검색 페이지가 도착하는 대로 크롤링을 시작
+        total_items = len(blog_items) if hasattr(blog_items, '__len__') else None
+        if total_items is not None:
+            program_logger.info(f"총 {total_items}개의 블로그 게시글을 찾았습니다.")
         
-        # 멀티프로세싱으로 크롤링 실행
-        results = []
-        with Pool(num_processes) as pool:
-            process_func = partial(self.process_blog_item)
-            for result in tqdm(
-                pool.imap_unordered(process_func, blog_items),
-                total=total_items,
-                desc="크롤링 진행률",
-                unit="건"
+        results = ResultBatch()
+        written = 0
+        path_counts = {}
+        like_unknown = 0
+        for blog_url, result in tqdm(
+            self._iter_with_retries(blog_items),
+            total=total_items,
+            desc="크롤링 진행률",
+            unit="건"
+        ):
+            if self.crawl_index is not None:
+                self.crawl_index.record(blog_url, result)
+            if not result:
+                self.write_dead_letter(blog_url, result)
+                continue
+            path = result.get('FetchPath', 'selenium')
+            path_counts[path] = path_counts.get(path, 0) + 1
+            if path == 'http' and result.get('LikeCount') is None:
+                like_unknown += 1
+            if self.dedup is not None:
+                self.dedup.tag(result)
+            if sink is not None:
+                with metrics.span('write'):
+                    sink.write(result)
+                written += 1
+            else:
+                results.append(result)
+        
+        self._log_fetch_paths(path_counts, like_unknown)
+        metrics.log_summary(program_logger)
+        return written if sink is not None else results
+
+    def _iter_with_retries(self, blog_items):
+        """iter_results와 같지만 재시도할 수 있는 실패는 백오프 후 다시 처리하고 최종 결과만 반환
+
+        백엔드가 입력을 소비자 스레드에서 꺼낼 수 있으므로 입력 제너레이터 안에서 기다리지 않고,
+        원래 입력을 다 넘긴 뒤 남은 재시도를 가장 이른 재시도 시각부터 차례로 처리
+        """
+        retries = RetryQueue(max_retries=self.max_retries)
+        in_flight = {}
+
+        def feed(items):
+            for item in items:
+                # 원래 입력 사이에 재시도 시각이 된 아이템을 끼워 넣음
+                for retry_item in retries.pop_due() + [item]:
+                    in_flight[post_key(retry_item['link'])] = retry_item
+                    yield retry_item
+
+        source = blog_items
+        while True:
+            for blog_url, result in self.iter_results(feed(source)):
+                item = in_flight.pop(post_key(blog_url), None)
+                if isinstance(result, CrawlFailure) and item is not None and retries.schedule(item, result):
+                    metrics.inc('retry_scheduled_total', kind=result.kind)
+                    continue
+                yield blog_url, result
+            if not retries:
+                break
+            program_logger.info(f"재시도 대기 중인 게시글 {len(retries)}건")
+            source = retries.wait_due()
+
+    def write_dead_letter(self, blog_url, failure):
+        """최종 실패한 게시글을 종류와 함께 dead-letter sink에 기록"""
+        kind = failure.kind if isinstance(failure, CrawlFailure) else 'unknown'
+        metrics.inc('dead_letter_total', kind=kind)
+        if self.dead_letter is None:
+            return
+        self.dead_letter.write({
+            'URL': blog_url,
+            'FailureKind': kind,
+            'Error': failure.error if isinstance(failure, CrawlFailure) else None
+        })
+
+    def iter_results(self, blog_items):
+        """아이템을 병렬로 처리하고 (URL, 결과)를 완료 순서대로 반환 (실패한 아이템의 결과는 None)"""
+        # 워커 수는 CPU 코어가 아니라 브라우저 메모리 예산 기준
+        backend = self.backend or create_backend('process')
+        for blog_url, result in self._map_items(backend, blog_items):
+            backend.record(bool(result))
+            yield blog_url, result
+
+    def _map_items(self, backend, blog_items):
+        """백엔드에서 아이템을 처리하고 (URL, 결과)를 완료 순서대로 반환"""
+        if backend.uses_processes:
+            # 프로세서는 initializer로 워커당 한 번만 전달하고, 작업마다 아이템 묶음만 전달
+            # (결과는 게시글마다 dict를 pickle하지 않고 묶음당 열 단위 배치 하나로 돌려받음)
+            for batch, failures, delta in backend.map_unordered(
+                _process_batch_in_worker, _chunked(blog_items, self.result_batch_size),
+                initializer=_init_worker, initargs=(self, get_log_queue())
             ):
-                if result:
-                    results.append(result)
+                metrics.merge(delta)
+                for result in batch:
+                    yield result['URL'], result
+                yield from failures
+            return
         
-        return results
+        # 스레드/asyncio 백엔드는 동시 실행 수만큼의 드라이버를 하나의 풀에서 공유
+        driver_pool = self._driver_pool or self._create_driver_pool(backend)
+        try:
+            yield from backend.map_unordered(
+                lambda item: (item['link'], self.process_blog_item(item, driver_pool)),
+                blog_items
+            )
+        finally:
+            if driver_pool is not self._driver_pool:
+                driver_pool.close()
+
+    def _create_driver_pool(self, backend):
+        return DriverPool(
+            self.crawler,
+            max_size=backend.max_workers,
+            max_pages=self.driver_max_pages,
+            max_lifetime=self.driver_max_lifetime
+        )
+
+    def _log_fetch_paths(self, path_counts, like_unknown=0):
+        """수집 경로(HTTP/Selenium)별 처리 비율 기록
+
+        HTTP 경로는 공감 수를 공감 API로 따로 조회하므로, 조회하지 못해 비어 있는 건수를 함께 기록
+        """
+        total = sum(path_counts.values())
+        if not total:
+            return
+        summary = ', '.join(
+            f"{path} {count}건 ({count / total * 100:.1f}%)"
+            for path, count in sorted(path_counts.items())
+        )
+        if like_unknown:
+            summary += f" - http 중 공감 수 미확인 {like_unknown}건"
+        program_logger.info(f"수집 경로별 처리 비율: {summary}")
 
     def save_results(self, results):
         """결과를 CSV 파일로 저장"""
         if results:
-            df = pd.DataFrame(results)
+            import pandas as pd
+
+            # ResultBatch는 열 버퍼를 복사하지 않고 DataFrame으로 변환
+            df = results.to_pandas() if isinstance(results, ResultBatch) else pd.DataFrame(results)
             filename = "results.csv"
             df.to_csv(filename, index=False, encoding='utf-8-sig')
             program_logger.info(f"최종 결과가 저장되었습니다: {filename} (총 {len(results)}개)")
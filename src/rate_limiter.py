@@ -0,0 +1,96 @@
+import multiprocessing
+import time
+from urllib.parse import urlparse
+from src.logger import crawler_logger
+
+# 호스트별 (초당 요청 수, 최대 버스트)
+DEFAULT_HOST_RATES = {
+    'blog.naver.com': (2.0, 4),
+    'openapi.naver.com': (8.0, 8),
+    '*': (2.0, 4)
+}
+
+# 상태 배열에서 호스트 하나가 차지하는 칸: 토큰, 마지막 갱신 시각, 현재 속도, 최대 속도, 버스트
+_SLOTS = 5
+
+def normalize_host(url_or_host):
+    """URL 또는 호스트를 속도 제한 버킷 이름으로 변환 (m.blog.naver.com → blog.naver.com)"""
+    host = urlparse(url_or_host).hostname if '://' in url_or_host else url_or_host
+    host = (host or '').lower()
+    if host.endswith('blog.naver.com'):
+        return 'blog.naver.com'
+    return host
+
+def is_captcha_url(url):
+    """캡차/로그인 확인 페이지로 리다이렉트되었는지 확인"""
+    url = (url or '').lower()
+    return 'captcha' in url or 'nid.naver.com' in url
+
+class AdaptiveRateLimiter:
+    """프로세스와 스레드가 공유하는 호스트별 토큰 버킷
+
+    공유 상태는 multiprocessing 공유 메모리에 있으므로 Pool initializer 인자나
+    Process 인자로 전달(상속)해야 하며, 작업 인자로 pickle해서 넘길 수 없음
+    """
+
+    def __init__(self, host_rates=None, min_rate=0.2, target_latency=5.0, decrease_factor=0.5, increase_step=0.1):
+        self.host_rates = host_rates or DEFAULT_HOST_RATES
+        self.hosts = list(self.host_rates)
+        self.min_rate = min_rate
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+
+        self._lock = multiprocessing.Lock()
+        self._state = multiprocessing.RawArray('d', len(self.hosts) * _SLOTS)
+        now = time.time()
+        for index, host in enumerate(self.hosts):
+            rate, burst = self.host_rates[host]
+            base = index * _SLOTS
+            self._state[base:base + _SLOTS] = [burst, now, rate, rate, burst]
+
+    def _index(self, host):
+        host = normalize_host(host)
+        if host in self.host_rates:
+            return self.hosts.index(host)
+        return self.hosts.index('*')
+
+    def acquire(self, host):
+        """토큰을 얻을 때까지 대기하고 대기한 시간(초)을 반환"""
+        base = self._index(host) * _SLOTS
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.time()
+                tokens, last, rate, _, burst = self._state[base:base + _SLOTS]
+                tokens = min(burst, tokens + (now - last) * rate)
+                if tokens >= 1:
+                    self._state[base] = tokens - 1
+                    self._state[base + 1] = now
+                    return waited
+                self._state[base] = tokens
+                self._state[base + 1] = now
+                delay = (1 - tokens) / rate
+            time.sleep(delay)
+            waited += delay
+
+    def feedback(self, host, status=None, latency=None, captcha=False):
+        """응답 결과에 따라 속도 조정: 429/캡차는 절반으로, 지연이 크면 소폭 감속, 정상이면 점진적으로 회복"""
+        host_name = normalize_host(host)
+        base = self._index(host) * _SLOTS
+        with self._lock:
+            rate, max_rate = self._state[base + 2], self._state[base + 3]
+            if captcha or status == 429:
+                new_rate = max(self.min_rate, rate * self.decrease_factor)
+            elif latency is not None and latency > self.target_latency:
+                new_rate = max(self.min_rate, rate * 0.9)
+            else:
+                new_rate = min(max_rate, rate + max_rate * self.increase_step)
+            self._state[base + 2] = new_rate
+
+        if new_rate < rate:
+            reason = '캡차 감지' if captcha else (f'상태코드 {status}' if status == 429 else f'응답 지연 {latency:.2f}초')
+            crawler_logger.warning(f"요청 속도 감속: {host_name} {rate:.2f} → {new_rate:.2f}회/초 ({reason})")
+
+    def current_rate(self, host):
+        return self._state[self._index(host) * _SLOTS + 2]
@@ -0,0 +1,215 @@
+from array import array
+from src.extraction import BLOG_FIELDS
+
+# 정수 값을 돌려주는 리듀서 (나머지는 문자열)
+INT_REDUCERS = ('count', 'int', 'max_int', 'hashtag')
+
+# 추출 필드 외에 결과에 붙는 열
+# (Keywords/KeywordHits는 QueryPlanner로 계획한 실행, ClusterId/DuplicateOf는 중복 탐지를 쓸 때만 채워짐)
+EXTRA_COLUMNS = [
+    ('FetchPath', 'str'),
+    ('Title', 'str'),
+    ('APIPostDate', 'str'),
+    ('Keywords', 'str'),
+    ('KeywordHits', 'int'),
+    ('ClusterId', 'str'),
+    ('DuplicateOf', 'str')
+]
+
+def result_columns(spec=BLOG_FIELDS):
+    """추출 스펙에 맞는 결과 열 목록 [(이름, 'int' | 'float' | 'str')]"""
+    fields = [(field.name, 'int' if field.reducer in INT_REDUCERS else 'str') for field in spec]
+    return [('URL', 'str')] + fields + EXTRA_COLUMNS
+
+RESULT_COLUMNS = result_columns()
+
+class _IntColumn:
+    """int64 값 버퍼 + 비트 단위 null 표시 (Arrow 메모리 레이아웃과 같음)"""
+
+    __slots__ = ('values', 'validity', 'null_count')
+
+    def __init__(self):
+        self.values = array('q')
+        self.validity = bytearray()
+        self.null_count = 0
+
+    def append(self, index, value):
+        if index % 8 == 0:
+            self.validity.append(0)
+        if value is None:
+            self.values.append(0)
+            self.null_count += 1
+        else:
+            self.values.append(value)
+            self.validity[index >> 3] |= 1 << (index & 7)
+
+    def is_valid(self, index):
+        return bool(self.validity[index >> 3] & (1 << (index & 7)))
+
+    def get(self, index):
+        return self.values[index] if self.is_valid(index) else None
+
+    def to_arrow(self, pa, length):
+        validity = pa.py_buffer(self.validity) if self.null_count else None
+        return pa.Array.from_buffers(pa.int64(), length, [validity, pa.py_buffer(self.values)], self.null_count)
+
+class _FloatColumn(_IntColumn):
+    """float64 값 버퍼 + 비트 단위 null 표시"""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__()
+        self.values = array('d')
+
+    def to_arrow(self, pa, length):
+        validity = pa.py_buffer(self.validity) if self.null_count else None
+        return pa.Array.from_buffers(pa.float64(), length, [validity, pa.py_buffer(self.values)], self.null_count)
+
+class _StrColumn(_IntColumn):
+    """UTF-8 바이트를 이어 붙인 버퍼 + int64 오프셋 (Arrow large_string 레이아웃)"""
+
+    __slots__ = ('offsets',)
+
+    def __init__(self):
+        super().__init__()
+        self.values = bytearray()
+        self.offsets = array('q', [0])
+
+    def append(self, index, value):
+        if index % 8 == 0:
+            self.validity.append(0)
+        if value is None:
+            self.null_count += 1
+        else:
+            self.values += str(value).encode('utf-8')
+            self.validity[index >> 3] |= 1 << (index & 7)
+        self.offsets.append(len(self.values))
+
+    def get(self, index):
+        if not self.is_valid(index):
+            return None
+        return self.values[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+    def to_arrow(self, pa, length):
+        validity = pa.py_buffer(self.validity) if self.null_count else None
+        buffers = [validity, pa.py_buffer(self.offsets), pa.py_buffer(self.values)]
+        return pa.Array.from_buffers(pa.large_string(), length, buffers, self.null_count)
+
+_COLUMN_TYPES = {
+    'int': _IntColumn,
+    'float': _FloatColumn,
+    'str': _StrColumn
+}
+
+# pyarrow 없이 pandas로 변환할 때 열 종류별 dtype
+_PANDAS_DTYPES = {
+    'int': 'Int64',
+    'float': 'Float64',
+    'str': 'string'
+}
+
+def infer_kind(value):
+    """값에 맞는 열 종류 ('int' | 'float' | 'str')"""
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    return 'str'
+
+class ResultBatch:
+    """결과 여러 건을 열 단위로 보관하는 배치 (게시글마다 dict를 두지 않음)
+
+    열마다 연속된 버퍼 몇 개만 두므로 pickle로 워커에서 넘길 때와 많이 쌓였을 때 객체 오버헤드가 없고,
+    to_arrow()/to_pandas()는 버퍼를 복사하지 않고 그대로 감쌈. 변환한 결과가 버퍼를 참조하므로
+    변환한 뒤에는 더 추가할 수 없음. 스키마에 없는 필드는 처음 들어온 값의 타입으로 열을 추가
+    """
+
+    __slots__ = ('columns', '_columns', '_present', '_length', '_frozen')
+
+    def __init__(self, columns=RESULT_COLUMNS):
+        self.columns = list(columns)
+        self._columns = {name: _COLUMN_TYPES[kind]() for name, kind in self.columns}
+        # 한 번이라도 값이 주어진 열 (중복 탐지를 안 쓴 실행에 빈 ClusterId 열이 생기지 않도록)
+        self._present = set()
+        self._length = 0
+        self._frozen = False
+
+    @classmethod
+    def from_rows(cls, rows, columns=RESULT_COLUMNS):
+        batch = cls(columns)
+        batch.extend(rows)
+        return batch
+
+    def append(self, row):
+        if self._frozen:
+            raise ValueError("Arrow/pandas로 변환한 배치에는 결과를 추가할 수 없습니다.")
+        for name in row:
+            if name not in self._columns:
+                self._add_column(name, infer_kind(row[name]))
+        for name, column in self._columns.items():
+            column.append(self._length, row.get(name))
+        self._present.update(row.keys())
+        self._length += 1
+
+    def _add_column(self, name, kind):
+        column = _COLUMN_TYPES[kind]()
+        for index in range(self._length):
+            column.append(index, None)
+        self.columns.append((name, kind))
+        self._columns[name] = column
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return self._length
+
+    def names(self):
+        """값이 있는 열 이름 (스키마 순서)"""
+        return [name for name, kind in self.columns if name in self._present]
+
+    def column(self, name):
+        column = self._columns[name]
+        return [column.get(index) for index in range(self._length)]
+
+    def row(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return {name: self._columns[name].get(index) for name in self.names()}
+
+    __getitem__ = row
+
+    def __iter__(self):
+        names = self.names()
+        for index in range(self._length):
+            yield {name: self._columns[name].get(index) for name in names}
+
+    def to_arrow(self):
+        """pyarrow.Table로 변환 (정수/문자열 버퍼를 복사하지 않음)"""
+        import pyarrow as pa
+
+        self._frozen = True
+        names = self.names()
+        arrays = [self._columns[name].to_arrow(pa, self._length) for name in names]
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def to_pandas(self):
+        """Arrow 버퍼를 그대로 쓰는 ArrowDtype 열의 pandas DataFrame으로 변환
+
+        pyarrow가 없으면 값을 복사해 pandas nullable 타입(Int64/Float64/string) 열로 만듦
+        """
+        import pandas as pd
+
+        try:
+            import pyarrow
+        except ImportError:
+            kinds = dict(self.columns)
+            return pd.DataFrame({
+                name: pd.array(self.column(name), dtype=_PANDAS_DTYPES[kinds[name]])
+                for name in self.names()
+            })
+        return self.to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,130 @@
+import argparse
+import os
+import sys
+import time
+from tqdm import tqdm
+from src.archive import PageArchive, read_record
+from src.executor import create_backend
+from src.extraction import BLOG_FIELDS
+from src.fast_path import CompiledSpec
+from src.logger import program_logger, get_log_queue, attach_worker_logging
+from src.metrics import metrics
+from src.records import ResultBatch, result_columns
+from src.sinks import open_sink
+
+# 워커에 한 번에 넘기는 보관 레코드 수 (같은 세그먼트 파일을 이어서 읽도록 위치 순서대로 묶음)
+BATCH_SIZE = 500
+
+# 워커 프로세스마다 한 번 초기화되는 상태
+_worker_archive_path = None
+_worker_compiled = None
+
+def _init_worker(archive_path, spec, log_queue):
+    """워커 프로세스 초기화: 셀렉터는 프로세스마다 한 번만 컴파일"""
+    global _worker_archive_path, _worker_compiled
+    attach_worker_logging(log_queue)
+    metrics.drain()
+    _worker_archive_path = archive_path
+    _worker_compiled = CompiledSpec(spec)
+
+def _extract_batch_in_worker(batch):
+    return len(batch), extract_batch(_worker_archive_path, _worker_compiled, batch), metrics.drain()
+
+def extract_batch(archive_path, compiled, batch):
+    """보관 레코드 묶음에서 필드를 다시 추출한 결과 배치 (네트워크 사용 없음)"""
+    results = ResultBatch(result_columns(compiled.spec))
+    handle = None
+    current_segment = None
+    try:
+        for url, fetch_path, segment, offset, length, codec in batch:
+            if segment != current_segment:
+                if handle is not None:
+                    handle.close()
+                handle = open(os.path.join(archive_path, 'segments', segment), 'rb')
+                current_segment = segment
+            try:
+                page_source = read_record(archive_path, segment, offset, length, codec, handle=handle)
+                with metrics.span('extract', path='archive'):
+                    fields = compiled.extract(page_source)
+            except Exception as e:
+                program_logger.warning(f"재추출 실패: {url} - 오류: {str(e)}", extra={'url': url, 'stage': 'reextract'})
+                metrics.inc('reextract_failure_total', error=type(e).__name__)
+                continue
+            results.append({'URL': url, **fields, 'FetchPath': fetch_path})
+    finally:
+        if handle is not None:
+            handle.close()
+    return results
+
+def _batches(entries, batch_size):
+    for start in range(0, len(entries), batch_size):
+        yield entries[start:start + batch_size]
+
+def reextract(archive, sink, spec=BLOG_FIELDS, backend=None, batch_size=BATCH_SIZE):
+    """보관된 모든 페이지에 추출기를 다시 적용해 sink에 기록하고 기록한 건수를 반환"""
+    entries = archive.entries()
+    program_logger.info(f"재추출 시작: 보관된 게시글 {len(entries)}건")
+    # 추출은 CPU 작업이므로 브라우저 메모리 예산이 아니라 코어 수 기준
+    backend = backend or create_backend('process', workers=os.cpu_count())
+    batches = _batches(entries, batch_size)
+    if backend.uses_processes:
+        outputs = backend.map_unordered(
+            _extract_batch_in_worker, batches,
+            initializer=_init_worker, initargs=(archive.path, spec, get_log_queue())
+        )
+    else:
+        compiled = CompiledSpec(spec)
+        outputs = backend.map_unordered(
+            lambda batch: (len(batch), extract_batch(archive.path, compiled, batch), None), batches
+        )
+
+    start_time = time.time()
+    written = 0
+    with tqdm(total=len(entries), desc="재추출 진행률", unit="건") as progress:
+        for count, results, delta in outputs:
+            metrics.merge(delta)
+            for result in results:
+                sink.write(result)
+            written += len(results)
+            progress.update(count)
+
+    elapsed_time = time.time() - start_time
+    program_logger.info(
+        f"재추출 완료: {len(entries)}건 중 {written}건 (소요시간: {elapsed_time:.2f}초)",
+        extra={'elapsed': round(elapsed_time, 3), 'stage': 'reextract'}
+    )
+    metrics.log_summary(program_logger)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='보관된 페이지 원본에서 네트워크 없이 필드를 다시 추출')
+    parser.add_argument('output', help='결과 파일 (확장자로 형식 결정: jsonl, csv, parquet)')
+    parser.add_argument('--archive', default='archive', help='원본 보관 디렉토리')
+    parser.add_argument('--backend', default='process', choices=['process', 'thread'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='동시 실행 수')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='워커에 한 번에 넘기는 레코드 수')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(args.archive, 'index.sqlite3')):
+        parser.error(f'보관 인덱스가 없습니다: {args.archive}')
+
+    archive = PageArchive(args.archive)
+    try:
+        stats = archive.stats()
+        program_logger.info(
+            f"보관소: 게시글 {stats['pages']}건, 원본 {stats['blobs']}개, "
+            f"{stats['raw_bytes'] / 1024 / 1024:.1f}MB → {stats['stored_bytes'] / 1024 / 1024:.1f}MB"
+        )
+        with open_sink(args.output) as sink:
+            written = reextract(
+                archive, sink,
+                backend=create_backend(args.backend, workers=args.workers),
+                batch_size=args.batch_size
+            )
+    finally:
+        archive.close()
+    print(f"재추출 완료: {written}건 → {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
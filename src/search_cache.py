@@ -0,0 +1,93 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.logger import program_logger
+
+class SearchCache:
+    def __init__(self, path='cache/search_cache.sqlite3', ttl=6 * 60 * 60, max_entries=10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        # 검색 API 요청은 여러 스레드에서 동시에 들어오므로 연결 하나를 잠금으로 보호
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                keyword TEXT NOT NULL,
+                start INTEGER NOT NULL,
+                display INTEGER NOT NULL,
+                sort TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (keyword, start, display, sort)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, keyword, start, display, sort):
+        """캐시된 검색 응답을 반환, 없거나 TTL이 지났으면 None"""
+        key = (keyword, start, display, sort)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM search_cache WHERE keyword=? AND start=? AND display=? AND sort=?",
+                key
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM search_cache WHERE keyword=? AND start=? AND display=? AND sort=?", key
+                    )
+                    self._conn.commit()
+                self.misses += 1
+                program_logger.debug(f"검색 캐시 미스: 키워드='{keyword}', start={start}, display={display}, sort={sort}")
+                return None
+
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at=? WHERE keyword=? AND start=? AND display=? AND sort=?",
+                (now, *key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        program_logger.info(f"검색 캐시 적중: 키워드='{keyword}', start={start}, display={display}, sort={sort}")
+        return json.loads(row[0])
+
+    def put(self, keyword, start, display, sort, result):
+        """검색 응답 저장 후 최대 개수를 넘으면 오래 사용되지 않은 항목부터 제거"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (keyword, start, display, sort, json.dumps(result, ensure_ascii=False), now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE rowid IN "
+                    "(SELECT rowid FROM search_cache ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def log_stats(self):
+        """캐시 적중/미스 통계 기록"""
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0.0
+        program_logger.info(f"검색 캐시 통계: 적중 {self.hits}건, 미스 {self.misses}건 (적중률: {hit_rate:.1f}%)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,303 @@
+import csv
+import glob
+import importlib.util
+import json
+import os
+import time
+from src.logger import program_logger
+from src.records import RESULT_COLUMNS, infer_kind
+
+def _truncate_partial_line(path, terminator=b'\n', chunk_size=64 * 1024):
+    """비정상 종료로 잘린 마지막 줄을 마지막 terminator 뒤에서 잘라내고 잘라낸 바이트 수를 반환"""
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            # 청크 경계에 걸친 terminator도 찾도록 앞 청크와 겹쳐 읽음
+            chunk = f.read(end - start + len(terminator) - 1)
+            index = chunk.rfind(terminator)
+            if index >= 0:
+                keep = start + index + len(terminator)
+                break
+            end = start
+        else:
+            keep = 0
+        if keep < size:
+            f.truncate(keep)
+    return size - keep
+
+class ResultSink:
+    """결과를 도착하는 대로 버퍼에 모았다가 주기적으로 파일에 추가 기록하는 기본 클래스
+
+    columns는 [(이름, 'int' | 'float' | 'str')] 형태의 열 목록으로, CSV 헤더와 Parquet 스키마는
+    첫 행이 아니라 이 목록으로 정함 (처음 기록하는 행들에만 있는 열은 뒤에 추가)
+    """
+
+    def __init__(self, path, columns=RESULT_COLUMNS, flush_every=100, flush_interval=10, resume=False):
+        self.path = path
+        self.columns = list(columns)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.resume = resume
+        self.written = 0
+        self._buffer = []
+        self._last_flush = time.time()
+        self._dropped = set()
+
+        target_dir = os.path.dirname(path)
+        if target_dir and not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def completed_urls(self):
+        """이어하기 모드에서 이미 기록된 결과의 URL 집합"""
+        if not self.resume:
+            return set()
+        urls = self._read_urls()
+        program_logger.info(f"이어하기: {self.path}에서 완료된 결과 {len(urls)}건을 확인했습니다.")
+        return urls
+
+    def write(self, result):
+        self._buffer.append(result)
+        if len(self._buffer) >= self.flush_every or time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+        self._last_flush = time.time()
+
+    def close(self):
+        self.flush()
+        self._close()
+        program_logger.info(f"결과가 저장되었습니다: {self.path} (이번 실행 {self.written}건)")
+
+    def _schema_columns(self, rows):
+        """열 목록 + rows에 처음 나온 목록 밖의 열 (종류는 처음 나온 None이 아닌 값 기준, 모두 None이면 문자열)"""
+        names = {name for name, kind in self.columns}
+        extras = {}
+        for row in rows:
+            for name, value in row.items():
+                if name not in names and extras.get(name) is None:
+                    extras[name] = None if value is None else infer_kind(value)
+        return self.columns + [(name, kind or 'str') for name, kind in extras.items()]
+
+    def _warn_dropped(self, rows, names):
+        """파일에 이미 정해진 열에 없어 기록하지 못하는 열을 열마다 한 번 경고"""
+        dropped = {name for row in rows for name in row} - set(names) - self._dropped
+        if dropped:
+            self._dropped |= dropped
+            program_logger.warning(f"결과 파일 {self.path}의 열에 없어 기록하지 않는 값: {', '.join(sorted(dropped))}")
+
+    def _read_urls(self):
+        raise NotImplementedError
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+class JsonlSink(ResultSink):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        if self.resume:
+            # 잘린 줄 뒤에 이어 쓰면 다음 결과까지 읽을 수 없게 되므로 먼저 잘라냄
+            removed = _truncate_partial_line(path)
+            if removed:
+                program_logger.warning(f"이어하기: {path}의 잘린 마지막 줄({removed}바이트)을 제거했습니다.")
+        self._file = open(path, 'a' if self.resume else 'w', encoding='utf-8')
+
+    def _read_urls(self):
+        urls = set()
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    urls.add(json.loads(line)['URL'])
+                except (ValueError, KeyError):
+                    # 비정상 종료로 잘린 마지막 줄은 무시
+                    continue
+        return urls
+
+    def _write_rows(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+class CsvSink(ResultSink):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self._fieldnames = None
+        if self.resume:
+            # csv 모듈의 행 구분자는 \r\n (본문 안의 줄바꿈은 \n)
+            removed = _truncate_partial_line(path, terminator=b'\r\n')
+            if removed:
+                program_logger.warning(f"이어하기: {path}의 잘린 마지막 행({removed}바이트)을 제거했습니다.")
+        appending = self.resume and os.path.exists(path) and os.path.getsize(path) > 0
+        if appending:
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                self._fieldnames = next(csv.reader(f), None)
+            self._file = open(path, 'a', encoding='utf-8', newline='')
+        else:
+            # 새 파일은 기존 save_results와 같이 엑셀 호환 BOM 포함
+            self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = None
+
+    def _read_urls(self):
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, encoding='utf-8-sig', newline='') as f:
+            return {row['URL'] for row in csv.DictReader(f) if row.get('URL')}
+
+    def _write_rows(self, rows):
+        if self._writer is None:
+            header_written = self._fieldnames is not None
+            # 헤더는 열 목록 기준 (첫 행에 없는 ClusterId 등 선택 열도 포함), 이어하기면 기존 헤더 유지
+            self._fieldnames = self._fieldnames or [name for name, kind in self._schema_columns(rows)]
+            self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames, extrasaction='ignore')
+            if not header_written:
+                self._writer.writeheader()
+        self._warn_dropped(rows, self._fieldnames)
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+class ParquetSink(ResultSink):
+    """path 디렉토리에 part 파일을 만들고 flush마다 row group 하나를 기록"""
+
+    def __init__(self, path, row_groups_per_file=10, **kwargs):
+        try:
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(PARQUET_REQUIRES) from e
+        super().__init__(path, **kwargs)
+
+        self._pq = pyarrow.parquet
+        self.row_groups_per_file = row_groups_per_file
+        if not os.path.exists(path):
+            os.makedirs(path)
+        if not self.resume:
+            for part in glob.glob(os.path.join(path, 'part-*.parquet')):
+                os.remove(part)
+        self._schema = None
+        self._writer = None
+        self._row_groups = 0
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, 'part-*.parquet')))
+
+    def _read_urls(self):
+        urls = set()
+        for part in self._parts():
+            try:
+                table = self._pq.read_table(part, columns=['URL'])
+            except Exception:
+                # footer가 기록되지 않은(비정상 종료된) part 파일은 제외
+                program_logger.warning(f"손상된 Parquet 파일을 건너뜁니다: {part}")
+                os.replace(part, part + '.incomplete')
+                continue
+            urls.update(table.column('URL').to_pylist())
+        return urls
+
+    def _build_schema(self, rows):
+        """이어하기면 기존 part 파일의 스키마, 아니면 열 목록 기준 스키마 (값이 모두 None인 열도 null 타입이 되지 않음)"""
+        import pyarrow
+
+        parts = self._parts()
+        if self.resume and parts:
+            try:
+                return self._pq.read_schema(parts[-1])
+            except Exception:
+                pass
+        types = {'int': pyarrow.int64(), 'float': pyarrow.float64(), 'str': pyarrow.large_string()}
+        return pyarrow.schema([(name, types[kind]) for name, kind in self._schema_columns(rows)])
+
+    def _write_rows(self, rows):
+        import pyarrow
+
+        if self._schema is None:
+            self._schema = self._build_schema(rows)
+        if self._writer is None:
+            part_path = os.path.join(self.path, f'part-{len(self._parts()):05d}.parquet')
+            self._writer = self._pq.ParquetWriter(part_path, self._schema)
+        self._warn_dropped(rows, self._schema.names)
+        table = pyarrow.Table.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(table)
+        self._row_groups += 1
+
+        # 비정상 종료 시 잃는 범위를 줄이기 위해 일정 row group마다 part 파일을 닫음
+        if self._row_groups >= self.row_groups_per_file:
+            self._close()
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._row_groups = 0
+
+SINK_TYPES = {
+    'jsonl': JsonlSink,
+    'csv': CsvSink,
+    'parquet': ParquetSink
+}
+
+PARQUET_REQUIRES = "Parquet 결과 파일에는 pyarrow가 필요합니다. (pip install pyarrow)"
+
+def sink_format(path, format=None):
+    """결과 파일 형식을 확인해 반환, 지원하지 않거나 필요한 패키지가 없으면 ValueError
+
+    실제로 기록하기 전에(검색을 시작하기 전에) 호출해 잘못된 출력 설정을 바로 알리는 용도
+    """
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip('.').lower() or 'parquet'
+    if format not in SINK_TYPES:
+        raise ValueError(f"지원하지 않는 결과 형식입니다: {format}")
+    if format == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        raise ValueError(PARQUET_REQUIRES)
+    return format
+
+def open_sink(path, format=None, **kwargs):
+    """확장자(또는 format)에 맞는 결과 sink 생성"""
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip('.').lower() or 'parquet'
+    if format not in SINK_TYPES:
+        raise ValueError(f"지원하지 않는 결과 형식입니다: {format}")
+    return SINK_TYPES[format](path, **kwargs)
+
+def read_rows(path, format=None):
+    """open_sink로 기록한 결과 파일의 행을 dict로 반환하는 제너레이터 (CSV 값은 문자열)"""
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip('.').lower() or 'parquet'
+    if format == 'jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    elif format == 'csv':
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+    elif format == 'parquet':
+        import pyarrow.parquet
+
+        for part in sorted(glob.glob(os.path.join(path, 'part-*.parquet'))):
+            yield from pyarrow.parquet.read_table(part).to_pylist()
+    else:
+        raise ValueError(f"지원하지 않는 결과 형식입니다: {format}")
@@ -0,0 +1,64 @@
+import json
+import urllib3
+from urllib3.util.retry import Retry
+
+# 재시도 대상 상태코드 (요청 한도 초과 + 서버 오류)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class TransportResponse:
+    def __init__(self, status, data, headers=None, url=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+        # 리다이렉트를 따라간 최종 URL
+        self.url = url
+
+    def json(self):
+        return json.loads(self.data.decode('utf-8'))
+
+class HttpTransport:
+    def __init__(self, connect_timeout=3, read_timeout=10, retries=3, backoff_factor=0.5, pool_maxsize=8, headers=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.headers = headers or {}
+        self._pool = None
+
+    def __getstate__(self):
+        # 커넥션 풀은 프로세스 간에 공유할 수 없으므로 프로세스마다 새로 생성
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = urllib3.PoolManager(
+                maxsize=self.pool_maxsize,
+                block=True,
+                headers={'Accept-Encoding': 'gzip', 'Connection': 'keep-alive', **self.headers},
+                timeout=urllib3.Timeout(connect=self.connect_timeout, read=self.read_timeout),
+                retries=Retry(
+                    total=self.retries,
+                    backoff_factor=self.backoff_factor,
+                    status_forcelist=RETRY_STATUS_CODES,
+                    allowed_methods=frozenset(['GET']),
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+            )
+        return self._pool
+
+    def get(self, url, headers=None):
+        """GET 요청 (keep-alive 커넥션 재사용, gzip 응답 자동 해제)"""
+        # 요청별 헤더를 넘기면 기본 헤더가 대체되므로 병합해서 전달
+        merged_headers = {**self.pool.headers, **(headers or {})}
+        response = self.pool.request('GET', url, headers=merged_headers)
+        return TransportResponse(response.status, response.data, dict(response.headers), response.geturl() or url)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.clear()
+            self._pool = None
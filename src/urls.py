@@ -0,0 +1,39 @@
+import re
+from urllib.parse import urlparse, parse_qs
+
+MOBILE_BLOG_BASE_URL = "https://m.blog.naver.com"
+# 게시글의 공감 수는 페이지 로드 후 스크립트가 이 API에서 받아 채움
+LIKE_API_URL = "https://apis.naver.com/blogserver/like/v1/search/contents"
+
+_PATH_PATTERN = re.compile(r'^/([A-Za-z0-9_-]+)/(\d+)/?$')
+
+def parse_post_id(blog_url):
+    """블로그 URL에서 (blogId, logNo)를 추출, 인식할 수 없으면 None"""
+    parsed = urlparse(blog_url)
+    query = parse_qs(parsed.query)
+    if 'blogId' in query and 'logNo' in query:
+        return query['blogId'][0], query['logNo'][0]
+
+    match = _PATH_PATTERN.match(parsed.path)
+    if match:
+        return match.group(1), match.group(2)
+    return None
+
+def mobile_post_view_url(blog_id, log_no, base_url=MOBILE_BLOG_BASE_URL):
+    """모바일 PostView 페이지 URL 생성"""
+    return f"{base_url}/PostView.naver?blogId={blog_id}&logNo={log_no}"
+
+def like_api_url(blog_id, log_no, base_url=LIKE_API_URL):
+    """게시글 하나의 공감(반응) 수를 조회하는 API URL 생성"""
+    return f"{base_url}?suppress_response_codes=true&pool=blogid&q=BLOG%5B{blog_id}_{log_no}%5D"
+
+def to_mobile_url(blog_url):
+    """블로그 URL을 모바일 도메인 URL로 변환"""
+    return blog_url if 'm.blog.naver.com' in blog_url else blog_url.replace('blog.naver.com', 'm.blog.naver.com')
+
+def post_key(blog_url):
+    """blog.naver.com / m.blog.naver.com 등 주소 형태와 무관한 게시글 식별자 'blogId/logNo'"""
+    post_id = parse_post_id(blog_url)
+    if post_id is None:
+        return to_mobile_url(blog_url).split('#')[0].rstrip('/')
+    return f"{post_id[0]}/{post_id[1]}"
@@ -0,0 +1,239 @@
+import ctypes
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from src.logger import crawler_logger
+from src.metrics import metrics
+from src.failures import DeadlineExceeded
+
+# 기한을 확인하는 간격 (초)
+CHECK_INTERVAL = 0.5
+# 좀비 브라우저 프로세스를 수거하는 간격 (초)
+REAP_INTERVAL = 10.0
+# 좀비로 남은 자식 중 수거할 프로세스 이름 (chromedriver, chrome, chrome_crashpad_handler 등)
+BROWSER_PROCESS_MARKER = 'chrom'
+
+_PR_SET_CHILD_SUBREAPER = 36
+
+def _children_map():
+    """/proc 기준 {부모 pid: [자식 pid]}, /proc가 없으면 빈 dict"""
+    children = {}
+    try:
+        pids = [int(name) for name in os.listdir('/proc') if name.isdigit()]
+    except OSError:
+        return children
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                # comm에 공백/괄호가 들어갈 수 있으므로 마지막 ')' 뒤에서 상태와 ppid를 읽음
+                fields = f.read().rsplit(b')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(pid)
+    return children
+
+def _process_tree(pid):
+    """pid와 모든 자손 pid (자손부터)"""
+    children = _children_map()
+    tree = []
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return list(reversed(tree))
+
+def kill_process_tree(pid):
+    """pid와 그 자손 프로세스를 모두 강제 종료하고 종료한 프로세스 수를 반환"""
+    if os.name == 'nt':
+        result = subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+        return 1 if result.returncode == 0 else 0
+    killed = 0
+    for target in _process_tree(pid):
+        try:
+            os.kill(target, signal.SIGKILL)
+            killed += 1
+        except OSError:
+            continue
+    return killed
+
+def reap_browser_zombies():
+    """이 프로세스의 자식 중 좀비가 된 브라우저 프로세스를 수거하고 수거한 수를 반환
+
+    다른 자식(Pool 워커 등)의 종료 상태를 가로채지 않도록 이름이 브라우저인 좀비만 수거
+    """
+    reaped = 0
+    for pid in _children_map().get(os.getpid(), []):
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                comm, rest = f.read().split(b' (', 1)[1].rsplit(b')', 1)
+            if rest.split()[0] != b'Z' or BROWSER_PROCESS_MARKER.encode() not in comm.lower():
+                continue
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                reaped += 1
+        except (OSError, IndexError, ValueError):
+            continue
+    return reaped
+
+def _become_subreaper():
+    """chromedriver가 죽어 고아가 된 Chrome 프로세스가 init 대신 이 프로세스에 붙도록 설정 (Linux)
+
+    컨테이너의 PID 1이 자식을 수거하지 않는 환경에서도 좀비가 쌓이지 않도록 직접 수거하기 위함
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        return ctypes.CDLL(None, use_errno=True).prctl(_PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0) == 0
+    except (OSError, AttributeError):
+        return False
+
+class Deadline:
+    """게시글 하나의 처리 기한과 그동안 사용한 chromedriver 서비스 목록"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.services = []
+        self.expired = False
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @contextmanager
+    def paused(self):
+        """블록 안의 의도된 대기(속도 제한 등)는 처리 시간에 넣지 않음"""
+        remaining = self.remaining()
+        self.expires_at = float('inf')
+        try:
+            yield
+        finally:
+            self.expires_at = time.monotonic() + remaining
+
+class BrowserWatchdog:
+    """게시글별 처리 기한을 감시하다가 기한을 넘긴 chromedriver/Chrome 프로세스 트리를 종료
+
+    브라우저가 죽으면 멈춰 있던 WebDriver 호출이 연결 오류로 바로 끝나므로 워커 프로세스/스레드는
+    살아남아 다음 게시글을 처리하고, 죽은 드라이버는 DriverPool의 상태 점검에서 교체됨.
+    감시 스레드는 프로세스마다 처음 기한을 설정할 때 시작 (fork된 워커는 각자 다시 시작)
+    """
+
+    def __init__(self, interval=CHECK_INTERVAL, reap_interval=REAP_INTERVAL):
+        self.interval = interval
+        self.reap_interval = reap_interval
+        self._pid = None
+        self._local = threading.local()
+        self._start_lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            # fork된 워커에는 감시 스레드가 없으므로 처음 기한을 설정할 때 다시 시작
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._pid = None
+        self._local = threading.local()
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._lock = threading.Lock()
+            self._active = {}
+            _become_subreaper()
+            thread = threading.Thread(target=self._run, name='browser-watchdog', daemon=True)
+            thread.start()
+            self._pid = os.getpid()
+
+    @contextmanager
+    def deadline(self, seconds):
+        """이 블록 안의 브라우저 실행/탐색/추출을 seconds초로 제한"""
+        self._ensure_started()
+        deadline = Deadline(seconds)
+        self._local.deadline = deadline
+        with self._lock:
+            self._active[id(deadline)] = deadline
+        try:
+            yield deadline
+        finally:
+            with self._lock:
+                self._active.pop(id(deadline), None)
+            self._local.deadline = None
+
+    def current(self):
+        return getattr(self._local, 'deadline', None)
+
+    def watch(self, service):
+        """현재 기한이 지나면 종료할 chromedriver 서비스를 등록 (기한이 없으면 무시)"""
+        deadline = self.current()
+        if deadline is not None and service is not None and service not in deadline.services:
+            deadline.services.append(service)
+
+    @contextmanager
+    def paused(self):
+        """현재 기한이 있으면 블록 안의 시간은 기한에 넣지 않음"""
+        deadline = self.current()
+        if deadline is None:
+            yield
+            return
+        with deadline.paused():
+            yield
+
+    def remaining(self):
+        """현재 기한까지 남은 시간(초), 기한이 없으면 None"""
+        deadline = self.current()
+        return deadline.remaining() if deadline is not None else None
+
+    def expired(self):
+        deadline = self.current()
+        return deadline is not None and deadline.expired
+
+    def check(self):
+        """현재 기한이 지났으면 DeadlineExceeded"""
+        deadline = self.current()
+        if deadline is not None and (deadline.expired or deadline.remaining() <= 0):
+            raise DeadlineExceeded(f"게시글 처리 시간 {deadline.seconds:.0f}초를 넘었습니다.")
+
+    def _run(self):
+        last_reap = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                overdue = [
+                    deadline for deadline in self._active.values()
+                    if not deadline.expired and deadline.expires_at <= now
+                ]
+                for deadline in overdue:
+                    deadline.expired = True
+            for deadline in overdue:
+                self._kill(deadline)
+            if now - last_reap >= self.reap_interval:
+                last_reap = now
+                reaped = reap_browser_zombies()
+                if reaped:
+                    metrics.inc('browser_zombies_reaped_total', reaped)
+
+    def _kill(self, deadline):
+        metrics.inc('deadline_exceeded_total')
+        for service in deadline.services:
+            process = getattr(service, 'process', None)
+            if process is None or process.poll() is not None:
+                continue
+            killed = kill_process_tree(process.pid)
+            crawler_logger.warning(
+                f"처리 기한 {deadline.seconds:.0f}초 초과: 브라우저 프로세스 {killed}개 종료 (chromedriver pid {process.pid})",
+                extra={'stage': 'watchdog', 'status': 'killed'}
+            )
+            metrics.inc('browser_killed_total')
+            try:
+                process.wait(timeout=5)
+            except Exception:
+                pass
+
+# 프로세스 전역 감시자
+watchdog = BrowserWatchdog()
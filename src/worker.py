@@ -0,0 +1,178 @@
+import argparse
+import collections
+import os
+import socket
+import sys
+import threading
+import time
+from src.logger import program_logger
+from src.crawler import NaverBlogCrawler, FETCH_MODES
+from src.executor import create_backend, BACKENDS
+from src.frontier import open_frontier, FRONTIER_TYPES
+from src.metrics import metrics
+from src.failures import CrawlFailure, backoff_delay
+from src.processor import BlogProcessor
+from src.planner import QueryPlanner
+from src.sinks import open_sink
+from src.urls import post_key
+
+class FrontierFeeder:
+    """프론티어에서 작업을 임대해 실행 백엔드에 공급하고, 처리 중인 임대를 URL 기준으로 보관
+
+    처리 중인 작업 수를 max_in_flight로 제한해 Pool처럼 입력을 미리 소비하는 백엔드도
+    임대 기한 안에 처리할 수 있는 만큼만 가져가도록 함. 더 임대할 작업이 없으면 반복을 끝내므로
+    입력을 소비자 스레드에서 꺼내는 백엔드도 처리 중인 결과를 받아 갈 수 있음
+    """
+
+    def __init__(self, frontier, worker_id, max_in_flight, lease_size=8):
+        self.frontier = frontier
+        self.worker_id = worker_id
+        self.max_in_flight = max_in_flight
+        self.lease_size = lease_size
+        self._leases = {}
+        self._ready = collections.deque()
+        self._condition = threading.Condition()
+
+    def fill(self):
+        """처리 중인 작업 수 한도 안에서 작업을 임대해 대기열에 추가하고 임대한 건수를 반환"""
+        with self._condition:
+            while len(self._leases) >= self.max_in_flight:
+                self._condition.wait()
+            room = self.max_in_flight - len(self._leases)
+        leases = self.frontier.lease(self.worker_id, min(room, self.lease_size))
+        with self._condition:
+            for lease in leases:
+                self._leases[lease.key] = lease
+        self._ready.extend(leases)
+        return len(leases)
+
+    def __iter__(self):
+        while self._ready or self.fill():
+            yield self._ready.popleft().item
+
+    def take(self, blog_url):
+        """처리가 끝난 작업의 임대를 꺼냄"""
+        with self._condition:
+            lease = self._leases.pop(post_key(blog_url), None)
+            self._condition.notify_all()
+        return lease
+
+def run_worker(frontier, processor, sink, worker_id=None, lease_size=8, idle_timeout=60, poll_interval=5):
+    """프론티어가 빌 때까지 작업을 임대해 크롤링하고, 완료가 받아들여진 결과만 sink에 기록
+
+    임대할 작업이 없는 상태가 idle_timeout초 이어지면 종료
+    (다른 워커가 죽어 기한이 지난 임대나 재시도 대기 작업이 생길 수 있으므로 바로 끝내지 않음)
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    backend = processor.backend or create_backend('process')
+    processor.backend = backend
+    # process 백엔드는 result_batch_size개씩 묶어 워커에 넘기므로 워커마다 두 묶음씩 처리 중일 수 있게 함
+    batch_size = processor.result_batch_size if backend.uses_processes else 1
+    feeder = FrontierFeeder(frontier, worker_id, max_in_flight=backend.max_workers * batch_size * 2, lease_size=lease_size)
+    program_logger.info(f"워커 시작: {worker_id} (동시 실행 {backend.max_workers}, 임대 기한 {frontier.lease_timeout}초)")
+
+    stats = {'completed': 0, 'retried': 0, 'failed': 0, 'discarded': 0}
+    idle_since = None
+    # 채우기마다 iter_results를 다시 호출하므로 워커 프로세스와 브라우저는 실행 내내 유지
+    with processor.session():
+        while True:
+            if not feeder.fill():
+                if idle_since is None:
+                    idle_since = time.time()
+                elif time.time() - idle_since >= idle_timeout:
+                    break
+                time.sleep(poll_interval)
+                continue
+            idle_since = None
+
+            for blog_url, result in processor.iter_results(feeder):
+                lease = feeder.take(blog_url)
+                if lease is None:
+                    continue
+                if not result:
+                    # 삭제/비공개 게시글은 바로 실패 처리하고, 나머지는 지수 백오프 후 다른 워커도 가져갈 수 있게 반환
+                    retryable = not isinstance(result, CrawlFailure) or result.retryable
+                    if frontier.fail(lease, retry_delay=backoff_delay(lease.attempts), retryable=retryable):
+                        stats['retried'] += 1
+                    else:
+                        stats['failed'] += 1
+                    continue
+                # 임대 기한이 지나 다른 워커에 재배정된 작업은 결과를 버려 한 번만 완료되도록 함
+                if not frontier.complete(lease):
+                    program_logger.warning(f"임대가 만료되어 결과를 버립니다: {blog_url}", extra={'url': blog_url, 'stage': 'frontier'})
+                    metrics.inc('frontier_discarded_total')
+                    stats['discarded'] += 1
+                    continue
+                with metrics.span('write'):
+                    sink.write(result)
+                stats['completed'] += 1
+
+    program_logger.info(
+        f"워커 종료: {worker_id} 완료 {stats['completed']}건, 재시도 대기 {stats['retried']}건, "
+        f"실패 {stats['failed']}건, 만료로 버림 {stats['discarded']}건"
+    )
+    metrics.log_summary(program_logger)
+    return stats
+
+def seed_frontier(frontier, api, keywords, **search_options):
+    """키워드별 검색 결과를 게시글 기준으로 합쳐 우선순위와 함께 프론티어에 추가하고 새로 추가된 건수를 반환"""
+    return frontier.add(QueryPlanner(api).plan(keywords, **search_options))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='공유 프론티어에서 작업을 임대해 크롤링하는 워커')
+    parser.add_argument('--frontier', default='cache/frontier.sqlite3', help='프론티어 위치')
+    parser.add_argument('--frontier-kind', default='sqlite', choices=sorted(FRONTIER_TYPES))
+    parser.add_argument('--lease-timeout', type=float, default=300, help='임대 기한 (초)')
+    parser.add_argument('--max-attempts', type=int, default=3, help='작업당 최대 시도 횟수')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed = subparsers.add_parser('seed', help='검색 결과를 프론티어에 추가 (NAVER_CLIENT_ID, NAVER_CLIENT_SECRET 환경변수 필요)')
+    seed.add_argument('keywords', nargs='+')
+    seed.add_argument('--max-results', type=int, default=1099)
+
+    run = subparsers.add_parser('run', help='프론티어가 빌 때까지 크롤링')
+    run.add_argument('--output', help='결과 파일 (기본: results/worker-<호스트>-<pid>.jsonl)')
+    run.add_argument('--worker-id', help='임대 소유자 이름 (기본: <호스트>-<pid>)')
+    run.add_argument('--fetch-mode', default='selenium', choices=FETCH_MODES)
+    run.add_argument('--lean', action='store_true', help='lean 로딩 모드 사용')
+    run.add_argument('--backend', default='process', choices=sorted(BACKENDS))
+    run.add_argument('--workers', type=int, help='동시 실행 수 (기본: 메모리 예산 기준)')
+    run.add_argument('--autoscale', action='store_true', help='처리량과 실패율에 따라 동시 실행 수 자동 조정 (thread/async 백엔드)')
+    run.add_argument('--post-deadline', type=float, default=60, help='게시글당 최대 처리 시간 (초, 0이면 제한 없음)')
+    run.add_argument('--lease-size', type=int, default=8, help='한 번에 임대하는 작업 수')
+    run.add_argument('--idle-timeout', type=float, default=60, help='작업이 없을 때 종료까지 대기 (초)')
+    args = parser.parse_args(argv)
+    if getattr(args, 'autoscale', False) and args.backend == 'process':
+        parser.error('--autoscale은 thread/async 백엔드에서만 사용할 수 있습니다.')
+
+    frontier = open_frontier(
+        args.frontier, kind=args.frontier_kind,
+        lease_timeout=args.lease_timeout, max_attempts=args.max_attempts
+    )
+    try:
+        if args.command == 'seed':
+            from src.api import NaverBlogAPI
+            from src.search_cache import SearchCache
+
+            client_id = os.environ.get('NAVER_CLIENT_ID')
+            client_secret = os.environ.get('NAVER_CLIENT_SECRET')
+            if not client_id or not client_secret:
+                parser.error('NAVER_CLIENT_ID, NAVER_CLIENT_SECRET 환경변수를 설정하세요.')
+            api = NaverBlogAPI(client_id, client_secret, cache=SearchCache())
+            added = seed_frontier(frontier, api, args.keywords, max_results=args.max_results)
+            print(f"프론티어에 {added}건을 추가했습니다: {frontier.stats()}")
+            return 0
+
+        worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        output = args.output or os.path.join('results', f'worker-{worker_id}.jsonl')
+        crawler = NaverBlogCrawler(fetch_mode=args.fetch_mode, lean=args.lean, post_deadline=args.post_deadline or None)
+        processor = BlogProcessor(crawler, backend=create_backend(args.backend, workers=args.workers, autoscale=args.autoscale))
+        with open_sink(output, resume=True) as sink:
+            stats = run_worker(frontier, processor, sink, worker_id=worker_id, lease_size=args.lease_size, idle_timeout=args.idle_timeout)
+        print(f"워커 종료: {stats} → {output}")
+        return 0
+    finally:
+        frontier.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import os
+import pytest
+from lxml import html
+from src.extraction import FieldSpec
+from src.fast_path import CompiledSpec, _element_text
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bench', 'fixtures')
+
+class FakeElement:
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        return _element_text(self.node)
+
+class FakeDriver:
+    """브라우저 없이 HTML 한 장으로 Selenium 경로를 실행하는 WebDriver 대역
+
+    추출 스크립트는 같은 스펙을 lxml로 평가하고, 셀렉터 대기는 find_element로 처리
+    """
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+        self.current_url = 'about:blank'
+        self.tree = html.fromstring(page_source)
+        self.quit_calls = 0
+
+    def get(self, url):
+        self.current_url = url
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def find_elements(self, by, value):
+        nodes = self.tree.cssselect(value) if by == 'css selector' else self.tree.xpath(f'//{value}')
+        # lxml 요소는 자식이 없으면 거짓이므로 WebDriverWait가 찾은 것으로 보도록 감쌈
+        return [FakeElement(node) for node in nodes]
+
+    def find_element(self, by, value):
+        from selenium.common.exceptions import NoSuchElementException
+
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(value)
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        if args:
+            spec = [FieldSpec(field['name'], field['selectors'], field['reducer']) for field in args[0]]
+            return CompiledSpec(spec).collect(self.tree)
+        if 'innerText' in script:
+            return _element_text(self.tree.body)
+        return 1
+
+    def quit(self):
+        self.quit_calls += 1
+
+def fixture_page(layout='se_main_container', paragraph='블로그 본문입니다. ', likes='37', comments='5'):
+    with open(os.path.join(FIXTURE_DIR, f'{layout}.html'), encoding='utf-8') as f:
+        page = f.read()
+    values = {'{title}': '제목', '{blog_id}': 'someone', '{paragraph}': paragraph * 20, '{likes}': likes, '{comments}': comments}
+    for key, value in values.items():
+        page = page.replace(key, value)
+    return page
+
+@pytest.fixture
+def fake_driver():
+    return FakeDriver
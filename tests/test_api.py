@@ -0,0 +1,41 @@
+import json
+from urllib.parse import urlparse, parse_qs
+from src.api import NaverBlogAPI, MAX_DISPLAY, MAX_START
+
+class _Response:
+    def __init__(self, data, status=200):
+        self.status = status
+        self.data = data
+
+    def json(self):
+        return json.loads(self.data.decode('utf-8'))
+
+class FakeSearchTransport:
+    """total건의 결과를 start/display에 맞게 잘라 주는 검색 API 대역 (start 1000 초과는 거부)"""
+
+    def __init__(self, total):
+        self.total = total
+
+    def get(self, url, headers=None):
+        query = parse_qs(urlparse(url).query)
+        start, display = int(query['start'][0]), int(query['display'][0])
+        if start > MAX_START or display > MAX_DISPLAY:
+            return _Response(b'{"errorCode": "SE02"}', status=400)
+        items = [{'link': f'https://blog.naver.com/someone/{index}'} for index in range(start, min(start + display, self.total + 1))]
+        return _Response(json.dumps({'total': self.total, 'items': items}).encode('utf-8'))
+
+def _links(total, **kwargs):
+    api = NaverBlogAPI('id', 'secret', transport=FakeSearchTransport(total))
+    return [item['link'] for item in api.iter_search('맛집', **kwargs)]
+
+def test_default_limit_reaches_the_last_page():
+    links = _links(5000)
+    assert len(links) == MAX_START + MAX_DISPLAY - 1
+    assert sorted(links) == sorted(f'https://blog.naver.com/someone/{index}' for index in range(1, 1100))
+
+def test_last_page_with_small_display_does_not_repeat_items():
+    links = _links(5000, max_results=1050, display=30)
+    assert len(links) == len(set(links)) == 1050
+
+def test_limit_follows_total():
+    assert len(_links(120)) == 120
@@ -0,0 +1,41 @@
+from conftest import FakeDriver, fixture_page
+from src.crawler import NaverBlogCrawler, ENGAGEMENT_WAIT_SELECTOR
+
+URL = 'https://blog.naver.com/someone/223000000001'
+
+class FillingDriver(FakeDriver):
+    """공감 수 자리는 처음부터 있고, 숫자는 몇 번 확인한 뒤에야 스크립트가 채우는 페이지"""
+
+    def __init__(self, page_source, likes, fill_after):
+        super().__init__(page_source)
+        self.likes = likes
+        self.fill_after = fill_after
+        self.counter_checks = 0
+
+    def find_elements(self, by, value):
+        if value == ENGAGEMENT_WAIT_SELECTOR:
+            self.counter_checks += 1
+            if self.counter_checks > self.fill_after:
+                for node in self.tree.cssselect(value):
+                    node.text = self.likes
+        return super().find_elements(by, value)
+
+class _Crawler(NaverBlogCrawler):
+    def __init__(self, driver, **kwargs):
+        super().__init__(**kwargs)
+        self.driver = driver
+
+    def setup_driver(self):
+        return self.driver
+
+def test_lean_mode_waits_until_the_like_counter_is_filled():
+    driver = FillingDriver(fixture_page(likes=''), likes='37', fill_after=1)
+    result = _Crawler(driver, lean=True).get_blog_info(URL)
+    assert result['LikeCount'] == 37
+    assert driver.counter_checks == 2
+
+def test_lean_mode_gives_up_on_a_counter_that_never_fills():
+    driver = FillingDriver(fixture_page(likes=''), likes='37', fill_after=100)
+    result = _Crawler(driver, lean=True).get_blog_info(URL)
+    assert result['Content']
+    assert result['LikeCount'] is None
@@ -0,0 +1,46 @@
+from conftest import FakeDriver, fixture_page
+from src.crawler import NaverBlogCrawler
+from src.dedup import NearDuplicateIndex
+from src.urls import post_key
+
+URL = 'https://blog.naver.com/someone/223000000001'
+COPY_URL = 'https://blog.naver.com/copycat/223000000002'
+
+class _Crawler(NaverBlogCrawler):
+    def __init__(self, page, **kwargs):
+        super().__init__(**kwargs)
+        self.page = page
+
+    def setup_driver(self):
+        return FakeDriver(self.page)
+
+def test_find_excludes_the_post_itself(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / 'dedup.sqlite3'))
+    content = '강남역 근처 새로 생긴 식당 후기입니다. ' * 20
+    index.tag({'URL': URL, 'Content': content})
+
+    assert index.find(content, exclude_key=post_key(URL)) is None
+    # 다른 게시글에서 같은 본문을 찾으면 원본을 돌려줌
+    assert index.find(content, exclude_key=post_key(COPY_URL)) == (post_key(URL), post_key(URL))
+    index.close()
+
+def test_recrawl_of_indexed_post_keeps_detail_fields(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / 'dedup.sqlite3'))
+    crawler = _Crawler(fixture_page(likes='37', comments='5'), duplicate_index=index)
+
+    first = crawler.get_blog_info(URL)
+    assert first['LikeCount'] == 37
+    index.tag(first)
+
+    again = crawler.get_blog_info(URL)
+    assert again['LikeCount'] == 37
+    assert again['CommentCount'] == 5
+    assert again['ImageCount'] == 3
+    assert index.tag(again)['DuplicateOf'] is None
+
+    # 다른 주소의 복사본은 상세 필드 추출을 생략하고 중복으로 표시
+    copy = crawler.get_blog_info(COPY_URL)
+    assert copy['Content'] == first['Content']
+    assert copy['LikeCount'] is None
+    assert index.tag(copy)['DuplicateOf'] == post_key(URL)
+    index.close()
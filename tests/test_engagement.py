@@ -0,0 +1,83 @@
+import json
+from conftest import fixture_page
+from src.engagement import EngagementFetcher, EngagementTracker, MIN_INTERVAL
+
+URL = 'https://blog.naver.com/someone/223000000001'
+DAY = 24 * 60 * 60
+
+class _Response:
+    def __init__(self, url, data, status=200):
+        self.url = url
+        self.status = status
+        self.data = data
+
+class FakeTransport:
+    """게시글 페이지와 공감 API 응답을 돌려주는 HTTP 대역 (likes가 None이면 공감 API 오류)"""
+
+    def __init__(self, page, likes=None):
+        self.page = page
+        self.likes = likes
+
+    def get(self, url, **kwargs):
+        if 'like' in url:
+            if self.likes is None:
+                return _Response(url, b'', status=500)
+            body = {'contents': [{'contentsId': 'someone_223000000001', 'reactions': [{'reactionType': 'like', 'count': self.likes}]}]}
+            return _Response(url, json.dumps(body).encode('utf-8'))
+        return _Response(url, self.page.encode('utf-8'))
+
+def _tracker(tmp_path, now):
+    tracker = EngagementTracker(str(tmp_path / 'engagement.sqlite3'))
+    tracker.add(URL, published_at=now - 30 * DAY, like_count=37, comment_count=5, now=now)
+    return tracker
+
+def test_fetcher_reports_script_filled_counter_as_unknown():
+    fetcher = EngagementFetcher(transport=FakeTransport(fixture_page(likes='', comments='5')))
+    assert fetcher.get_engagement(URL) == {'LikeCount': None, 'CommentCount': 5}
+
+def test_script_filled_likes_are_tracked_through_the_like_api(tmp_path):
+    now = 1_700_000_000
+    tracker = _tracker(tmp_path, now)
+    transport = FakeTransport(fixture_page(likes='', comments='5'), likes=37)
+    fetcher = EngagementFetcher(transport=transport)
+
+    assert tracker.record(URL, fetcher.get_engagement(URL), now=now + 1)['LikeDelta'] == 0
+    transport.likes = 42
+    sample = tracker.record(URL, fetcher.get_engagement(URL), now=now + 2)
+    assert sample['LikeCount'] == 42
+    assert sample['LikeDelta'] == 5
+    assert sample['CommentDelta'] == 0
+    tracker.close()
+
+def test_unknown_counter_keeps_previous_value_and_is_not_a_change(tmp_path):
+    now = 1_700_000_000
+    tracker = _tracker(tmp_path, now)
+    interval = MIN_INTERVAL * 8
+    tracker._conn.execute("UPDATE engagement SET interval=?", (interval,))
+
+    sample = tracker.record(URL, {'LikeCount': None, 'CommentCount': 5}, now=now + 1)
+    assert sample['LikeCount'] is None
+    assert sample['LikeDelta'] is None
+    assert sample['CommentDelta'] == 0
+    # 변화가 없으므로 주기는 줄지 않고 늘어남
+    stored = tracker._conn.execute("SELECT interval, like_count FROM engagement").fetchone()
+    assert stored == (interval * 2, 37)
+
+    # 다시 읽힌 값은 마지막으로 알던 값과 비교
+    sample = tracker.record(URL, {'LikeCount': 40, 'CommentCount': 5}, now=now + 2)
+    assert sample['LikeDelta'] == 3
+    assert tracker._conn.execute("SELECT interval FROM engagement").fetchone()[0] == interval
+    tracker.close()
+
+def test_first_poll_without_any_counter_is_not_a_change(tmp_path):
+    now = 1_700_000_000
+    tracker = EngagementTracker(str(tmp_path / 'engagement.sqlite3'))
+    tracker.add(URL, published_at=now - 30 * DAY, now=now)
+    before = tracker._conn.execute("SELECT interval FROM engagement").fetchone()[0]
+
+    sample = tracker.record(URL, {'LikeCount': None, 'CommentCount': None}, now=now + 1)
+    assert sample['LikeDelta'] is None and sample['CommentDelta'] is None
+    after = tracker._conn.execute("SELECT interval, like_count, comment_count FROM engagement").fetchone()
+    assert after[0] >= before
+    assert after[1:] == (None, None)
+    tracker.close()
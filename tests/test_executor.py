@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+from src.executor import AsyncBackend, Autoscaler, ProcessBackend, ThreadBackend, create_backend
+
+def _slow_square(value):
+    time.sleep(0.01)
+    return value * value
+
+def _pid(value):
+    time.sleep(0.01)
+    return os.getpid()
+
+def _loop_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'crawl-asyncio']
+
+def test_async_backend_yields_every_result():
+    results = AsyncBackend(4).map_unordered(_slow_square, range(20))
+    assert sorted(results) == [value * value for value in range(20)]
+    assert not _loop_threads()
+
+def test_async_backend_stops_when_consumer_stops_early():
+    pulled = []
+
+    def items():
+        for value in range(1000):
+            pulled.append(value)
+            yield value
+
+    results = AsyncBackend(2).map_unordered(_slow_square, items())
+    assert next(results) in (0, 1, 4)
+    results.close()
+
+    # 결과 큐가 가득 차 루프 스레드가 멈춰 있지 않고, 남은 입력도 더 꺼내지 않음
+    assert not _loop_threads()
+    assert len(pulled) < 20
+
+def test_async_backend_stops_when_consumer_raises():
+    results = AsyncBackend(2).map_unordered(_slow_square, range(1000))
+    try:
+        for value in results:
+            raise RuntimeError(value)
+    except RuntimeError:
+        pass
+    finally:
+        results.close()
+    assert not _loop_threads()
+
+def test_persistent_process_backend_reuses_workers():
+    backend = ProcessBackend(2)
+    with backend.persistent():
+        first = set(backend.map_unordered(_pid, range(8)))
+        second = set(backend.map_unordered(_pid, range(8)))
+        assert backend._pool is not None
+    assert len(first | second) <= 2
+    assert backend._pool is None
+
+def test_process_backend_closes_pool_without_persistent():
+    backend = ProcessBackend(2)
+    assert len(list(backend.map_unordered(_pid, range(4)))) == 4
+    assert backend._pool is None
+
+def test_autoscaler_grows_first_and_backs_off_on_failures():
+    autoscaler = Autoscaler(min_workers=1, max_workers=4, interval=0)
+    autoscaler.record(True)
+    assert autoscaler.next_limit(2) == 3
+    for _ in range(3):
+        autoscaler.record(False)
+    assert autoscaler.next_limit(3) == 2
+    # 관측이 없는 구간에는 그대로 유지
+    assert autoscaler.next_limit(2) == 2
+
+def test_create_backend_attaches_autoscaler():
+    backend = create_backend('thread', workers=2, autoscale=True)
+    assert isinstance(backend, ThreadBackend)
+    assert backend.autoscaler is not None and backend.limit == 2
+    assert create_backend('thread', workers=2).autoscaler is None
@@ -0,0 +1,104 @@
+import pytest
+import src.circuit_breaker as circuit_breaker_module
+import src.failures as failures_module
+from src.circuit_breaker import CircuitBreaker
+from src.failures import (
+    CrawlFailure, RetryQueue, backoff_delay, classify_error, PostUnavailable, RateLimited, DeadlineExceeded,
+    FAILURE_TRANSIENT, FAILURE_RATE_LIMITED, FAILURE_GONE, FAILURE_BROWSER
+)
+
+URL = 'https://blog.naver.com/someone/223000000001'
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(failures_module, 'time', clock)
+    monkeypatch.setattr(circuit_breaker_module, 'time', clock)
+    return clock
+
+def _item(url=URL):
+    return {'link': url, 'title': '제목', 'postdate': '20240314'}
+
+def test_errors_are_classified_by_kind():
+    assert classify_error(PostUnavailable()) == FAILURE_GONE
+    assert classify_error(RateLimited()) == FAILURE_RATE_LIMITED
+    assert classify_error(DeadlineExceeded()) == FAILURE_TRANSIENT
+    assert classify_error(RuntimeError('chrome not reachable')) == FAILURE_BROWSER
+
+def test_backoff_delay_is_bounded_full_jitter(monkeypatch):
+    monkeypatch.setattr(failures_module.random, 'uniform', lambda low, high: high)
+    assert [backoff_delay(attempt, base_delay=2, max_delay=10) for attempt in range(4)] == [2, 4, 8, 10]
+    monkeypatch.setattr(failures_module.random, 'uniform', lambda low, high: low)
+    assert backoff_delay(3) == 0
+
+def test_retry_queue_backs_off_and_stops_after_max_retries(clock, monkeypatch):
+    monkeypatch.setattr(failures_module.random, 'uniform', lambda low, high: high)
+    retries = RetryQueue(max_retries=2, base_delay=2)
+    failure = CrawlFailure(URL, FAILURE_TRANSIENT, 'TimeoutException')
+
+    assert retries.schedule(_item(), failure)
+    assert retries.pop_due() == []
+    assert retries.wait_due() == [_item()]
+    assert clock.slept == [2]
+
+    # 두 번째 재시도는 두 배로 기다리고, 그 뒤에는 더 받지 않음
+    assert retries.schedule(_item(), failure)
+    assert retries.wait_due() == [_item()]
+    assert clock.slept == [2, 4]
+    assert not retries.schedule(_item(), failure)
+    assert retries.attempts(URL) == 2
+
+def test_retry_queue_rejects_gone_posts_and_delays_rate_limits(clock, monkeypatch):
+    monkeypatch.setattr(failures_module.random, 'uniform', lambda low, high: high)
+    retries = RetryQueue(base_delay=2)
+    assert not retries.schedule(_item(), CrawlFailure(URL, FAILURE_GONE, 'PostUnavailable'))
+    assert len(retries) == 0
+
+    other = 'https://blog.naver.com/other/223000000002'
+    assert retries.schedule(_item(other), CrawlFailure(other, FAILURE_RATE_LIMITED, 'RateLimited'))
+    assert retries.schedule(_item(), CrawlFailure(URL, FAILURE_TRANSIENT, 'TimeoutException'))
+    # 속도 제한 실패는 한 단계 더 길게 기다리므로 일반 실패가 먼저 나옴
+    assert retries.pop_due(clock.now + 2) == [_item()]
+    assert retries.pop_due(clock.now + 4) == [_item(other)]
+
+def test_circuit_breaker_opens_then_half_opens(clock):
+    breaker = CircuitBreaker(window=60, min_requests=4, error_rate=0.5, open_seconds=30, max_open_seconds=100)
+    for success in (True, False, True):
+        assert not breaker.record(URL, success)
+    assert breaker.record(URL, False)
+    assert breaker.is_open(URL)
+
+    # 열려 있는 동안 시작된 요청은 대기하고, 그 사이 도착한 결과는 반영하지 않음
+    assert not breaker.record(URL, False)
+    assert breaker.wait(URL) == 30
+    assert not breaker.is_open(URL)
+
+    # 반열림 상태의 첫 실패는 바로 두 배 길이로 다시 열림
+    assert breaker.record(URL, False)
+    assert breaker.wait(URL) == 60
+
+    # 반열림 상태의 첫 성공은 닫고 열림 횟수를 초기화
+    assert not breaker.record(URL, True)
+    for success in (False, False, False):
+        assert not breaker.record(URL, success)
+    assert breaker.record(URL, False)
+    assert breaker.wait(URL) == 30
+
+def test_circuit_breaker_hosts_are_independent(clock):
+    breaker = CircuitBreaker(hosts=('blog.naver.com', '*'), min_requests=2, error_rate=0.5)
+    assert not breaker.record(URL, False)
+    assert breaker.record(URL, False)
+    assert breaker.is_open(URL)
+    assert not breaker.is_open('https://apis.naver.com/blogserver/like/v1/search/contents')
@@ -0,0 +1,94 @@
+import json
+import pytest
+from lxml import html
+from src.fast_path import CompiledSpec, HttpBlogFetcher, _element_text
+
+URL = 'https://blog.naver.com/someone/223000000001'
+
+class _Response:
+    def __init__(self, url, data, status=200):
+        self.url = url
+        self.status = status
+        self.data = data
+
+class FakeTransport:
+    """게시글 페이지와 공감 API 응답을 돌려주는 HTTP 대역"""
+
+    def __init__(self, page, likes=None):
+        self.page = page
+        self.likes = likes
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        if 'like' in url:
+            if self.likes is None:
+                return _Response(url, b'', status=500)
+            reactions = [{'reactionType': 'like', 'count': self.likes - 1}, {'reactionType': 'fun', 'count': 1}]
+            body = {'contents': [{'contentsId': 'someone_223000000001', 'reactions': reactions}]}
+            return _Response(url, json.dumps(body).encode('utf-8'))
+        return _Response(url, self.page.encode('utf-8'))
+
+def _text(markup):
+    return _element_text(html.fromstring(markup))
+
+def _page(content='<p>본문입니다.</p>', likes='', comments='<em>3</em>'):
+    return f"""
+    <html><body>
+      <p class="blog_date">2024. 3. 14. 12:30</p>
+      <div class="se-main-container">{content}</div>
+      <div class="btn_like"><span class="u_cnt _count">{likes}</span></div>
+      <a class="btn_comment"><span class="sp ico">댓글</span>{comments}</a>
+    </body></html>
+    """
+
+def test_inline_markup_stays_on_one_line():
+    # innerText와 같이 인라인 요소 사이에는 줄바꿈도 공백도 넣지 않음
+    assert _text('<div><span>오늘 <b>강남</b> 맛집</span><span>에 다녀왔어요</span></div>') == '오늘 강남 맛집에 다녀왔어요'
+
+def test_blocks_and_br_break_lines():
+    markup = """
+    <div>
+      <p>첫 줄<br>둘째   줄</p>
+      <div> 셋째 <!-- 주석 --> 줄 </div>
+      <script>var hidden = 1;</script>
+      <p>넷째</p>
+    </div>
+    """
+    assert _text(markup) == '첫 줄\n둘째 줄\n\n셋째 줄\n\n넷째'
+
+def test_nested_blocks_do_not_stack_blank_lines():
+    assert _text('<div><div><div>가</div></div><div><div>나</div></div></div>') == '가\n나'
+
+def test_script_filled_counter_is_unknown_not_zero():
+    fields = CompiledSpec().extract(_page(likes=''))
+    assert fields['LikeCount'] is None
+    assert fields['CommentCount'] == 3
+
+def test_missing_comment_counter_is_unknown():
+    fields = CompiledSpec().extract(_page(likes='37', comments=''))
+    assert fields['LikeCount'] == 37
+    assert fields['CommentCount'] is None
+
+def test_content_matches_inner_text_rules():
+    content = '<div class="se-text"><p><span>오늘 <b>강남</b> 맛집</span><span>에 다녀왔어요</span></p></div><div class="se-text"><p>또 갈게요</p></div>'
+    fields = CompiledSpec().extract(_page(content=content))
+    assert fields['Content'] == '오늘 강남 맛집에 다녀왔어요\n\n또 갈게요'
+    assert fields['PublishDate'] == '2024. 3. 14. 12:30'
+
+@pytest.mark.parametrize('body', ['', '   ', '<?xml version="1.0" encoding="utf-8"?><a/>', '{"error": "garbage"}'])
+def test_unparsable_body_falls_back_to_selenium(body):
+    fetcher = HttpBlogFetcher(transport=FakeTransport(body))
+    assert fetcher.get_blog_info(URL) is None
+
+def test_script_filled_likes_come_from_like_api():
+    transport = FakeTransport(_page(likes=''), likes=37)
+    fields = HttpBlogFetcher(transport=transport).get_blog_info(URL)
+    assert fields['LikeCount'] == 37
+    assert fields['CommentCount'] == 3
+    assert 'like' in transport.urls[-1]
+
+def test_failed_like_lookup_leaves_likes_unknown():
+    fields = HttpBlogFetcher(transport=FakeTransport(_page(likes=''))).get_blog_info(URL)
+    assert fields['LikeCount'] is None
+    assert fields['Content'] == '본문입니다.'
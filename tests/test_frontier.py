@@ -0,0 +1,77 @@
+import pytest
+import src.frontier as frontier_module
+from src.frontier import SqliteFrontier
+
+def _items(count):
+    return [{'link': f'https://blog.naver.com/someone/22300000000{index}', 'title': f'글 {index}'} for index in range(count)]
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(frontier_module, 'time', clock)
+    return clock
+
+def _frontier(tmp_path, **kwargs):
+    return SqliteFrontier(str(tmp_path / 'frontier.sqlite3'), **kwargs)
+
+def test_expired_lease_is_reclaimed_and_completed_at_most_once(tmp_path, clock):
+    frontier = _frontier(tmp_path, lease_timeout=60)
+    frontier.add(_items(1))
+    [stale] = frontier.lease('worker-a')
+    # 기한 안에는 다른 워커가 가져가지 못함
+    assert frontier.lease('worker-b') == []
+
+    clock.now += 61
+    [fresh] = frontier.lease('worker-b')
+    assert fresh.key == stale.key and fresh.attempts == 2
+
+    # 기한이 지난 워커의 늦은 완료는 버려지고, 재배정된 워커의 완료만 한 번 받아들여짐
+    assert not frontier.complete(stale)
+    assert frontier.complete(fresh)
+    assert not frontier.complete(fresh)
+    assert not frontier.fail(stale)
+    assert frontier.stats()['done'] == 1
+    assert frontier.lease('worker-c') == []
+    frontier.close()
+
+def test_workers_on_separate_connections_never_share_a_lease(tmp_path, clock):
+    first = _frontier(tmp_path)
+    second = _frontier(tmp_path)
+    first.add(_items(5))
+
+    leased = first.lease('worker-a', count=3) + second.lease('worker-b', count=3)
+    assert sorted(lease.key for lease in leased) == sorted({lease.key for lease in leased})
+    assert len(leased) == 5
+    first.close()
+    second.close()
+
+def test_lease_that_keeps_expiring_fails_after_max_attempts(tmp_path, clock):
+    frontier = _frontier(tmp_path, lease_timeout=60, max_attempts=2)
+    frontier.add(_items(1))
+    for _ in range(2):
+        assert len(frontier.lease('worker')) == 1
+        clock.now += 61
+    assert frontier.lease('worker') == []
+    assert frontier.stats()['failed'] == 1
+    frontier.close()
+
+def test_failed_lease_waits_for_retry_delay(tmp_path, clock):
+    frontier = _frontier(tmp_path, max_attempts=3)
+    frontier.add(_items(2))
+    retry, gone = frontier.lease('worker', count=2)
+
+    assert frontier.fail(retry, retry_delay=30)
+    assert not frontier.fail(gone, retryable=False)
+    assert frontier.lease('worker') == []
+    clock.now += 30
+    [again] = frontier.lease('worker')
+    assert again.key == retry.key and again.attempts == 2
+    assert frontier.stats() == {'pending': 0, 'leased': 1, 'done': 0, 'failed': 1}
+    frontier.close()
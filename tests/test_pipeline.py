@@ -0,0 +1,59 @@
+from src.pipeline import CrawlPipeline
+from src.processor import BlogProcessor
+from src.failures import CrawlFailure, FAILURE_GONE, FAILURE_TRANSIENT
+
+class FakeAPI:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def iter_search_pages(self, keyword, **kwargs):
+        yield from self.pages[keyword]
+
+class FlakyCrawler:
+    """'flaky'는 첫 시도만 일시적으로 실패하고, 'gone'은 항상 삭제된 게시글"""
+
+    def __init__(self):
+        self.calls = {}
+
+    def get_blog_info(self, blog_url, driver_pool=None):
+        self.calls[blog_url] = self.calls.get(blog_url, 0) + 1
+        if 'gone' in blog_url:
+            return CrawlFailure(blog_url, FAILURE_GONE, 'PostUnavailable: 삭제된 게시물')
+        if 'flaky' in blog_url and self.calls[blog_url] == 1:
+            return CrawlFailure(blog_url, FAILURE_TRANSIENT, 'TimeoutException: timed out')
+        return {'URL': blog_url, 'Content': '본문'}
+
+class MemorySink:
+    def __init__(self):
+        self.rows = []
+
+    def completed_urls(self):
+        return set()
+
+    def write(self, row):
+        self.rows.append(row)
+
+def _item(blog_id, log_no):
+    return {'link': f'https://blog.naver.com/{blog_id}/{log_no}', 'title': '<b>제목</b>', 'postdate': '20240314'}
+
+def test_pipeline_retries_transient_failures_and_dead_letters_the_rest(monkeypatch):
+    monkeypatch.setattr('src.failures.backoff_delay', lambda attempt, base_delay, max_delay: 0)
+    api = FakeAPI({
+        '맛집': [[_item('ok', 1), _item('flaky', 2)], [_item('gone', 3)]],
+        # 다른 키워드에서 다시 나온 게시글은 한 번만 수집
+        '카페': [[_item('ok', 1)]]
+    })
+    crawler = FlakyCrawler()
+    dead_letter = MemorySink()
+    sink = MemorySink()
+    processor = BlogProcessor(crawler, dead_letter=dead_letter, max_retries=2)
+
+    written = CrawlPipeline(api, processor, sink, crawl_concurrency=2).run(['맛집', '카페'])
+
+    assert written == 2
+    assert sorted(row['URL'] for row in sink.rows) == ['https://blog.naver.com/flaky/2', 'https://blog.naver.com/ok/1']
+    assert crawler.calls['https://blog.naver.com/flaky/2'] == 2
+    assert crawler.calls['https://blog.naver.com/gone/3'] == 1
+    assert dead_letter.rows == [{
+        'URL': 'https://blog.naver.com/gone/3', 'FailureKind': FAILURE_GONE, 'Error': 'PostUnavailable: 삭제된 게시물'
+    }]
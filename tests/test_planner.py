@@ -0,0 +1,37 @@
+import threading
+from src.planner import QueryPlanner
+
+def _item(index, postdate='20240314'):
+    return {'link': f'https://blog.naver.com/someone/22300000000{index}', 'title': f'글 {index}', 'postdate': postdate}
+
+class FakeAPI:
+    """키워드별 결과를 돌려주는 검색 API 대역 (release가 주어지면 첫 아이템 뒤에서 대기)"""
+
+    def __init__(self, results, release=None):
+        self.results = results
+        self.release = release
+
+    def iter_search(self, keyword, **search_options):
+        for index, item in enumerate(self.results[keyword]):
+            if index == 1 and self.release is not None:
+                assert self.release.wait(5)
+            yield item
+
+def test_plan_merges_keywords_and_ranks_by_hits():
+    api = FakeAPI({'맛집': [_item(1), _item(2)], '카페': [_item(2), _item(3)]})
+    plan = QueryPlanner(api).plan(['맛집', '카페'])
+    assert [item['link'] for item in plan][0] == _item(2)['link']
+    assert plan[0]['keywords'] == ['맛집', '카페']
+    assert len(plan) == 3
+
+def test_single_keyword_streams_before_the_search_finishes():
+    release = threading.Event()
+    api = FakeAPI({'맛집': [_item(1), _item(2), _item(1)]}, release=release)
+    stream = QueryPlanner(api).stream('맛집')
+
+    # 나머지 검색이 끝나지 않아도 첫 아이템은 바로 나옴
+    first = next(stream)
+    assert first['link'] == _item(1)['link']
+    assert first['keywords'] == ['맛집'] and first['priority'] >= 1
+    release.set()
+    assert [item['link'] for item in stream] == [_item(2)['link']]
@@ -0,0 +1,65 @@
+import pickle
+import sys
+import pytest
+from src.records import ResultBatch
+
+ROWS = [
+    {'URL': 'https://blog.naver.com/a/1', 'Content': '첫 줄\n둘째 줄', 'PublishDate': '2024. 3. 14.', 'LikeCount': 37, 'ImageCount': 3},
+    {'URL': 'https://blog.naver.com/b/2', 'Content': '', 'PublishDate': None, 'LikeCount': None, 'ImageCount': 0},
+    {'URL': 'https://blog.naver.com/c/3', 'Content': '😀 이모지', 'PublishDate': '2024. 3. 15.', 'LikeCount': 0, 'ImageCount': 1,
+     'ClusterId': 'a/1', 'DuplicateOf': 'a/1'}
+]
+
+def _expected(row, names):
+    return {name: row.get(name) for name in names}
+
+def test_rows_round_trip():
+    batch = ResultBatch.from_rows(ROWS)
+    names = batch.names()
+    assert names == ['URL', 'Content', 'PublishDate', 'LikeCount', 'ImageCount', 'ClusterId', 'DuplicateOf']
+    assert list(batch) == [_expected(row, names) for row in ROWS]
+    assert batch[-1]['DuplicateOf'] == 'a/1'
+    with pytest.raises(IndexError):
+        batch[3]
+
+def test_arrow_round_trip_keeps_nulls_and_types():
+    pa = pytest.importorskip('pyarrow')
+    batch = ResultBatch.from_rows(ROWS)
+    table = batch.to_arrow()
+    assert table.schema.field('LikeCount').type == pa.int64()
+    assert table.schema.field('Content').type == pa.large_string()
+    assert table.column('LikeCount').null_count == 1
+    assert table.to_pylist() == [_expected(row, batch.names()) for row in ROWS]
+
+def test_pandas_conversion():
+    pytest.importorskip('pandas')
+    df = ResultBatch.from_rows(ROWS).to_pandas()
+    assert df['LikeCount'].tolist()[0] == 37
+    assert df['Content'].tolist()[2] == '😀 이모지'
+
+def test_pandas_conversion_without_pyarrow(monkeypatch):
+    pytest.importorskip('pandas')
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    df = ResultBatch.from_rows(ROWS).to_pandas()
+    assert list(df.columns) == ResultBatch.from_rows(ROWS).names()
+    assert str(df['LikeCount'].dtype) == 'Int64'
+    assert df['LikeCount'].isna().tolist() == [False, True, False]
+    assert df['Content'].tolist()[2] == '😀 이모지'
+
+def test_unknown_fields_get_inferred_columns():
+    batch = ResultBatch.from_rows(ROWS[:1])
+    batch.append({'URL': 'u', 'BenchLatency': 0.25})
+    assert batch.column('BenchLatency') == [None, 0.25]
+    assert batch.to_arrow().column('BenchLatency').to_pylist() == [None, 0.25]
+
+def test_append_after_conversion_is_rejected():
+    pytest.importorskip('pyarrow')
+    batch = ResultBatch.from_rows(ROWS)
+    batch.to_arrow()
+    with pytest.raises(ValueError):
+        batch.append(ROWS[0])
+    assert len(batch) == 3
+
+def test_batch_survives_pickle():
+    batch = pickle.loads(pickle.dumps(ResultBatch.from_rows(ROWS)))
+    assert list(batch) == [_expected(row, batch.names()) for row in ROWS]
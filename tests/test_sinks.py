@@ -0,0 +1,65 @@
+import csv
+import json
+from src.sinks import open_sink, read_rows
+
+def _result(index, **fields):
+    return {'URL': f'https://blog.naver.com/someone/{223000000000 + index}', 'Content': f'본문 {index}', **fields}
+
+def test_parquet_schema_does_not_come_from_first_flush(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    with open_sink(path, flush_every=2) as sink:
+        # 첫 flush에서는 LikeCount/ClusterId/DuplicateOf가 모두 None
+        sink.write(_result(1, LikeCount=None, ClusterId=None, DuplicateOf=None))
+        sink.write(_result(2, LikeCount=None, ClusterId=None, DuplicateOf=None))
+        sink.write(_result(3, LikeCount=37, ClusterId='someone/223000000001', DuplicateOf='someone/223000000001'))
+    rows = list(read_rows(path))
+    assert len(rows) == 3
+    assert rows[2]['LikeCount'] == 37
+    assert rows[2]['DuplicateOf'] == 'someone/223000000001'
+
+def test_parquet_resume_reuses_schema(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    with open_sink(path) as sink:
+        sink.write(_result(1, LikeCount=None))
+    with open_sink(path, resume=True) as sink:
+        assert len(sink.completed_urls()) == 1
+        sink.write(_result(2, LikeCount=5))
+    assert [row['LikeCount'] for row in read_rows(path)] == [None, 5]
+
+def test_csv_header_includes_columns_missing_from_first_row(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    with open_sink(path, flush_every=1) as sink:
+        sink.write(_result(1))
+        sink.write(_result(2, ClusterId='someone/223000000001', DuplicateOf='someone/223000000001'))
+    rows = list(read_rows(path))
+    assert rows[0]['DuplicateOf'] == ''
+    assert rows[1]['DuplicateOf'] == 'someone/223000000001'
+
+def test_custom_columns_and_extra_fields(tmp_path):
+    path = str(tmp_path / 'dead.csv')
+    with open_sink(path, columns=[('URL', 'str'), ('Error', 'str')]) as sink:
+        sink.write({'URL': 'u1', 'Error': None, 'Extra': 1})
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        assert next(csv.reader(f)) == ['URL', 'Error', 'Extra']
+
+def test_jsonl_resume_drops_truncated_line(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    path.write_text('{"URL": "u1"}\n{"URL": "u2", "Con', encoding='utf-8')
+    with open_sink(str(path), resume=True) as sink:
+        assert sink.completed_urls() == {'u1'}
+        sink.write({'URL': 'u3'})
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['URL'] for line in lines] == ['u1', 'u3']
+
+def test_csv_resume_drops_truncated_row(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    with open_sink(path) as sink:
+        sink.write(_result(1, Content='여러 줄\n본문'))
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        f.write('https://blog.naver.com/someone/223000000002,"잘린\n본')
+    with open_sink(path, resume=True) as sink:
+        assert len(sink.completed_urls()) == 1
+        sink.write(_result(3))
+    rows = list(read_rows(path))
+    assert [row['URL'][-1] for row in rows] == ['1', '3']
+    assert rows[0]['Content'] == '여러 줄\n본문'
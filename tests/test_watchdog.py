@@ -0,0 +1,92 @@
+import subprocess
+import sys
+import time
+import pytest
+from src.crawler import NaverBlogCrawler
+from src.driver_pool import DriverPool
+from src.failures import DeadlineExceeded, FAILURE_TRANSIENT, classify_error
+from src.watchdog import watchdog, _process_tree
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'), reason='/proc 기반 프로세스 트리')
+
+URL = 'https://blog.naver.com/someone/223000000001'
+
+class FakeService:
+    """chromedriver 대신 실행한 프로세스 트리"""
+
+    def __init__(self, command):
+        self.process = subprocess.Popen(command)
+
+class HangingDriver:
+    """chromedriver가 멈춘 것처럼 프로세스가 종료될 때까지 모든 명령이 응답하지 않는 드라이버"""
+
+    def __init__(self):
+        self.service = FakeService(['sleep', '60'])
+
+    def execute_script(self, script, *args):
+        self.service.process.wait()
+        raise ConnectionRefusedError('chromedriver 연결이 끊어졌습니다.')
+
+    def quit(self):
+        pass
+
+class _Crawler(NaverBlogCrawler):
+    def __init__(self, drivers, **kwargs):
+        super().__init__(**kwargs)
+        self.drivers = list(drivers)
+
+    def setup_driver(self):
+        if self.drivers:
+            return self.drivers.pop(0)
+        return super().setup_driver()
+
+def _alive(pid):
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            return f.read().rsplit(b')', 1)[1].split()[0] != b'Z'
+    except OSError:
+        return False
+
+def test_expired_deadline_kills_the_process_tree():
+    service = FakeService(['bash', '-c', 'sleep 60 & sleep 60 & wait'])
+    time.sleep(0.2)
+    tree = _process_tree(service.process.pid)
+    assert len(tree) == 3
+
+    started = time.monotonic()
+    with watchdog.deadline(1):
+        watchdog.watch(service)
+        service.process.wait()
+        assert watchdog.expired()
+        with pytest.raises(DeadlineExceeded) as raised:
+            watchdog.check()
+    assert time.monotonic() - started < 5
+    assert classify_error(raised.value) == FAILURE_TRANSIENT
+    assert not any(_alive(pid) for pid in tree)
+
+def test_paused_time_does_not_count():
+    with watchdog.deadline(0.5):
+        with watchdog.paused():
+            time.sleep(1.2)
+        assert not watchdog.expired()
+        assert watchdog.remaining() > 0
+
+def test_hung_pooled_driver_health_check_is_killed():
+    driver = HangingDriver()
+    crawler = _Crawler([driver], post_deadline=1)
+    pool = DriverPool(crawler, max_size=1)
+    # 기한 밖에서 드라이버를 하나 만들어 풀에 반납
+    with pool.lease():
+        pass
+
+    started = time.monotonic()
+    result = crawler.get_blog_info(URL, driver_pool=pool)
+
+    assert time.monotonic() - started < 5
+    assert not result
+    assert result.kind == FAILURE_TRANSIENT
+    assert result.error.startswith('DeadlineExceeded')
+    assert driver.service.process.poll() is not None
+    # 멈췄던 드라이버는 교체되어 풀에 남지 않음
+    assert pool._idle == [] and pool._size == 0
+    pool.close()